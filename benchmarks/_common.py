@@ -0,0 +1,103 @@
+"""
+Shared helpers for the Look Assigner benchmarks.
+
+The benchmarks import the add-on package straight from this repository, so run
+them through Blender, e.g.
+
+    blender -b --factory-startup --python benchmarks/bench_fuzzy_search.py -- --objects 50000
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def script_args():
+    """
+    Return the arguments after Blender's '--' separator (or all of them outside Blender).
+    """
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
+def best_of(func, repeat=5):
+    """
+    Run func repeat times and return (best duration in seconds, last result).
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best, result
+
+
+def report(title, rows):
+    """
+    Print a small aligned table of (label, seconds) rows.
+    """
+    print(f"\n{title}")
+    width = max(len(label) for label, _ in rows)
+    for label, seconds in rows:
+        print(f"  {label.ljust(width)}  {seconds * 1000.0:10.2f} ms")
+
+
+def time_runs(func, repeat=5, setup=None):
+    """
+    Run func repeat times, calling setup (untimed) before each run, and return the durations in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations):
+    """
+    Return the JSON result entry of a list of durations.
+    """
+    return {
+        "best_ms": round(min(durations) * 1000.0, 3),
+        "median_ms": round(statistics.median(durations) * 1000.0, 3),
+        "runs": len(durations),
+    }
+
+
+def write_json(path, data):
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def compare_to_baseline(results, baseline, tolerance=0.2):
+    """
+    Compare the median times of two result sets and return (rows, regressions).
+
+    A benchmark regresses when its median is more than tolerance (a fraction) slower than the baseline.
+    """
+    rows = []
+    regressions = []
+    for name, entry in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, entry["median_ms"], None, None))
+            continue
+        ratio = entry["median_ms"] / previous["median_ms"] if previous["median_ms"] else float("inf")
+        rows.append((name, entry["median_ms"], previous["median_ms"], ratio))
+        if ratio > 1.0 + tolerance:
+            regressions.append(name)
+    return rows, regressions
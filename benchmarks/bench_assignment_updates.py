@@ -0,0 +1,119 @@
+"""
+Compare per-object tagging during an assignment with the deferred update transaction.
+
+    blender -b --factory-startup --python benchmarks/bench_assignment_updates.py -- --objects 5000 --instances 10 --shaders 50
+
+The scene has --objects mesh objects, every mesh shared by --instances of them (linked
+duplicates), with a subdivision modifier so re-evaluating geometry costs something.
+Both paths end with a view layer update, the evaluation a redraw would trigger anyway.
+"""
+
+import argparse
+import time
+
+import bpy
+
+from _common import report, script_args
+
+from look_assigner import assignment
+from look_assigner.manifest import LookManifest
+
+
+def build_scene(object_count, instances, shader_count):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    scene = bpy.context.scene
+    base = bpy.data.materials.new("bench_base")
+    shaders = [bpy.data.materials.new(f"bench_shader_{index:03d}") for index in range(shader_count)]
+
+    bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=2)
+    template = bpy.context.active_object.data
+    bpy.data.objects.remove(bpy.context.active_object)
+
+    objects = []
+    mesh = None
+    for index in range(object_count):
+        if index % instances == 0:
+            mesh = template.copy()
+            mesh.materials.append(base)
+        obj = bpy.data.objects.new(f"bench_object_{index:06d}", mesh)
+        modifier = obj.modifiers.new("subdivision", 'SUBSURF')
+        modifier.levels = 1
+        scene.collection.objects.link(obj)
+        objects.append(obj)
+
+    # every shader gets a contiguous run of whole instance groups
+    per_shader = max(1, object_count // shader_count)
+    shader_manifests = []
+    for index, mat in enumerate(shaders):
+        names = [obj.name for obj in objects[index * per_shader:(index + 1) * per_shader]]
+        shader_manifests.append((mat, LookManifest(1, names, [(0,)] * len(names))))
+
+    bpy.context.view_layer.update()
+    return objects, base, shader_manifests
+
+
+def reset(objects, base):
+    for obj in objects:
+        obj.data.materials[0] = base
+    bpy.context.view_layer.update()
+
+
+def assign_per_object(objects, shader_manifests):
+    """
+    The previous behavior: every object written and tagged, all areas looped per shader, then a full update.
+    """
+    objects_by_name = {obj.name: obj for obj in objects}
+    for mat, manifest in shader_manifests:
+        for name in manifest.objects:
+            obj = objects_by_name[name]
+            obj.data.materials[0] = mat
+            obj.update_tag(refresh={'DATA'})
+        if bpy.context.screen:
+            for area in bpy.context.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    bpy.context.view_layer.update()
+
+
+def assign_deferred(objects, shader_manifests):
+    plan = assignment.build_manifest_plan(objects, shader_manifests)
+    assignment.apply_plan(plan)
+    bpy.context.view_layer.update()
+    return plan
+
+
+def timed(func, objects, base, shader_manifests, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        reset(objects, base)
+        start = time.perf_counter()
+        result = func(objects, shader_manifests)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--instances", type=int, default=10)
+    parser.add_argument("--shaders", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(script_args())
+
+    objects, base, shader_manifests = build_scene(args.objects, args.instances, args.shaders)
+
+    legacy_time, _ = timed(assign_per_object, objects, base, shader_manifests, args.repeat)
+    deferred_time, plan = timed(assign_deferred, objects, base, shader_manifests, args.repeat)
+
+    report(
+        f"{args.objects} objects sharing {len({obj.data for obj in objects})} meshes, {args.shaders} shaders - "
+        f"deferred path wrote {plan.mesh_writes} meshes, {plan.writes_saved} writes saved",
+        [("per object tagging", legacy_time), ("deferred transaction", deferred_time)],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare listing materials with the pure Python blendfile reader against bpy.data.libraries.load.
+
+    blender -b --factory-startup --python benchmarks/bench_blend_reader.py -- [look files ...]
+
+Without look files a synthetic one is written (plain and compressed) with --materials materials.
+"""
+
+import argparse
+import os
+import tempfile
+
+import bpy
+
+from _common import best_of, report, script_args
+
+from look_assigner import blendfile
+from look_assigner.catalog import load_material_names
+
+
+def write_synthetic_look(directory, material_count, compress):
+    for index in range(material_count):
+        mat = bpy.data.materials.new(f"bench_material_{index:05d}")
+        mat.use_nodes = True
+        mat.use_fake_user = True
+
+    suffix = "zstd" if compress else "plain"
+    filepath = os.path.join(directory, f"bench_look_{material_count}_{suffix}.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=filepath, compress=compress, copy=True)
+    return filepath
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--materials", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(script_args())
+
+    files = args.files
+    if not files:
+        directory = tempfile.mkdtemp(prefix="look_assigner_bench_")
+        files = [write_synthetic_look(directory, args.materials, compress) for compress in (False, True)]
+
+    for filepath in files:
+        reader_time, reader_names = best_of(lambda: blendfile.read_material_names(filepath), args.repeat)
+        load_time, load_names = best_of(lambda: load_material_names(filepath), args.repeat)
+
+        assert sorted(reader_names) == sorted(load_names), f"material names differ for {filepath}"
+
+        size = os.path.getsize(filepath) / (1024 * 1024)
+        report(
+            f"{os.path.basename(filepath)} - {size:.1f} MB, {len(reader_names)} materials",
+            [("blendfile reader", reader_time), ("libraries.load", load_time)],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare the original serial os.walk scan with the parallel scandir discovery on a synthetic tree.
+
+    blender -b --factory-startup --python benchmarks/bench_discovery.py -- [--depth 4] [--fanout 6] [--latency-ms 2]
+
+--latency-ms adds a sleep to every directory listing and file stat to emulate a network share.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from _common import best_of, report, script_args
+
+from look_assigner import discovery
+
+
+def build_tree(root, depth, fanout, files_per_dir):
+    directories = [root]
+    for level in range(depth):
+        next_level = []
+        for directory in directories:
+            for index in range(fanout):
+                subdir = os.path.join(directory, f"asset_{level}_{index}")
+                os.makedirs(subdir)
+                next_level.append(subdir)
+        directories = next_level
+
+    file_count = 0
+    for directory in directories:
+        for index in range(files_per_dir):
+            extension = ".blend" if index % 2 == 0 else ".blend1"
+            open(os.path.join(directory, f"look_v{index:03d}{extension}"), "wb").close()
+            file_count += 1
+    return file_count
+
+
+def legacy_scan(directory):
+    """
+    The original recursive scan: os.walk and a per file extension check.
+    """
+    found = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith(".blend"):
+                found.append((file, os.path.join(root, file)))
+    return found
+
+
+def add_latency(seconds):
+    """
+    Make os.scandir and os.stat sleep before doing their work, returns a function restoring them.
+    """
+    scandir, stat = os.scandir, os.stat
+
+    def slow_scandir(*args, **kwargs):
+        time.sleep(seconds)
+        return scandir(*args, **kwargs)
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(seconds)
+        return stat(*args, **kwargs)
+
+    os.scandir, os.stat = slow_scandir, slow_stat
+
+    def restore():
+        os.scandir, os.stat = scandir, stat
+    return restore
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--files", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(script_args())
+
+    root = tempfile.mkdtemp(prefix="look_assigner_tree_")
+    try:
+        file_count = build_tree(root, args.depth, args.fanout, args.files)
+        restore = add_latency(args.latency_ms / 1000.0) if args.latency_ms else None
+
+        rows = []
+        legacy_time, legacy_result = best_of(lambda: legacy_scan(root), args.repeat)
+        rows.append(("os.walk (original)", legacy_time))
+        for workers in (1, 4, 8, 16):
+            duration, result = best_of(lambda: discovery.discover_blend_files(root, True, workers), args.repeat)
+            assert sorted(result) == sorted(legacy_result), "discovery results differ from os.walk"
+            rows.append((f"scandir, {workers} workers", duration))
+
+        if restore:
+            restore()
+
+        report(f"scan_for_blend_files - {file_count} files, {len(legacy_result)} .blend, latency {args.latency_ms} ms", rows)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare the regex based fuzzy object search against the normalized-name index.
+
+    blender -b --factory-startup --python benchmarks/bench_fuzzy_search.py -- [--objects 50000] [--stored 5000]
+
+Scene names are synthetic: a mix of plain names, namespaced names and .### duplicates.
+"""
+
+import argparse
+import random
+import re
+
+from _common import best_of, report, script_args
+
+from look_assigner.matching import ObjectNameIndex
+
+
+def regex_fuzzy_search(scene_object_names, object_names):
+    """
+    The original implementation: one compiled pattern per stored name, run against every scene name.
+    """
+    matched_object_names = []
+    for name in object_names:
+        pattern = re.compile(r'([a-zA-Z0-9_]+:)?' + re.escape(name) + r'(\.\d{3})?$')
+        matched_object_names.extend(scene_name for scene_name in scene_object_names if pattern.match(scene_name))
+    return matched_object_names
+
+
+def index_fuzzy_search(scene_object_names, object_names):
+    return ObjectNameIndex(scene_object_names).match_all(object_names)
+
+
+def build_names(object_count, stored_count, seed=0):
+    rng = random.Random(seed)
+    base_names = [f"geo_{part}_{i:05d}" for i, part in enumerate(rng.choice(("body", "prop", "set", "leaf")) for _ in range(object_count))]
+
+    scene_names = []
+    for name in base_names:
+        roll = rng.random()
+        if roll < 0.25:
+            name = f"char_{rng.randint(0, 9):02d}:{name}"
+        elif roll < 0.5:
+            name = f"{name}.{rng.randint(1, 999):03d}"
+        elif roll < 0.6:
+            name = f"set_{rng.randint(0, 9)}:{name}.{rng.randint(1, 999):03d}"
+        scene_names.append(name)
+
+    stored_names = rng.sample(base_names, min(stored_count, len(base_names)))
+    stored_names += [f"missing_{i:05d}" for i in range(stored_count // 10)]
+    return scene_names, stored_names
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--stored", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(script_args())
+
+    scene_names, stored_names = build_names(args.objects, args.stored)
+
+    regex_time, regex_result = best_of(lambda: regex_fuzzy_search(scene_names, stored_names), args.repeat)
+    index_time, index_result = best_of(lambda: index_fuzzy_search(scene_names, stored_names), args.repeat)
+
+    assert regex_result == index_result, "index results differ from the regex implementation"
+
+    report(
+        f"fuzzy_search_objects - {len(scene_names)} scene objects, {len(stored_names)} stored names, {len(index_result)} matches",
+        [("regex", regex_time), ("index", index_time)],
+    )
+    print(f"  speedup  {regex_time / max(index_time, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare appending and linking the shaders of a heavy look: load time, memory and saved file size.
+
+    blender -b --factory-startup --python benchmarks/bench_link_mode.py -- [look file]
+
+Without a look file a synthetic one is written with --materials materials of --nodes
+nodes each, every material using its own packed --image-size image.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import bpy
+
+from _common import script_args
+
+from look_assigner import loading
+
+
+def resident_memory():
+    """
+    Current resident set size in bytes, or None where it can't be read.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def write_synthetic_look(directory, material_count, node_count, image_size):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    for index in range(material_count):
+        mat = bpy.data.materials.new(f"bench_material_{index:03d}")
+        mat.use_nodes = True
+        mat.use_fake_user = True
+        nodes = mat.node_tree.nodes
+        links = mat.node_tree.links
+
+        image = bpy.data.images.new(f"bench_image_{index:03d}", image_size, image_size)
+        image.pixels.foreach_set([random.random() for _ in range(image_size * image_size * 4)])
+        image.pack()
+
+        texture = nodes.new("ShaderNodeTexImage")
+        texture.image = image
+        color_output = texture.outputs["Color"]
+        for node_index in range(node_count):
+            mix = nodes.new("ShaderNodeMix")
+            mix.data_type = 'RGBA'
+            mix.location = (200 * (node_index + 1), 0)
+            links.new(color_output, mix.inputs["A"])
+            color_output = mix.outputs["Result"]
+        links.new(color_output, nodes["Principled BSDF"].inputs["Base Color"])
+
+    filepath = os.path.join(directory, f"bench_heavy_look_{material_count}.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=filepath)
+    return filepath
+
+
+def measure(look_path, material_names, link, directory):
+    """
+    Load every material into a fresh shot file and return (seconds, memory delta, saved size).
+    """
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.active_object
+
+    memory_before = resident_memory()
+    start = time.perf_counter()
+    materials = loading.load_materials(look_path, material_names, link=link)
+    for mat in materials:
+        obj.data.materials.append(mat)
+    bpy.context.view_layer.update()
+    duration = time.perf_counter() - start
+    memory_after = resident_memory()
+
+    shot_path = os.path.join(directory, f"bench_shot_{'link' if link else 'append'}.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=shot_path, copy=True)
+
+    memory = memory_after - memory_before if memory_before is not None and memory_after is not None else None
+    return duration, memory, os.path.getsize(shot_path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("look", nargs="?")
+    parser.add_argument("--materials", type=int, default=50)
+    parser.add_argument("--nodes", type=int, default=40)
+    parser.add_argument("--image-size", type=int, default=512)
+    args = parser.parse_args(script_args())
+
+    directory = tempfile.mkdtemp(prefix="look_assigner_bench_")
+    look_path = args.look or write_synthetic_look(directory, args.materials, args.nodes, args.image_size)
+
+    with bpy.data.libraries.load(look_path) as (data_from, data_to):
+        material_names = list(data_from.materials)
+
+    rows = [(mode, measure(look_path, material_names, mode == "link", directory)) for mode in ("append", "link")]
+
+    look_size = os.path.getsize(look_path) / (1024 * 1024)
+    print(f"\n{os.path.basename(look_path)} - {look_size:.1f} MB, {len(material_names)} materials")
+    for mode, (duration, memory, size) in rows:
+        memory_text = f"{memory / (1024 * 1024):8.1f} MB" if memory is not None else "     n/a"
+        print(f"  {mode.ljust(6)}  {duration * 1000.0:10.2f} ms  memory {memory_text}  shot file {size / (1024 * 1024):8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
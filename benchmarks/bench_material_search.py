@@ -0,0 +1,44 @@
+"""
+Time prefix and substring queries on the cross-file material search index.
+
+    blender -b --factory-startup --python benchmarks/bench_material_search.py -- [--files 300] [--materials 200]
+"""
+
+import argparse
+import random
+
+from _common import best_of, report, script_args
+
+from look_assigner.search import MaterialSearchIndex
+
+
+def build_files(file_count, material_count, seed=0):
+    rng = random.Random(seed)
+    words = ("skin", "metal", "wood", "glass", "cloth", "hair", "eye", "leaf", "bark", "rock")
+    return [
+        (f"/assets/look_{index:04d}.blend", [f"{rng.choice(words)}_{rng.choice(words)}_{rng.randint(0, 99999):05d}" for _ in range(material_count)])
+        for index in range(file_count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--materials", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(script_args())
+
+    files = build_files(args.files, args.materials)
+    build_time, index = best_of(lambda: MaterialSearchIndex(files), 1)
+
+    rows = [("build", build_time)]
+    for query in ("wood", "wood_gl", "lass_ro", "zzz"):
+        rows.append((f"prefix '{query}'", best_of(lambda: index.prefix(query, args.limit), args.repeat)[0]))
+        rows.append((f"substring '{query}'", best_of(lambda: index.substring(query, args.limit), args.repeat)[0]))
+
+    report(f"material search - {len(index)} unique materials over {args.files} files, limit {args.limit}", rows)
+
+
+if __name__ == "__main__":
+    main()
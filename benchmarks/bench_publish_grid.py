@@ -0,0 +1,78 @@
+"""
+Compare building the PUBLISH_SHADERS preview grid with one operator call per sphere against the data API.
+
+    blender -b --factory-startup --python benchmarks/bench_publish_grid.py -- --shaders 100 400 1600
+"""
+
+import argparse
+import math
+
+import bpy
+
+from _common import best_of, report, script_args
+
+from look_assigner.operators import build_preview_grid
+
+
+def build_grid_with_operators(collection, materials, offset=2.5):
+    """
+    The previous implementation: primitive_uv_sphere_add per material, then moved into the collection.
+    """
+    scene = bpy.context.scene
+    grid_size = max(1, math.ceil(math.sqrt(len(materials))))
+    for i, mat in enumerate(materials):
+        y, x = divmod(i, grid_size)
+        bpy.ops.mesh.primitive_uv_sphere_add(radius=1, location=(x * offset, y * offset, 0))
+        sphere = bpy.context.object
+        sphere.name = mat.name
+        sphere.data.materials.append(mat)
+        collection.objects.link(sphere)
+        scene.collection.objects.unlink(sphere)
+    return len(materials)
+
+
+def run(builder, materials):
+    """
+    Build a grid in a fresh collection and return (mesh count, vertex count) it added.
+    """
+    # start from the same state every time
+    for collection in [c for c in bpy.data.collections if c.name.startswith("bench_grid")]:
+        bpy.data.batch_remove([*collection.objects, collection])
+    bpy.data.orphans_purge(do_recursive=True)
+
+    meshes_before = len(bpy.data.meshes)
+    collection = bpy.data.collections.new("bench_grid")
+    bpy.context.scene.collection.children.link(collection)
+    builder(collection, materials)
+
+    new_meshes = len(bpy.data.meshes) - meshes_before
+    vertices = sum(len(mesh.vertices) for mesh in bpy.data.meshes)
+    return new_meshes, vertices
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shaders", type=int, nargs="+", default=[100, 400, 1600])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(script_args())
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    for count in args.shaders:
+        materials = [bpy.data.materials.get(f"bench_shader_{index:05d}") or bpy.data.materials.new(f"bench_shader_{index:05d}")
+                     for index in range(count)]
+        for mat in materials:
+            mat.use_fake_user = True
+
+        ops_time, (ops_meshes, ops_vertices) = best_of(lambda: run(build_grid_with_operators, materials), args.repeat)
+        data_time, (data_meshes, data_vertices) = best_of(lambda: run(build_preview_grid, materials), args.repeat)
+
+        report(
+            f"{count} shaders - operators: {ops_meshes} meshes / {ops_vertices} vertices, "
+            f"data API: {data_meshes} meshes / {data_vertices} vertices",
+            [("primitive_uv_sphere_add", ops_time), ("data API", data_time)],
+        )
+
+
+if __name__ == "__main__":
+    main()
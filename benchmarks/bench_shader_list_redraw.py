@@ -0,0 +1,106 @@
+"""
+Compare the sidebar redraw time of the shader list drawn row by row against the UIList.
+
+Needs a window, so run it without -b:
+
+    blender --factory-startup --python benchmarks/bench_shader_list_redraw.py -- --materials 100 1000 5000
+
+The add-on is enabled from this repository, the shader list is filled with synthetic
+names and both versions are drawn in the Item tab of a 3D view sidebar with
+wm.redraw_timer. Blender quits when done.
+"""
+
+import argparse
+import time
+
+import addon_utils
+import bpy
+
+from _common import report, script_args
+
+
+class BENCH_PT_shader_list_rows(bpy.types.Panel):
+    """The previous shader list: a checkbox and a name per material, laid out row by row"""
+    bl_label = "Shader List (rows)"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Item'
+
+    def draw(self, context):
+        lookProps = context.scene.LookAssigner_Properties
+        col_flow = self.layout.column_flow(columns=2, align=True)
+        for material in lookProps.materials:
+            row = col_flow.row()
+            row.prop(material, "use", text="")
+            row.label(text=material.name, icon='MATERIAL')
+
+
+class BENCH_PT_shader_list_uilist(bpy.types.Panel):
+    bl_label = "Shader List (UIList)"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Item'
+
+    def draw(self, context):
+        from look_assigner.ui import MaterialPanel
+        MaterialPanel.draw_material_list(self, self.layout, context.scene.LookAssigner_Properties)
+
+
+def sidebar_context():
+    window = bpy.context.window_manager.windows[0]
+    area = next(area for area in window.screen.areas if area.type == 'VIEW_3D')
+    area.spaces.active.show_region_ui = True
+    region = next(region for region in area.regions if region.type == 'UI')
+    return window, area, region
+
+
+def time_redraws(panel_class, iterations):
+    bpy.utils.register_class(panel_class)
+    try:
+        window, area, region = sidebar_context()
+        with bpy.context.temp_override(window=window, area=area, region=region):
+            # the first draw lays the panel out, leave it out of the timing
+            bpy.ops.wm.redraw_timer(type='DRAW', iterations=1)
+            start = time.perf_counter()
+            bpy.ops.wm.redraw_timer(type='DRAW', iterations=iterations)
+            return (time.perf_counter() - start) / iterations
+    finally:
+        bpy.utils.unregister_class(panel_class)
+
+
+def run(args):
+    addon_utils.enable("look_assigner", default_set=True)
+    lookProps = bpy.context.scene.LookAssigner_Properties
+
+    for count in args.materials:
+        lookProps.materials.clear()
+        for index in range(count):
+            item = lookProps.materials.add()
+            item.name = f"bench_shader_{index:05d}"
+            item.use = index % 3 == 0
+
+        report(
+            f"{count} shaders - one sidebar redraw",
+            [("row per material", time_redraws(BENCH_PT_shader_list_rows, args.iterations)),
+             ("UIList", time_redraws(BENCH_PT_shader_list_uilist, args.iterations))],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--materials", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args(script_args())
+
+    def run_and_quit():
+        try:
+            run(args)
+        finally:
+            bpy.ops.wm.quit_blender()
+
+    # the window has to be up before anything can be drawn
+    bpy.app.timers.register(run_and_quit, first_interval=1.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Synthetic, reproducible fixtures for the benchmark suite.
+
+Look files hold --materials published materials each, with pipeline manifests naming
+scene objects. The shot scene holds --objects meshes whose names mix plain names,
+namespaces ("char01:") and Blender's ".###" suffixes, so name matching has real work to
+do. Everything is derived from the seed, the same arguments always give the same files.
+"""
+
+import os
+import random
+
+import bpy
+
+from look_assigner import manifest
+
+PIPELINE_ATTRIBUTE = "LOOK_ASSIGNER_NODE_LIST"
+NAMESPACES = ("char01", "char02", "prop01", "set01")
+
+
+def object_base_name(index):
+    return f"geo_{index:06d}"
+
+
+def scene_object_name(index, rng):
+    """
+    The name an object has in the shot: plain, namespaced or suffixed, like a real scene.
+    """
+    name = object_base_name(index)
+    roll = rng.random()
+    if roll < 0.3:
+        name = f"{rng.choice(NAMESPACES)}:{name}"
+    elif roll < 0.5:
+        name = f"{name}.{rng.randint(1, 999):03d}"
+    return name
+
+
+def material_name(look_index, index):
+    return f"look{look_index:03d}_shader_{index:04d}"
+
+
+def write_look_files(root, look_count, material_count, object_count, seed=0, nodes=8):
+    """
+    Write look_count look files under root, nested like an asset library, and return their paths.
+
+    Material i of every look is published for the objects whose index is i modulo
+    material_count, on slot 0.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for look_index in range(look_count):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        for index in range(material_count):
+            mat = bpy.data.materials.new(material_name(look_index, index))
+            mat.use_nodes = True
+            mat.use_fake_user = True
+            tree = mat.node_tree
+            previous = tree.nodes["Principled BSDF"].inputs["Base Color"]
+            for node_index in range(nodes):
+                mix = tree.nodes.new("ShaderNodeMix")
+                mix.data_type = 'RGBA'
+                mix.inputs["Factor"].default_value = rng.random()
+                tree.links.new(mix.outputs["Result"], previous)
+                previous = mix.inputs["A"]
+
+            object_slots = {object_base_name(obj): [0] for obj in range(index, object_count, material_count)}
+            mat[PIPELINE_ATTRIBUTE] = manifest.encode_manifest(object_slots)
+
+        directory = os.path.join(root, f"asset_{look_index:03d}", "3d_look", "publish")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"asset_{look_index:03d}_3d_look_v001.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=path)
+        paths.append(path)
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    return paths
+
+
+def build_scene(object_count, seed=0):
+    """
+    Fill the open (empty) file with object_count mesh objects and return them.
+    """
+    rng = random.Random(seed)
+    scene = bpy.context.scene
+    template = bpy.data.meshes.new("bench_mesh")
+    template.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+
+    objects = []
+    for index in range(object_count):
+        # every object gets its own mesh, like a scene of unique assets
+        obj = bpy.data.objects.new(scene_object_name(index, rng), template.copy())
+        scene.collection.objects.link(obj)
+        objects.append(obj)
+    return objects
@@ -0,0 +1,155 @@
+"""
+The Look Assigner benchmark suite, run headless on synthetic fixtures (see fixtures.py).
+
+    blender -b --factory-startup --python benchmarks/run_suite.py -- --output results.json
+    blender -b --factory-startup --python benchmarks/run_suite.py -- --output results.json --baseline baseline.json
+
+Times scanning for look files, listing their materials (catalog cold and warm), matching
+stored object names against the scene and full Assign Shaders runs, and writes the
+results as JSON. With --baseline the medians are compared against a stored result file
+and Blender exits with code 1 when anything got more than --tolerance slower.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import addon_utils
+import bpy
+
+from _common import compare_to_baseline, script_args, summarize, time_runs, write_json
+
+import fixtures
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="run_suite")
+    parser.add_argument("--looks", type=int, default=20, help="Number of look files")
+    parser.add_argument("--materials", type=int, default=200, help="Materials per look file")
+    parser.add_argument("--objects", type=int, default=10000, help="Mesh objects in the shot scene")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures-dir", help="Where the fixtures are written (default: a new temp folder)")
+    parser.add_argument("--output", default="look_assigner_bench.json")
+    parser.add_argument("--baseline", help="Result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline, as a fraction")
+    return parser.parse_args(script_args())
+
+
+def setup_addon(look_root, cache_dir):
+    addon_utils.enable("look_assigner", default_set=True)
+    from look_assigner import catalog
+    from look_assigner import preferences
+
+    # keep the benchmark catalog out of the user's config folder
+    catalog._catalog = catalog.MaterialCatalog(os.path.join(cache_dir, catalog.CATALOG_FILE_NAME))
+
+    prefs = preferences.get(bpy.context)
+    prefs.paths.clear()
+    item = prefs.paths.add()
+    item.name = "bench"
+    item.file_path = look_root
+    item.recursive = True
+
+
+def run_benchmarks(args, look_paths, objects):
+    from look_assigner import assignment
+    from look_assigner import catalog
+    from look_assigner import discovery
+    from look_assigner.operators import LoadMaterialsOperator
+    from look_assigner.properties import get_materials_from_blend
+
+    lookProps = bpy.context.scene.LookAssigner_Properties
+    lookProps.list_all_materials = True
+    results = {}
+
+    # scan
+    lookProps.selected_path_enum = '0'
+    results["scan_for_blend_files.cold"] = summarize(time_runs(
+        bpy.ops.object.scan_for_blend_files, args.repeat, setup=discovery.directory_snapshots.invalidate))
+    results["scan_for_blend_files.warm"] = summarize(time_runs(bpy.ops.object.scan_for_blend_files, args.repeat))
+    assert len(lookProps.blend_files) == len(look_paths), "scan did not find every look file"
+
+    # list
+    def list_all():
+        for path in look_paths:
+            get_materials_from_blend(path)
+    results["get_materials_from_blend.cold"] = summarize(time_runs(list_all, args.repeat, setup=catalog.get_catalog().clear))
+    results["get_materials_from_blend.warm"] = summarize(time_runs(list_all, args.repeat))
+
+    # match, every stored name of the first look against the whole scene
+    stored_names = [fixtures.object_base_name(index) for index in range(args.objects)]
+    results["fuzzy_search_objects"] = summarize(time_runs(
+        lambda: LoadMaterialsOperator.fuzzy_search_objects(None, objects, stored_names), args.repeat))
+
+    # full Assign Shaders runs of the first look, starting from an untouched scene every time
+    lookProps.blend_file_index = [item.path for item in lookProps.blend_files].index(look_paths[0])
+    for material in lookProps.materials:
+        material.use = True
+    snapshot = assignment.snapshot_ids()
+
+    def reset_scene():
+        assignment.remove_new_ids(snapshot)
+        for obj in objects:
+            obj.data.materials.clear()
+
+    results["load_materials.execute"] = summarize(time_runs(
+        bpy.ops.object.load_materials_operator, args.repeat, setup=reset_scene))
+    results["load_materials.dry_run"] = summarize(time_runs(
+        lambda: bpy.ops.object.load_materials_operator(dry_run=True), args.repeat, setup=reset_scene))
+    reset_scene()
+
+    return results
+
+
+def print_results(results, baseline, tolerance):
+    print("\nLook Assigner benchmark suite")
+    width = max(len(name) for name in results)
+    if baseline is None:
+        for name, entry in results.items():
+            print(f"  {name.ljust(width)}  {entry['median_ms']:10.2f} ms median  {entry['best_ms']:10.2f} ms best")
+        return []
+
+    rows, regressions = compare_to_baseline(results, baseline, tolerance)
+    for name, median, previous, ratio in rows:
+        if previous is None:
+            print(f"  {name.ljust(width)}  {median:10.2f} ms median  (not in baseline)")
+        else:
+            flag = "  REGRESSION" if name in regressions else ""
+            print(f"  {name.ljust(width)}  {median:10.2f} ms median  {previous:10.2f} ms baseline  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    args = parse_args()
+
+    fixtures_dir = args.fixtures_dir or tempfile.mkdtemp(prefix="look_assigner_suite_")
+    look_root = os.path.join(fixtures_dir, "looks")
+    look_paths = fixtures.write_look_files(look_root, args.looks, args.materials, args.objects, args.seed)
+
+    setup_addon(look_root, fixtures_dir)
+    objects = fixtures.build_scene(args.objects, args.seed)
+
+    results = run_benchmarks(args, look_paths, objects)
+    params = {key: getattr(args, key) for key in ("looks", "materials", "objects", "repeat", "seed")}
+    write_json(args.output, {"blender": bpy.app.version_string, "params": params, "results": results})
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline_data = json.load(file)
+        if baseline_data.get("params") != params:
+            print(f"Warning: baseline was run with {baseline_data.get('params')}, not {params}")
+        baseline = baseline_data.get("results", {})
+
+    regressions = print_results(results, baseline, args.tolerance)
+    print(f"\nResults written to {args.output}")
+    if regressions:
+        print(f"{len(regressions)} regressions against {args.baseline}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -34,12 +34,18 @@ bl_info = {
 if "bpy" in locals():
     import importlib
     importlib.reload(preferences)
+    importlib.reload(indexer)
+    importlib.reload(listing)
+    importlib.reload(thumbnails)
     importlib.reload(properties)
     importlib.reload(operators)
     importlib.reload(ui)
 else:
     import bpy
     from . import preferences
+    from . import indexer
+    from . import listing
+    from . import thumbnails
     from . import properties
     from . import operators
     from . import ui
@@ -53,6 +59,9 @@ def register():
 
     prefs = preferences.get(bpy.context)
     prefs.update_logging_level()
+
+    if prefs.index_on_startup and not bpy.app.background:
+        bpy.app.timers.register(indexer.start_on_startup, first_interval=1.0)
    
 def unregister():
     ui.unregister()
@@ -0,0 +1,401 @@
+"""
+Assignment planning for the Look Assigner.
+
+An Assign Shaders run is split in two steps: build_*_plan() works out which
+material every candidate object slot should end up with, in a single pass over the
+shaders, and apply_plan() writes only the slots that actually change. Planning
+never modifies the scene, which is what the dry-run mode relies on.
+"""
+
+import time
+
+import bpy
+
+from . import updates
+from . import tracing
+from .matching import ObjectNameIndex
+from .manifest import parse_manifest, ManifestError
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+PLAN_PIPELINE = 'PIPELINE'
+PLAN_FORCE = 'FORCE'
+
+# the ID collections an append or link can add to, used to undo a dry run
+APPENDED_ID_COLLECTIONS = ("materials", "node_groups", "images", "textures", "libraries")
+
+
+class AssignmentPlan:
+    """
+    The complete (object, slot) -> material plan for one assignment run.
+
+    assignments keeps every matched object slot with its target material, in the order
+    they were matched. Slots that already carry their target material are also listed
+    in already_correct and are skipped by apply_plan().
+    """
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.assignments = {}
+        self.already_correct = set()
+        self.unmatched_names = []
+        # filled in by apply_plan()
+        self.mesh_writes = 0
+        self.object_writes = 0
+        self.writes_saved = 0
+
+    def add(self, obj, mat, slot=0):
+        # later shaders win, exactly like the sequential assignment did
+        key = (obj, slot)
+        self.assignments[key] = mat
+        if is_assigned(obj, mat, self.mode, slot):
+            self.already_correct.add(key)
+        else:
+            self.already_correct.discard(key)
+
+    @property
+    def matched_count(self):
+        return len({obj for obj, _ in self.assignments})
+
+    @property
+    def unmatched_count(self):
+        return len(self.unmatched_names)
+
+    @property
+    def already_correct_count(self):
+        # an object is correct when none of its slots need writing
+        pending_objects = {obj for obj, slot in self.assignments if (obj, slot) not in self.already_correct}
+        return self.matched_count - len(pending_objects)
+
+    def pending(self):
+        """
+        Return the (object, slot, material) entries that still need to be written.
+        """
+        return [(obj, slot, mat) for (obj, slot), mat in self.assignments.items() if (obj, slot) not in self.already_correct]
+
+    def summary(self):
+        return (f"{self.matched_count} matched, {self.unmatched_count} unmatched, "
+                f"{self.already_correct_count} already correct")
+
+
+def resolve_slot(materials, slot):
+    """
+    Return the slot a stored slot index maps to on the object, or None when a slot has to be added.
+
+    Stored indices beyond the object's slots fall back to the first slot.
+    """
+    if slot < len(materials):
+        return slot
+    return 0 if len(materials) > 0 else None
+
+
+def material_name(mat):
+    """
+    Plans can hold material names instead of datablocks when they are built from a sidecar.
+    """
+    return mat if isinstance(mat, str) else mat.name
+
+
+def is_assigned(obj, mat, mode, slot=0):
+    """
+    Check whether the object already carries the material the way the plan mode would assign it.
+
+    Looks at the object's material slots, so materials linked at object level count too.
+    """
+    slots = obj.material_slots
+    if mode == PLAN_FORCE:
+        return any(slot.material is not None and slot.material.name == material_name(mat) for slot in slots)
+    index = resolve_slot(slots, slot)
+    if index is None or slots[index].material is None:
+        return False
+    if isinstance(mat, str):
+        return slots[index].material.name == mat
+    return slots[index].material == mat
+
+
+def build_pipeline_plan(objects, shaders, pipeline_attr, name_index=None):
+    """
+    Plan the assignment of pipelined shaders onto the candidate objects using their stored object names.
+    """
+    shader_manifests = []
+    for mat in shaders:
+        if pipeline_attr not in mat:
+            continue
+
+        try:
+            shader_manifests.append((mat, parse_manifest(mat[pipeline_attr])))
+        except ManifestError as e:
+            logger.warning(f"Shader {mat.name} has an invalid pipeline manifest, skipping it - {e}")
+
+    return build_manifest_plan(objects, shader_manifests, name_index)
+
+
+def build_manifest_plan(objects, shader_manifests, name_index=None):
+    """
+    Plan the assignment of (material, LookManifest) pairs onto the candidate objects.
+
+    The material can be a name, e.g. when planning from a look sidecar before anything is appended.
+    """
+    plan = AssignmentPlan(PLAN_PIPELINE)
+
+    with tracing.span("match") as stage:
+        if name_index is None:
+            name_index = ObjectNameIndex.from_objects(objects)
+        objects_by_name = {obj.name: obj for obj in objects}
+
+        for mat, manifest in shader_manifests:
+            for stored_name, slots in manifest.object_slots():
+                # handle namespaces and blender's .### naming issue
+                matched_names = name_index.match(stored_name)
+                if not matched_names:
+                    plan.unmatched_names.append(stored_name)
+                    logger.info(f"Stored Geometry Object : {stored_name} not found in scene")
+                    continue
+
+                for obj_name in matched_names:
+                    for slot in slots:
+                        plan.add(objects_by_name[obj_name], mat, slot)
+        stage.count(shaders=len(shader_manifests), objects=len(objects), matched=plan.matched_count, unmatched=plan.unmatched_count)
+
+    logger.debug(f'Pipeline assignment plan - {plan.summary()}')
+    return plan
+
+
+def build_force_plan(objects, mat):
+    """
+    Plan a forced assignment of a single material onto every candidate object.
+    """
+    plan = AssignmentPlan(PLAN_FORCE)
+    for obj in objects:
+        plan.add(obj, mat)
+
+    logger.debug(f'Forced assignment plan - {plan.summary()}')
+    return plan
+
+
+def _link_to_object(obj, index, mat):
+    material_slot = obj.material_slots[index]
+    material_slot.link = 'OBJECT'
+    material_slot.material = mat
+
+
+def _link_to_data(obj, index):
+    # the object follows its mesh again for this slot
+    material_slot = obj.material_slots[index]
+    if material_slot.link == 'OBJECT':
+        material_slot.link = 'DATA'
+
+
+def _targets_by_mesh(plan):
+    """
+    Group the planned (object, slot) -> material entries by mesh, for the meshes that have pending writes.
+    """
+    pending_meshes = {obj.data for obj, _, _ in plan.pending()}
+    targets = {}
+    for (obj, slot), mat in plan.assignments.items():
+        if obj.data in pending_meshes:
+            targets.setdefault(obj.data, {}).setdefault(slot, {})[obj] = mat
+    return targets
+
+
+class SlotBackup:
+    """
+    The material slots an assignment overwrote, so a cancelled run can put them back.
+
+    Mesh material lists are saved whole before their first write, object slots before
+    they are linked or unlinked.
+    """
+
+    def __init__(self):
+        self.meshes = {}
+        self.object_slots = {}
+
+    def save_mesh(self, mesh):
+        if mesh not in self.meshes:
+            self.meshes[mesh] = list(mesh.materials)
+
+    def save_object_slot(self, obj, index):
+        key = (obj, index)
+        if key not in self.object_slots and index < len(obj.material_slots):
+            material_slot = obj.material_slots[index]
+            self.object_slots[key] = (material_slot.link, material_slot.material)
+
+    def restore(self):
+        """
+        Put every saved slot back and return how many datablocks were restored.
+        """
+        with updates.deferred_updates() as transaction:
+            for mesh, saved in self.meshes.items():
+                materials = mesh.materials
+                if len(materials) == len(saved):
+                    # keep the slot count, so object level links on the mesh survive
+                    for index, mat in enumerate(saved):
+                        if materials[index] != mat:
+                            materials[index] = mat
+                else:
+                    materials.clear()
+                    for mat in saved:
+                        materials.append(mat)
+                transaction.tag(mesh, {'DATA'})
+
+            for (obj, index), (link, mat) in self.object_slots.items():
+                if index >= len(obj.material_slots):
+                    continue
+                material_slot = obj.material_slots[index]
+                material_slot.link = link
+                if link == 'OBJECT':
+                    material_slot.material = mat
+                transaction.tag(obj, {'OBJECT'})
+
+        restored = len(self.meshes) + len(self.object_slots)
+        self.meshes.clear()
+        self.object_slots.clear()
+        return restored
+
+
+class PlanWriter:
+    """
+    Writes the pending slots of a plan mesh by mesh, all at once or in time slices.
+
+    apply_plan() writes everything in one go. An interactive run calls write() with a
+    time budget on every timer tick until finished is set, and can hand in a SlotBackup
+    to undo what was written so far.
+    """
+
+    def __init__(self, plan, backup=None):
+        self.plan = plan
+        self.backup = backup
+        self.pending_count = len(plan.pending())
+        self.written_meshes = set()
+        self.written_objects = set()
+        self._targets = list(_targets_by_mesh(plan).items())
+        self.done = 0
+
+    @property
+    def total(self):
+        return len(self._targets)
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+    def write(self, budget=None):
+        """
+        Write meshes until all are done or budget seconds have passed, and return how many were written.
+        """
+        start = time.perf_counter()
+        first = self.done
+        with tracing.span("assign") as stage, updates.deferred_updates() as transaction:
+            while not self.finished:
+                mesh, slot_targets = self._targets[self.done]
+                self.done += 1
+                written_meshes, written_objects = self._write_mesh(mesh, slot_targets)
+
+                # every changed datablock is tagged once when the transaction ends, with a single redraw
+                for written_mesh in written_meshes:
+                    transaction.tag(written_mesh, {'DATA'})
+                for obj in written_objects:
+                    transaction.tag(obj, {'OBJECT'})
+
+                if budget is not None and time.perf_counter() - start >= budget:
+                    break
+            stage.count(meshes=self.done - first, mesh_writes=len(self.written_meshes), object_writes=len(self.written_objects))
+        return self.done - first
+
+    def finish(self):
+        """
+        Store the write counts on the plan and return how many object slots were changed.
+        """
+        plan = self.plan
+        plan.mesh_writes = len(self.written_meshes)
+        plan.object_writes = len(self.written_objects)
+        plan.writes_saved = max(0, self.pending_count - plan.mesh_writes - plan.object_writes)
+        logger.debug(f'Wrote {plan.mesh_writes} meshes and {plan.object_writes} object slots, {plan.writes_saved} writes saved')
+        return self.pending_count
+
+    def _write_mesh(self, mesh, slot_targets):
+        plan = self.plan
+        backup = self.backup
+        materials = mesh.materials
+        editable = mesh.library is None
+        written_meshes = set()
+        written_objects = set()
+
+        for slot, object_materials in slot_targets.items():
+            pending_objects = [obj for obj in object_materials if (obj, slot) not in plan.already_correct]
+            if not pending_objects:
+                continue
+            targets = set(object_materials.values())
+            index = resolve_slot(materials, slot)
+
+            if backup is not None:
+                if editable:
+                    backup.save_mesh(mesh)
+                if index is not None:
+                    for obj in pending_objects:
+                        backup.save_object_slot(obj, index)
+
+            if len(targets) == 1 and editable:
+                mat = targets.pop()
+                if plan.mode == PLAN_FORCE or index is None:
+                    materials.clear()
+                    materials.append(mat)
+                    index = 0
+                else:
+                    materials[index] = mat
+                written_meshes.add(mesh)
+                for obj in pending_objects:
+                    _link_to_data(obj, index)
+                logger.info(f'Shader {mat.name} assigned to mesh : {mesh.name} [{index}] ({len(pending_objects)} objects)')
+                continue
+
+            if index is None:
+                if not editable:
+                    logger.warning(f'Linked mesh {mesh.name} has no material slots, skipping {len(pending_objects)} objects')
+                    continue
+                materials.append(None)
+                index = 0
+                written_meshes.add(mesh)
+            for obj in pending_objects:
+                _link_to_object(obj, index, object_materials[obj])
+                written_objects.add(obj)
+                logger.info(f'Shader {object_materials[obj].name} assigned to : {obj.name} [{index}] (object link)')
+
+        self.written_meshes |= written_meshes
+        self.written_objects |= written_objects
+        return written_meshes, written_objects
+
+
+def apply_plan(plan):
+    """
+    Write the pending assignments of the plan and return how many object slots were changed.
+
+    Targets are grouped by mesh, so a mesh shared by linked duplicates or instances is
+    written once. When the objects sharing a mesh need different materials in the same
+    slot, or the mesh comes from a library, the slot is linked at object level instead.
+    The writes saved compared to writing every object are kept on the plan.
+    """
+    writer = PlanWriter(plan)
+    writer.write()
+    return writer.finish()
+
+
+def snapshot_ids():
+    """
+    Record the datablocks that exist before an append, see remove_new_ids().
+    """
+    return {attr: set(getattr(bpy.data, attr)) for attr in APPENDED_ID_COLLECTIONS}
+
+
+def remove_new_ids(snapshot):
+    """
+    Remove every datablock added since the snapshot was taken and return how many were removed.
+    """
+    new_ids = []
+    for attr, existing in snapshot.items():
+        new_ids.extend(id_data for id_data in getattr(bpy.data, attr) if id_data not in existing)
+
+    if new_ids:
+        bpy.data.batch_remove(new_ids)
+    return len(new_ids)
@@ -0,0 +1,128 @@
+"""
+Headless batch jobs, run inside the `blender -b` workers started by tools/look_batch.py.
+
+Each job (publishing a master file, applying looks to a shot) works on the file the
+worker opened and returns a small dict of results for the batch report. Failures are
+raised, the worker turns them into a failed entry.
+"""
+
+import os
+import time
+
+import bpy
+
+from . import preferences
+from . import sidecar
+from . import catalog
+from . import loading
+from . import assignment
+from . import tracing
+from .operators import PUBLISH_SCENE_NAME, published_look_materials
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+
+def publish_look(output_path, compress=True):
+    """
+    Publish the open master file as the look file output_path.
+
+    The manifests and the preview grid are built by the same operator as the Create Look
+    from Scene button, then only the PUBLISH_SHADERS scene and its shaders are written,
+    with the look sidecar next to it.
+    """
+    prefs = preferences.get(bpy.context)
+    start = time.perf_counter()
+
+    result = bpy.ops.object.build_pipelined_shader_file_operator()
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"Building the look was cancelled ({', '.join(result)})")
+    build_time = time.perf_counter() - start
+
+    scene = bpy.data.scenes[PUBLISH_SCENE_NAME]
+    materials = published_look_materials(prefs.pipeline_attribute_name)
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    # image paths stay valid from wherever the look file is written
+    bpy.data.libraries.write(output_path, {scene, *materials}, path_remap='RELATIVE_ALL', fake_user=True, compress=compress)
+
+    if prefs.write_look_sidecar:
+        sidecar.write_sidecar(output_path, sidecar.describe_materials(materials, prefs.pipeline_attribute_name, loading.absolute_path))
+
+    logger.info(f"Published {len(materials)} shaders to {output_path}")
+    return {
+        "output": output_path,
+        "materials": len(materials),
+        "build_seconds": round(build_time, 4),
+        "write_seconds": round(time.perf_counter() - start - build_time, 4),
+        "size": os.path.getsize(output_path),
+    }
+
+
+def apply_looks(look_paths, material_names=None, link=False, make_override=False, dry_run=False, output_path=None):
+    """
+    Load the shaders of the look files into the open shot file, assign them from their
+    pipeline manifests to the meshes of the scene and save the shot.
+
+    All shaders of every look file are loaded unless material_names is given. A dry run
+    only plans, nothing is saved. The shot is saved in place unless output_path is given.
+    """
+    with tracing.session("Batch Apply", file=bpy.data.filepath):
+        return _apply_looks(look_paths, material_names, link, make_override, dry_run, output_path)
+
+
+def _apply_looks(look_paths, material_names, link, make_override, dry_run, output_path):
+    prefs = preferences.get(bpy.context)
+    timings = {}
+    start = time.perf_counter()
+
+    shaders = []
+    for look_path in look_paths:
+        names = material_names or catalog.read_material_names(look_path)
+        shaders.extend(loading.load_materials(look_path, names, link, make_override, replace_changed=not dry_run,
+                                              pipeline_attr=prefs.pipeline_attribute_name))
+    timings["load_seconds"] = time.perf_counter() - start
+
+    objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+    pipelined_shaders = [shader for shader in shaders if prefs.pipeline_attribute_name in shader]
+    plan = assignment.build_pipeline_plan(objects, pipelined_shaders, prefs.pipeline_attribute_name)
+    timings["plan_seconds"] = time.perf_counter() - start - timings["load_seconds"]
+
+    changed = 0
+    saved = None
+    if not dry_run:
+        changed = assignment.apply_plan(plan)
+        timings["apply_seconds"] = time.perf_counter() - start - timings["load_seconds"] - timings["plan_seconds"]
+
+        save_start = time.perf_counter()
+        if output_path:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            bpy.ops.wm.save_as_mainfile(filepath=output_path, copy=True)
+            saved = output_path
+        else:
+            bpy.ops.wm.save_mainfile()
+            saved = bpy.data.filepath
+        timings["save_seconds"] = time.perf_counter() - save_start
+
+    logger.info(f"Applied {len(look_paths)} looks to {bpy.data.filepath} - {plan.summary()}")
+    return {
+        "looks": list(look_paths),
+        "dry_run": dry_run,
+        "shaders": len(shaders),
+        "pipelined_shaders": len(pipelined_shaders),
+        "objects": len(objects),
+        "matched": plan.matched_count,
+        "unmatched": plan.unmatched_count,
+        "already_correct": plan.already_correct_count,
+        "changed_slots": changed,
+        "mesh_writes": plan.mesh_writes,
+        "object_link_writes": plan.object_writes,
+        "writes_saved": plan.writes_saved,
+        "unmatched_names": sorted(set(plan.unmatched_names)),
+        "saved": saved,
+        **{key: round(value, 4) for key, value in timings.items()},
+    }
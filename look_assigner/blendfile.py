@@ -0,0 +1,482 @@
+"""
+Minimal reader for the .blend file format.
+
+Lists ID names (materials by default) by walking the file header and the BHead
+blocks, without Blender loading the file as a library. The offset of the name
+inside the ID struct is taken from the file's own SDNA block, so the reader
+follows whatever Blender version wrote the file. The preview images saved with
+the materials are read in a second pass, by the addresses the material blocks
+point at. Gzip and zstd compressed files are supported, zstd needs the `zstandard` module that ships with Blender.
+
+This module does not depend on bpy, so it is safe to use from worker threads and processes.
+"""
+
+import gzip
+import os
+import re
+import struct
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    # Python 3.14+
+    from compression import zstd as stdlib_zstd
+except ImportError:
+    stdlib_zstd = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+BLOCK_MATERIAL = b"MA\x00\x00"
+BLOCK_DATA = b"DATA"
+BLOCK_DNA = b"DNA1"
+BLOCK_END = b"ENDB"
+
+# enough of an ID block to hold the struct up to and including its name
+ID_HEAD_SIZE = 1024
+# enough of a material block to hold the whole Material struct, up to its preview pointer
+MATERIAL_HEAD_SIZE = 8192
+
+# a larger data block can't hold the pixels of a preview image
+PREVIEW_MAX_BYTES = 4 * 1024 * 1024
+
+READ_CHUNK_SIZE = 1 << 20
+
+ARRAY_PATTERN = re.compile(r'\[(\d+)\]')
+
+# the errors a damaged or truncated file can surface as while it is read
+READ_ERRORS = (OSError, EOFError, struct.error, ValueError)
+
+
+class BlendFileError(Exception):
+    """
+    Raised when a file can't be read as a .blend file.
+    """
+
+
+class BlendHeader:
+    """
+    The file header: pointer size, endianness, version and the BHead layout that follows from them.
+    """
+
+    def __init__(self, pointer_size, endian, version, large_bhead=False):
+        self.pointer_size = pointer_size
+        self.endian = endian
+        self.version = version
+        self.large_bhead = large_bhead
+
+        pointer_format = "Q" if pointer_size == 8 else "I"
+        if large_bhead:
+            # code, SDNAnr, old, len, nr
+            self.bhead_struct = struct.Struct(f"{endian}4siQqq")
+        else:
+            # code, len, old, SDNAnr, nr
+            self.bhead_struct = struct.Struct(f"{endian}4si{pointer_format}ii")
+
+    def unpack_bhead(self, data):
+        """
+        Return (code, length, old address, SDNA index, count) for a raw BHead.
+        """
+        if self.large_bhead:
+            code, sdna_index, old, length, count = self.bhead_struct.unpack(data)
+        else:
+            code, length, old, sdna_index, count = self.bhead_struct.unpack(data)
+        return code, length, old, sdna_index, count
+
+
+class BlendBlock:
+    """
+    A BHead plus the head of its data, the full data is only kept for the DNA1 block.
+    """
+
+    __slots__ = ("code", "length", "old", "sdna_index", "count", "data")
+
+    def __init__(self, code, length, old, sdna_index, count, data):
+        self.code = code
+        self.length = length
+        self.old = old
+        self.sdna_index = sdna_index
+        self.count = count
+        self.data = data
+
+
+class SDNA:
+    """
+    The struct definitions stored in the DNA1 block, only what is needed to locate struct members.
+    """
+
+    def __init__(self, data, header):
+        self.header = header
+        self.names, self.types, self.type_lengths, self.structs = self._parse(data, header.endian)
+        self._struct_index = {self.types[type_index]: index for index, (type_index, _) in enumerate(self.structs)}
+
+    @staticmethod
+    def _parse(data, endian):
+        if data[:4] != b"SDNA":
+            raise BlendFileError("DNA1 block does not start with SDNA")
+
+        int_struct = struct.Struct(f"{endian}i")
+        short_struct = struct.Struct(f"{endian}h")
+        offset = 4
+
+        def expect(tag):
+            nonlocal offset
+            offset = (offset + 3) & ~3
+            if data[offset:offset + 4] != tag:
+                raise BlendFileError(f"SDNA is missing its {tag.decode()} section")
+            offset += 4
+
+        def read_strings():
+            nonlocal offset
+            count = int_struct.unpack_from(data, offset)[0]
+            offset += 4
+            strings = []
+            for _ in range(count):
+                end = data.index(b"\x00", offset)
+                strings.append(data[offset:end].decode("utf-8", "replace"))
+                offset = end + 1
+            return strings
+
+        expect(b"NAME")
+        names = read_strings()
+        expect(b"TYPE")
+        types = read_strings()
+
+        expect(b"TLEN")
+        type_lengths = list(struct.unpack_from(f"{endian}{len(types)}h", data, offset))
+        offset += 2 * len(types)
+
+        expect(b"STRC")
+        struct_count = int_struct.unpack_from(data, offset)[0]
+        offset += 4
+        structs = []
+        for _ in range(struct_count):
+            type_index = short_struct.unpack_from(data, offset)[0]
+            field_count = short_struct.unpack_from(data, offset + 2)[0]
+            offset += 4
+            fields = struct.unpack_from(f"{endian}{field_count * 2}h", data, offset)
+            offset += 4 * field_count
+            structs.append((type_index, list(zip(fields[0::2], fields[1::2]))))
+
+        return names, types, type_lengths, structs
+
+    def struct_index(self, struct_name):
+        return self._struct_index.get(struct_name)
+
+    def struct_size(self, struct_name):
+        index = self.struct_index(struct_name)
+        return None if index is None else self.type_lengths[self.structs[index][0]]
+
+    def field_size(self, type_index, name):
+        array_length = 1
+        for dimension in ARRAY_PATTERN.findall(name):
+            array_length *= int(dimension)
+
+        if name.startswith("*") or name.startswith("(*"):
+            return self.header.pointer_size * array_length
+        return self.type_lengths[type_index] * array_length
+
+    def field_offset(self, struct_name, field_name):
+        """
+        Return (offset, size) of a member of a struct, or None if the struct doesn't have it.
+        """
+        index = self.struct_index(struct_name)
+        if index is None:
+            return None
+
+        offset = 0
+        for type_index, name_index in self.structs[index][1]:
+            name = self.names[name_index]
+            size = self.field_size(type_index, name)
+            if name.split("[", 1)[0].lstrip("*") == field_name:
+                return offset, size
+            offset += size
+        return None
+
+
+def _open_stream(filepath):
+    """
+    Open a .blend file, transparently decompressing it. Returns (stream, seekable).
+    """
+    with open(filepath, "rb") as file:
+        magic = file.read(4)
+
+    if magic[:2] == GZIP_MAGIC:
+        return gzip.open(filepath, "rb"), False
+
+    if magic == ZSTD_MAGIC:
+        if zstandard is not None:
+            # Blender writes many frames, without read_across_frames every frame end is a short read
+            return zstandard.ZstdDecompressor().stream_reader(open(filepath, "rb"), closefd=True, read_across_frames=True), False
+        if stdlib_zstd is not None:
+            return stdlib_zstd.ZstdFile(filepath, mode="rb"), False
+        raise BlendFileError(f"{filepath} is zstd compressed and no zstd decompressor is available")
+
+    return open(filepath, "rb"), True
+
+
+def _read_up_to(stream, size):
+    """
+    Read size bytes, or fewer only at the end of the stream. Decompressing readers can
+    return short reads before that, e.g. at compression frame boundaries.
+    """
+    data = stream.read(size)
+    if len(data) == size or not data:
+        return data
+    chunks = [data]
+    remaining = size - len(data)
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _read_exact(stream, size):
+    data = _read_up_to(stream, size)
+    if len(data) != size:
+        raise BlendFileError("Unexpected end of file")
+    return data
+
+
+def _skip(stream, size, seekable):
+    if seekable:
+        stream.seek(size, os.SEEK_CUR)
+        return
+    while size > 0:
+        chunk = stream.read(min(size, READ_CHUNK_SIZE))
+        if not chunk:
+            raise BlendFileError("Unexpected end of file")
+        size -= len(chunk)
+
+
+def read_header(stream):
+    """
+    Parse the file header from the start of the stream.
+
+    Handles the classic 12 byte header (BLENDER_v401) and the 17 byte header of newer
+    files (BLENDER17-01v0500) whose BHeads use 64 bit lengths.
+    """
+    data = _read_exact(stream, 12)
+    if data[:7] != b"BLENDER":
+        raise BlendFileError("Not a .blend file")
+
+    if data[7:9].isdigit():
+        header_size = int(data[7:9])
+        data += _read_exact(stream, header_size - 12)
+        if data[9:10] != b"-":
+            raise BlendFileError(f"Unsupported pointer size in header {data!r}")
+        format_version = int(data[10:12])
+        endian = "<" if data[12:13] == b"v" else ">"
+        version = int(data[13:17])
+        return BlendHeader(8, endian, version, large_bhead=format_version >= 1)
+
+    pointer_size = {b"_": 4, b"-": 8}.get(data[7:8])
+    endian = {b"v": "<", b"V": ">"}.get(data[8:9])
+    if pointer_size is None or endian is None:
+        raise BlendFileError(f"Unsupported header {data!r}")
+    return BlendHeader(pointer_size, endian, int(data[9:12]))
+
+
+class BlockStream:
+    """
+    The BHead blocks of a .blend file, read front to back.
+
+    Iterating yields (code, length, old address, SDNA index, count) for every block up
+    to ENDB. read() returns data of the current block, whatever is left of it is skipped
+    when the next block is requested. Use it as a context manager and wrap the reading
+    in `except READ_ERRORS`.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.header = None
+        try:
+            self._stream, self._seekable = _open_stream(filepath)
+        except OSError as e:
+            raise BlendFileError(f"{filepath} could not be opened - {e}") from e
+        self._remaining = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stream.close()
+
+    def read_header(self):
+        self.header = read_header(self._stream)
+        return self.header
+
+    def __iter__(self):
+        if self.header is None:
+            self.read_header()
+        bhead_size = self.header.bhead_struct.size
+
+        while True:
+            _skip(self._stream, self._remaining, self._seekable)
+            self._remaining = 0
+
+            raw = _read_up_to(self._stream, bhead_size)
+            if len(raw) < bhead_size:
+                # some writers omit ENDB, a short read at a block boundary is the end
+                return
+            code, length, old, sdna_index, count = self.header.unpack_bhead(raw)
+            if code == BLOCK_END:
+                return
+            if length < 0:
+                raise BlendFileError(f"Corrupt block {code!r} in {self.filepath}")
+
+            self._remaining = length
+            yield code, length, old, sdna_index, count
+
+    def read(self, size=None):
+        """
+        Read size bytes (all that is left when None) of the current block's data.
+        """
+        size = self._remaining if size is None else min(size, self._remaining)
+        data = _read_exact(self._stream, size)
+        self._remaining -= size
+        return data
+
+
+class BlendFile:
+    """
+    A single pass over the BHead blocks of a .blend file.
+
+    Only the blocks whose code is in `codes` keep (the head of) their data, every other
+    block is skipped. The SDNA is always read since it is needed to interpret ID blocks.
+    """
+
+    def __init__(self, filepath, codes=(BLOCK_MATERIAL,), head_size=ID_HEAD_SIZE):
+        self.filepath = filepath
+        self.header = None
+        self.sdna = None
+        self.blocks = []
+        self._read(set(codes), head_size)
+
+    def _read(self, codes, head_size):
+        dna_data = None
+        with BlockStream(self.filepath) as stream:
+            try:
+                self.header = stream.read_header()
+                for code, length, old, sdna_index, count in stream:
+                    if code == BLOCK_DNA:
+                        dna_data = stream.read()
+                    elif code in codes:
+                        self.blocks.append(BlendBlock(code, length, old, sdna_index, count, stream.read(head_size)))
+            except READ_ERRORS as e:
+                raise BlendFileError(f"{self.filepath} could not be read - {e}") from e
+
+        if dna_data is None:
+            raise BlendFileError(f"{self.filepath} has no DNA1 block")
+        self.sdna = SDNA(dna_data, self.header)
+
+    def id_names(self, code=BLOCK_MATERIAL):
+        """
+        Return the names (without the two letter ID code) of the ID blocks with the given code, in file order.
+        """
+        name_field = self.sdna.field_offset("ID", "name")
+        if name_field is None:
+            raise BlendFileError(f"{self.filepath} SDNA has no ID.name")
+        offset, size = name_field
+
+        names = []
+        for block in self.blocks:
+            if block.code != code:
+                continue
+            raw_name = block.data[offset:offset + size].split(b"\x00", 1)[0]
+            names.append(raw_name[2:].decode("utf-8", "replace"))
+        return names
+
+
+    def material_previews(self):
+        """
+        Return {material name: (width, height, pixels)} for the materials saved with a preview image.
+
+        Needs a file read with MATERIAL_HEAD_SIZE heads. The PreviewImage structs and their
+        pixels are data blocks found, in a second pass over the file, by the addresses the
+        materials point at, and read through the PreviewImage layout in the SDNA. A block
+        whose type or size doesn't match that layout gives no preview rather than a wrong
+        one. pixels holds width * height RGBA bytes, bottom row first, in the layout Blender
+        keeps preview images in memory. The largest saved size of every preview is returned.
+        """
+        sdna = self.sdna
+        preview_field = sdna.field_offset("Material", "preview")
+        preview_index = sdna.struct_index("PreviewImage")
+        fields = [sdna.field_offset("PreviewImage", name) for name in ("w", "h", "rect")]
+        if preview_field is None or preview_index is None or None in fields:
+            raise BlendFileError(f"{self.filepath} SDNA has no material previews")
+
+        endian = self.header.endian
+        pointer_size = self.header.pointer_size
+        pointer_format = f"{endian}{'Q' if pointer_size == 8 else 'I'}"
+        (width_offset, width_size), (height_offset, height_size), (rect_offset, rect_size) = fields
+        if width_size != 8 or height_size != 8 or rect_size != 2 * pointer_size:
+            # not the two (icon, large) int sizes and pixel pointers this reader knows
+            return {}
+        preview_size = sdna.struct_size("PreviewImage")
+
+        # preview address -> material name
+        wanted = {}
+        offset = preview_field[0]
+        material_blocks = [block for block in self.blocks if block.code == BLOCK_MATERIAL]
+        for name, block in zip(self.id_names(BLOCK_MATERIAL), material_blocks):
+            if len(block.data) >= offset + pointer_size:
+                preview_address = struct.unpack_from(pointer_format, block.data, offset)[0]
+                if preview_address:
+                    wanted[preview_address] = name
+        if not wanted:
+            return {}
+
+        previews = {}
+        # pixel address -> (material name, width, height), a preview is written before its pixels
+        wanted_pixels = {}
+        with BlockStream(self.filepath) as stream:
+            try:
+                for code, length, old, sdna_index, count in stream:
+                    if code != BLOCK_DATA:
+                        continue
+
+                    if old in wanted:
+                        name = wanted.pop(old)
+                        if sdna_index != preview_index or length < preview_size:
+                            continue
+                        data = stream.read(preview_size)
+                        widths = struct.unpack_from(f"{endian}2i", data, width_offset)
+                        heights = struct.unpack_from(f"{endian}2i", data, height_offset)
+                        rects = struct.unpack_from(f"{endian}2{pointer_format[1]}", data, rect_offset)
+                        # the second size is the large preview, the first the icon
+                        for width, height, rect in zip(widths, heights, rects):
+                            if rect and width > 0 and height > 0 and width * height * 4 <= PREVIEW_MAX_BYTES:
+                                wanted_pixels[rect] = (name, width, height)
+
+                    elif old in wanted_pixels:
+                        name, width, height = wanted_pixels.pop(old)
+                        current = previews.get(name)
+                        if length == width * height * 4 and (current is None or width * height > current[0] * current[1]):
+                            previews[name] = (width, height, stream.read(length))
+
+                    if not wanted and not wanted_pixels:
+                        break
+            except READ_ERRORS as e:
+                raise BlendFileError(f"{self.filepath} could not be read - {e}") from e
+        return previews
+
+
+def read_material_names(filepath):
+    """
+    Return the names of the materials stored in a .blend file.
+    """
+    return BlendFile(filepath, codes=(BLOCK_MATERIAL,)).id_names(BLOCK_MATERIAL)
+
+
+def read_material_previews(filepath):
+    """
+    Return {material name: (width, height, pixels)} for the preview images saved in a .blend file.
+    """
+    return BlendFile(filepath, codes=(BLOCK_MATERIAL,), head_size=MATERIAL_HEAD_SIZE).material_previews()
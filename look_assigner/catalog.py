@@ -0,0 +1,249 @@
+"""
+Persistent material catalog for look files.
+
+Listing the materials of a look file means reading it from disk, which is slow on
+network shares. The catalog remembers, per look file, the material
+names and the pipeline attribute contents we have seen, keyed on (path, size, mtime),
+and keeps them in a JSON file in the Blender user config folder so they survive
+restarts. It is bounded to a number of files and evicts the least recently used ones.
+The pipeline contents let a dry run plan an assignment without opening the look file.
+"""
+
+import bpy
+import os
+import json
+import threading
+
+from collections import OrderedDict
+
+from . import blendfile
+from . import sidecar
+from . import tracing
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+CATALOG_VERSION = 1
+CATALOG_FILE_NAME = "material_catalog.json"
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def file_signature(filepath):
+    """
+    Return the (path, size, mtime) key of a file, or None if it can't be read.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return os.path.normcase(os.path.abspath(filepath)), stat.st_size, stat.st_mtime_ns
+
+
+class MaterialCatalog:
+    """
+    LRU cache of look file contents, see the module docstring.
+
+    Entries are only returned while the size and mtime stored with them still match
+    the file on disk, so a republished look file is simply a cache miss. All methods
+    are safe to call from the background indexer threads.
+    """
+
+    def __init__(self, cache_path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._dirty = False
+        self._lock = threading.RLock()
+        # bumped whenever the set of entries changes, lets derived indexes know when to rebuild
+        self.revision = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self):
+        if not os.path.exists(self.cache_path):
+            return
+
+        try:
+            with open(self.cache_path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Material catalog cache could not be read, starting empty - {e}")
+            return
+
+        if data.get("version") != CATALOG_VERSION:
+            logger.info(f"Material catalog cache version changed, starting empty - {self.cache_path}")
+            return
+
+        with self._lock:
+            self._entries = OrderedDict((entry["path"], entry) for entry in data.get("entries", []))
+            self.revision += 1
+            self._evict()
+        logger.debug(f"Material catalog cache loaded with {len(self._entries)} files - {self.cache_path}")
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": CATALOG_VERSION, "entries": list(self._entries.values())}
+            self._dirty = False
+
+        temp_path = f"{self.cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(temp_path, 'w') as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            self._dirty = True
+            logger.warning(f"Material catalog cache could not be written - {e}")
+
+    def get(self, filepath):
+        """
+        Return the cached entry for the file, or None if it is missing or out of date.
+        """
+        signature = file_signature(filepath)
+        if signature is None:
+            return None
+
+        path, size, mtime = signature
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            if entry["size"] != size or entry["mtime"] != mtime:
+                del self._entries[path]
+                self._dirty = True
+                self.revision += 1
+                return None
+
+            self._entries.move_to_end(path)
+            return entry
+
+    def get_materials(self, filepath):
+        entry = self.get(filepath)
+        return None if entry is None else entry["materials"]
+
+    def get_pipeline_data(self, filepath):
+        entry = self.get(filepath)
+        return None if entry is None else entry["pipeline"]
+
+    def put(self, filepath, materials, pipeline=None):
+        """
+        Store the material names (and optionally pipeline attribute contents) of a file.
+        """
+        signature = file_signature(filepath)
+        if signature is None:
+            return None
+
+        path, size, mtime = signature
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if pipeline is None:
+                # keep pipeline data we already learnt about this exact file
+                same_file = previous and previous["size"] == size and previous["mtime"] == mtime
+                pipeline = previous["pipeline"] if same_file else {}
+
+            entry = {"path": path, "size": size, "mtime": mtime, "materials": list(materials), "pipeline": dict(pipeline)}
+            self._entries[path] = entry
+            self._dirty = True
+            self.revision += 1
+            self._evict()
+            return entry
+
+    def update_pipeline(self, filepath, pipeline):
+        """
+        Merge pipeline attribute contents ({material name: value}) into the entry of a file.
+        """
+        with self._lock:
+            entry = self.get(filepath)
+            if entry is None:
+                return
+            entry["pipeline"].update(pipeline)
+            self._dirty = True
+
+    def set_max_entries(self, max_entries):
+        with self._lock:
+            self.max_entries = max_entries
+            self._evict()
+
+    def entries(self):
+        """
+        Return a snapshot list of all entries, most recently used last.
+        """
+        with self._lock:
+            return list(self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+            self.revision += 1
+
+    def _evict(self):
+        while len(self._entries) > max(self.max_entries, 0):
+            path, _ = self._entries.popitem(last=False)
+            logger.debug(f"Material catalog cache evicted {path}")
+            self._dirty = True
+            self.revision += 1
+
+
+_catalog = None
+
+
+def get_catalog():
+    """
+    Return the add-on wide catalog, loading it from the user config folder on first use.
+    """
+    global _catalog
+    if _catalog is None:
+        cache_dir = bpy.utils.user_resource('CONFIG', path="look_assigner", create=True)
+        max_entries = bpy.context.preferences.addons["look_assigner"].preferences.catalog_cache_size
+        _catalog = MaterialCatalog(os.path.join(cache_dir, CATALOG_FILE_NAME), max_entries)
+        _catalog.load()
+    return _catalog
+
+
+def read_material_names(filepath):
+    """
+    Read the material names of a look file, bypassing the catalog.
+
+    The names come from the look sidecar when there is an up to date one, otherwise the
+    file is parsed directly by the blendfile reader. Blender only opens it as a library
+    when the reader can't handle it.
+    """
+    try:
+        return sidecar.list_materials(filepath)
+    except blendfile.BlendFileError as e:
+        logger.debug(f"Falling back to bpy.data.libraries.load - {e}")
+        return load_material_names(filepath)
+
+
+def load_material_names(filepath):
+    """
+    Read the material names of a look file through bpy.data.libraries.load.
+    """
+    material_names = []
+    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+        if data_from.materials:
+            for mat_name in data_from.materials:
+                material_names.append(mat_name)
+    return material_names
+
+
+def get_material_names(filepath):
+    """
+    Return the material names of a look file from the catalog, reading and caching them on a miss.
+    """
+    with tracing.span("list", file=filepath) as stage:
+        catalog = get_catalog()
+        material_names = catalog.get_materials(filepath)
+        if material_names is not None:
+            logger.debug(f"Material catalog hit - {filepath}")
+            stage.count(catalog_hits=1, materials=len(material_names))
+            return list(material_names)
+
+        material_names = read_material_names(filepath)
+        catalog.put(filepath, material_names)
+        catalog.save()
+        stage.count(catalog_misses=1, materials=len(material_names))
+        return material_names
@@ -0,0 +1,155 @@
+"""
+Discovery of look files under an asset root.
+
+Directories are listed with os.scandir on a thread pool, so on high latency network
+shares many directory listings are in flight at once. The file type reported by the
+directory entry is used as is, which avoids a stat call per file.
+
+Listings are kept in a DirectorySnapshotCache keyed on each directory's mtime. A
+rescan only stats the directories and lists again the ones whose mtime moved, since
+adding, removing or renaming an entry always touches the mtime of its directory.
+
+This module does not depend on bpy.
+"""
+
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+BLEND_EXTENSION = ".blend"
+DEFAULT_WORKERS = 8
+
+
+def scan_directory(directory, extension=BLEND_EXTENSION):
+    """
+    List a single directory. Returns ([(file name, file path)], [sub directory paths]).
+
+    Like os.walk, unreadable directories are skipped and symlinked directories are not followed.
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(extension):
+                    files.append((entry.name, entry.path))
+    except OSError as e:
+        logger.debug(f'Skipping directory {directory} - {e}')
+    return files, subdirs
+
+
+class DirectorySnapshotCache:
+    """
+    Directory listings keyed on (directory, extension), valid while the directory mtime is unchanged.
+    Safe to share between the scan worker threads.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def scan_directory(self, directory, extension=BLEND_EXTENSION):
+        """
+        Same result as the module level scan_directory(), served from the snapshot when it is still valid.
+        """
+        key = (os.path.normcase(os.path.abspath(directory)), extension)
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._snapshots.pop(key, None)
+            return scan_directory(directory, extension)
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot[0] == mtime:
+                self.hits += 1
+                return snapshot[1], snapshot[2]
+            self.misses += 1
+
+        files, subdirs = scan_directory(directory, extension)
+        with self._lock:
+            self._snapshots[key] = (mtime, files, subdirs)
+        return files, subdirs
+
+    def invalidate(self, root=None):
+        """
+        Drop the snapshots of root and everything below it, or all of them when root is None.
+        """
+        with self._lock:
+            if root is None:
+                self._snapshots.clear()
+                return
+
+            root = os.path.normcase(os.path.abspath(root))
+            prefix = os.path.join(root, "")
+            for key in [key for key in self._snapshots if key[0] == root or key[0].startswith(prefix)]:
+                del self._snapshots[key]
+
+
+# shared by every scan in the session
+directory_snapshots = DirectorySnapshotCache()
+
+
+def discover_blend_files(root, recursive=True, max_workers=DEFAULT_WORKERS, extension=BLEND_EXTENSION, snapshots=None,
+                         cancel=None):
+    """
+    Return the (file name, file path) pairs of all look files under root, sorted by path.
+
+    Pass a DirectorySnapshotCache to reuse the listings of directories that haven't changed.
+    Once the threading.Event cancel is set no more directories are listed, and the files
+    found so far are returned.
+    """
+    scan = scan_directory if snapshots is None else snapshots.scan_directory
+    cancelled = cancel.is_set if cancel is not None else lambda: False
+
+    if not recursive or max_workers <= 1:
+        return sorted(_walk_serial(scan, root, recursive, extension, cancelled), key=_sort_key)
+
+    found = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="look_assigner_scan") as pool:
+        pending = {pool.submit(scan, root, extension)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                found.extend(files)
+                if not cancelled():
+                    pending.update(pool.submit(scan, subdir, extension) for subdir in subdirs)
+            if cancelled():
+                # listings already in flight can't be interrupted, the queued ones are dropped
+                pending = {future for future in pending if not future.cancel()}
+
+    return sorted(found, key=_sort_key)
+
+
+def _walk_serial(scan, root, recursive, extension, cancelled):
+    found = []
+    directories = [root]
+    while directories and not cancelled():
+        files, subdirs = scan(directories.pop(), extension)
+        found.extend(files)
+        if recursive:
+            directories.extend(subdirs)
+    return found
+
+
+def _sort_key(item):
+    return os.path.normcase(item[1])
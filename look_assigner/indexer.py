@@ -0,0 +1,236 @@
+"""
+Background catalog indexer.
+
+Crawls every search path in the add-on preferences and reads the material names of
+the look files it finds, so that browsing a root or highlighting a file is served
+from the directory snapshots and the material catalog instead of the network.
+
+Discovery and reading run on worker threads with the bpy-free discovery,
+sidecar and blendfile modules. Results are handed back to the main thread through a queue that
+a bpy.app.timers callback drains; only that callback touches Blender data.
+"""
+
+import bpy
+import queue
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import blendfile
+from . import catalog
+from . import discovery
+from . import preferences
+from . import sidecar
+from . import tracing
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+POLL_INTERVAL = 0.2
+# a look file that fails with an I/O error (e.g. a share hiccup) is read this many times
+READ_ATTEMPTS = 3
+RETRY_DELAY = 0.5
+# how long unregistering waits for a cancelled pass to wind down
+SHUTDOWN_TIMEOUT = 2.0
+
+RESULT_FILES = 'FILES'
+RESULT_READ = 'READ'
+RESULT_CACHED = 'CACHED'
+RESULT_FAILED = 'FAILED'
+RESULT_DONE = 'DONE'
+
+
+class CatalogIndexer:
+    """
+    Runs one indexing pass at a time and keeps the progress for the UI.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._cancel = threading.Event()
+        self._results = queue.SimpleQueue()
+        # keep one bound method so the timer can be found again
+        self._timer = self._drain
+        self.reset()
+
+    def reset(self):
+        self.total = 0
+        self.done = 0
+        self.read = 0
+        self.failed = 0
+        self.current_root = ""
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    @property
+    def cancelling(self):
+        return self.running and self._cancel.is_set()
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 0.0
+
+    def start(self, roots, max_workers=discovery.DEFAULT_WORKERS):
+        """
+        Index the given (path, recursive) roots in the background. Returns False if a pass is already running.
+        """
+        if self.running:
+            return False
+
+        # the catalog has to be created on the main thread
+        material_catalog = catalog.get_catalog()
+
+        self.reset()
+        self._cancel.clear()
+        self._results = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(list(roots), max_workers, material_catalog, self._results),
+            name="look_assigner_indexer",
+            daemon=True,
+        )
+        self._thread.start()
+
+        if not bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.register(self._timer, first_interval=POLL_INTERVAL)
+
+        logger.info(f"Catalog indexer started on {len(roots)} search paths")
+        return True
+
+    def cancel(self):
+        if self.running:
+            self._cancel.set()
+
+    def shutdown(self):
+        """
+        Cancel any running pass and stop polling, used when the add-on is unregistered.
+
+        Waits a little for the pass to stop, a read stuck on the network can't be
+        interrupted and is left to finish on its (daemon) thread.
+        """
+        self.cancel()
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
+        if self._thread is not None:
+            self._thread.join(SHUTDOWN_TIMEOUT)
+            if self._thread.is_alive():
+                logger.warning("Catalog indexer is still busy, leaving it to finish in the background")
+        self._thread = None
+
+    def _run(self, roots, max_workers, material_catalog, results):
+        try:
+            with tracing.session("Index Search Paths"):
+                for root, recursive in roots:
+                    if self._cancel.is_set():
+                        break
+
+                    with tracing.span("scan", root=root) as stage:
+                        files = discovery.discover_blend_files(root, recursive, max_workers, snapshots=discovery.directory_snapshots,
+                                                               cancel=self._cancel)
+                        stage.count(files=len(files))
+                    if self._cancel.is_set():
+                        break
+                    results.put((RESULT_FILES, root, len(files)))
+
+                    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="look_assigner_index") as pool:
+                        for _, path in files:
+                            pool.submit(self._index_file, material_catalog, path, results)
+        except Exception as e:
+            logger.exception(f"Catalog indexer failed - {e}")
+        finally:
+            results.put((RESULT_DONE, None, None))
+
+    def _index_file(self, material_catalog, path, results):
+        if self._cancel.is_set():
+            return
+
+        if material_catalog.get(path) is not None:
+            results.put((RESULT_CACHED, path, None))
+            return
+
+        with tracing.span("list", file=path) as stage:
+            for attempt in range(1, READ_ATTEMPTS + 1):
+                try:
+                    material_names = sidecar.list_materials(path)
+                    break
+                except blendfile.BlendFileError as e:
+                    # only I/O errors are worth another try, a corrupt or deleted file stays that way
+                    transient = isinstance(e.__cause__, OSError) and not isinstance(e.__cause__, FileNotFoundError)
+                    if not transient or attempt == READ_ATTEMPTS or self._cancel.wait(RETRY_DELAY):
+                        results.put((RESULT_FAILED, path, str(e)))
+                        return
+                    logger.debug(f"Catalog indexer retrying {path} - {e}")
+            stage.count(catalog_misses=1, materials=len(material_names), attempts=attempt)
+        results.put((RESULT_READ, path, material_names))
+
+    def _drain(self):
+        """
+        Timer callback: store the finished results in the catalog and refresh the panel.
+        """
+        material_catalog = catalog.get_catalog()
+        finished = False
+
+        while True:
+            try:
+                kind, path, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == RESULT_FILES:
+                self.current_root = path
+                self.total += payload
+            elif kind == RESULT_READ:
+                material_catalog.put(path, payload)
+                self.read += 1
+                self.done += 1
+            elif kind == RESULT_CACHED:
+                self.done += 1
+            elif kind == RESULT_FAILED:
+                logger.debug(f"Catalog indexer could not read {path} - {payload}")
+                self.failed += 1
+                self.done += 1
+            elif kind == RESULT_DONE:
+                finished = True
+
+        tag_redraw_panels()
+
+        if not finished:
+            return POLL_INTERVAL
+
+        material_catalog.save()
+        state = "cancelled" if self._cancel.is_set() else "finished"
+        logger.info(f"Catalog indexer {state} - {self.done}/{self.total} files, {self.read} read, {self.failed} unreadable")
+        self._thread = None
+        return None
+
+
+def start_from_preferences(prefs):
+    """
+    Index every search path of the add-on preferences, honouring their recursive flags.
+    """
+    roots = [(item.file_path, item.recursive) for item in prefs.paths if item.file_path]
+    return catalog_indexer.start(roots, prefs.scan_workers)
+
+
+def start_on_startup():
+    """
+    Timer callback used at registration when 'Index On Startup' is enabled.
+    """
+    start_from_preferences(preferences.get(bpy.context))
+    return None
+
+
+def tag_redraw_panels():
+    window_manager = bpy.context.window_manager
+    if window_manager is None:
+        return
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+# the add-on wide indexer
+catalog_indexer = CatalogIndexer()
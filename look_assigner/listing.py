@@ -0,0 +1,166 @@
+"""
+Background material listing for the highlighted look file.
+
+Highlighting a look file on a slow share used to freeze Blender until the file was
+read. The lister reads the material names on a worker thread with the bpy-free
+sidecar and blendfile modules, and hands them back to the main thread through a
+queue drained by a bpy.app.timers callback. Every request gets a new generation,
+so when another file is highlighted before a read finishes the stale result is
+dropped and only the latest selection is shown. A file the reader can't handle is
+reported and shows no shaders, it is not opened through bpy on the timer.
+"""
+
+import bpy
+import os
+import queue
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import blendfile
+from . import catalog
+from . import sidecar
+from . import tracing
+
+from .utils import LoggerFactory, ShowMessageBox
+logger = LoggerFactory.get_logger()
+
+POLL_INTERVAL = 0.05
+MAX_WORKERS = 2
+
+RESULT_CACHED = 'CACHED'
+RESULT_READ = 'READ'
+RESULT_FAILED = 'FAILED'
+
+
+class MaterialLister:
+    """
+    Lists the materials of one look file at a time, see the module docstring.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._future = None
+        self._results = queue.SimpleQueue()
+        self._callback = None
+        self.generation = 0
+        self.loading_path = None
+        # keep one bound method so the timer can be found again
+        self._timer = self._drain
+
+    @property
+    def loading(self):
+        return self.loading_path is not None
+
+    def request(self, filepath, callback):
+        """
+        List the materials of filepath and call callback(names) on the main thread.
+
+        Any earlier request that has not been delivered yet is cancelled. Without a
+        window (background mode) nothing would drain the timer, so the file is listed
+        straight away.
+        """
+        self.cancel()
+
+        if bpy.app.background:
+            with tracing.session("List Shaders", file=filepath):
+                callback(catalog.get_material_names(filepath))
+            return
+
+        # the catalog has to be created on the main thread
+        material_catalog = catalog.get_catalog()
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="look_assigner_list")
+
+        self.loading_path = filepath
+        self._callback = callback
+        self._future = self._pool.submit(self._read, material_catalog, filepath, self.generation, self._results)
+
+        if not bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.register(self._timer, first_interval=POLL_INTERVAL)
+
+    def cancel(self):
+        """
+        Forget the pending request, a read already in progress finishes but is ignored.
+        """
+        self.generation += 1
+        if self._future is not None:
+            self._future.cancel()
+        self._future = None
+        self._callback = None
+        self.loading_path = None
+
+    def shutdown(self):
+        """
+        Drop any pending request and stop polling, used when the add-on is unregistered.
+        """
+        self.cancel()
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _read(self, material_catalog, filepath, generation, results):
+        if generation != self.generation:
+            return
+
+        with tracing.session("List Shaders", file=filepath):
+            with tracing.span("list", file=filepath) as stage:
+                material_names = material_catalog.get_materials(filepath)
+                if material_names is not None:
+                    stage.count(catalog_hits=1, materials=len(material_names))
+                    results.put((generation, RESULT_CACHED, filepath, list(material_names)))
+                    return
+
+                try:
+                    material_names = sidecar.list_materials(filepath)
+                except blendfile.BlendFileError as e:
+                    results.put((generation, RESULT_FAILED, filepath, str(e)))
+                    return
+                stage.count(catalog_misses=1, materials=len(material_names))
+        results.put((generation, RESULT_READ, filepath, material_names))
+
+    def _drain(self):
+        """
+        Timer callback: store a finished read in the catalog and deliver it if it is still wanted.
+        """
+        material_catalog = catalog.get_catalog()
+
+        while True:
+            try:
+                generation, kind, filepath, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == RESULT_READ:
+                # stale or not, the names are worth remembering
+                material_catalog.put(filepath, payload)
+                material_catalog.save()
+
+            if generation != self.generation:
+                logger.debug(f"Dropping the material list of {filepath}, another file was highlighted")
+                continue
+
+            callback = self._callback
+            self._future = None
+            self._callback = None
+            self.loading_path = None
+
+            if kind == RESULT_FAILED:
+                # e.g. a corrupt file, or one deleted since it was listed. Opening it through bpy
+                # here would freeze the timer just like the old synchronous read, so it is only reported
+                logger.warning(f"Materials of {filepath} could not be listed - {payload}")
+                ShowMessageBox(message=f"The shaders of {os.path.basename(filepath)} could not be listed - {payload}",
+                               title="Look Assigner", icon='ERROR')
+                payload = []
+
+            callback(payload)
+
+        if self.loading:
+            return POLL_INTERVAL
+        return None
+
+
+# the add-on wide lister
+material_lister = MaterialLister()
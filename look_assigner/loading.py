@@ -0,0 +1,265 @@
+"""
+Loading shaders from look files into the open file.
+
+Shaders are appended by default, which copies their node trees and images into
+every shot file. In link mode they reference the published look instead, and can be
+turned into library overrides when they have to be edited locally. A look file can't
+be linked into itself, and any shader that doesn't come back linked is appended
+instead, one material at a time. Appending reuses or replaces materials that are
+already in the file rather than duplicating them.
+"""
+
+import os
+
+import bpy
+
+from . import sidecar
+from . import tracing
+from .manifest import ManifestError, parse_manifest
+from .nodehash import CONTENT_HASH_ATTRIBUTE, material_content_hash, stored_content_hash
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+# the datablocks a material drags in with it
+DEPENDENCY_COLLECTIONS = ("materials", "node_groups", "images", "textures")
+
+
+def absolute_path(filepath, library=None):
+    """
+    Resolve a (possibly // relative) datablock path to a normalised absolute path, used to hash image paths.
+    """
+    return os.path.normcase(os.path.abspath(bpy.path.abspath(filepath, library=library)))
+
+
+def _same_file(path_a, path_b):
+    return absolute_path(path_a) == absolute_path(path_b)
+
+
+def _local_materials():
+    return {mat.name: mat for mat in bpy.data.materials if mat.library is None and mat.override_library is None}
+
+
+def _remove_orphaned(snapshot, keep):
+    """
+    Remove the datablocks added since the snapshot that nothing uses anymore, e.g. the
+    node groups and images of a discarded duplicate. Repeats until nested groups are gone too.
+
+    The materials in keep have no users until they are assigned, they are never removed,
+    and neither is anything their node trees use.
+    """
+    keep = set(keep)
+    removed = 0
+    while True:
+        orphans = [id_data for attr, existing in snapshot.items() for id_data in getattr(bpy.data, attr)
+                   if id_data not in existing and id_data not in keep and id_data.users == 0]
+        if not orphans:
+            return removed
+        bpy.data.batch_remove(orphans)
+        removed += len(orphans)
+
+
+def _same_manifest(mat, pipeline_attr, published):
+    """
+    Return True if the pipeline manifest on mat targets the same objects and slots as the published one (None for none).
+    """
+    value = mat.get(pipeline_attr)
+    if value is None or published is None:
+        return value is None and published is None
+    try:
+        return parse_manifest(value).object_slots() == published.object_slots()
+    except ManifestError:
+        return False
+
+
+def _copy_published_data(source, target, pipeline_attr):
+    """
+    Give a reused material the pipeline manifest and content hash of the published copy it stands in for.
+    """
+    for key in (pipeline_attr, CONTENT_HASH_ATTRIBUTE):
+        if key is None:
+            continue
+        if key in source:
+            target[key] = source[key]
+        elif key in target:
+            del target[key]
+
+
+def append_materials(filepath, material_names, replace_changed=True, pipeline_attr=None):
+    """
+    Append the named materials from a look file and return the datablocks that were found.
+
+    A material already in the file under the same name is compared by shading content
+    hash (see nodehash.py): an identical one is reused, a different one is replaced in
+    place by the published version, so re-loading a look never piles up Name.001 copies.
+    When the look sidecar has the published hashes, identical materials aren't read at all.
+
+    A reused material takes the pipeline manifest (stored under pipeline_attr) of the
+    published one, the shading can be unchanged while the targeted objects are not.
+    Without pipeline_attr the manifests are left as they are.
+
+    Without replace_changed (dry runs) a changed material is returned as its appended copy
+    and the existing one is left alone.
+    """
+    local = _local_materials()
+    look_sidecar = sidecar.read_sidecar(filepath)
+
+    loaded = {}
+    to_append = []
+    for material_name in material_names:
+        existing = local.get(material_name)
+        published_hash = look_sidecar.node_hash(material_name) if look_sidecar else ""
+        # the sidecar only has the parsed manifest, a material whose manifest differs is read to copy the stored one
+        if (existing is not None and published_hash
+                and material_content_hash(existing, absolute_path) == published_hash
+                and (pipeline_attr is None or _same_manifest(existing, pipeline_attr, look_sidecar.manifest(material_name)))):
+            logger.info(f"Material {material_name} is up to date, reusing it")
+            loaded[material_name] = existing
+        else:
+            to_append.append(material_name)
+
+    if to_append:
+        snapshot = {attr: set(getattr(bpy.data, attr)) for attr in DEPENDENCY_COLLECTIONS}
+
+        with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+            requested = []
+            for material_name in to_append:
+                if material_name in data_from.materials:
+                    requested.append(material_name)
+                    logger.info(f"Appending material: {material_name}")
+                else:
+                    logger.debug(f"Material {material_name} not found in {filepath}")
+            data_to.materials = requested
+
+        # after the with block data_to holds the appended datablocks, in the requested order
+        discarded = []
+        replaced = []
+        for material_name, mat in zip(requested, data_to.materials):
+            if mat is None:
+                continue
+            existing = local.get(material_name)
+            if existing is None:
+                loaded[material_name] = mat
+            elif material_content_hash(existing, absolute_path) == stored_content_hash(mat, absolute_path):
+                logger.info(f"Material {material_name} is unchanged, keeping the existing datablock")
+                _copy_published_data(mat, existing, pipeline_attr)
+                discarded.append(mat)
+                loaded[material_name] = existing
+            elif not replace_changed:
+                loaded[material_name] = mat
+            else:
+                logger.info(f"Material {material_name} has changed, replacing it")
+                existing.user_remap(mat)
+                discarded.append(existing)
+                replaced.append((material_name, mat))
+                loaded[material_name] = mat
+
+        if discarded:
+            bpy.data.batch_remove(discarded)
+            # replaced materials take back their original name, kept copies stay Name.###
+            for material_name, mat in replaced:
+                if mat.name != material_name:
+                    mat.name = material_name
+            removed = _remove_orphaned(snapshot, loaded.values())
+            logger.debug(f"Discarded {len(discarded)} duplicate materials and {removed} orphaned datablocks")
+
+    return [loaded[material_name] for material_name in material_names if material_name in loaded]
+
+
+def replace_materials(material_names, materials):
+    """
+    Let appended copies of changed materials take over the local materials they were loaded for.
+
+    Runs that append with replace_changed=False, so they can still be rolled back, call
+    this once they are done. A copy is recognised by its Name.### name for one of the
+    requested material names. Returns how many local materials were replaced.
+    """
+    requested = sorted(set(material_names), key=len, reverse=True)
+    local = _local_materials()
+
+    replacements = []
+    for mat in materials:
+        if mat.library is not None or mat.override_library is not None or mat.name in requested:
+            continue
+        for material_name in requested:
+            suffix = mat.name[len(material_name) + 1:]
+            if mat.name.startswith(f"{material_name}.") and suffix.isdigit():
+                existing = local.get(material_name)
+                if existing is not None and existing != mat:
+                    replacements.append((material_name, existing, mat))
+                break
+
+    for material_name, existing, mat in replacements:
+        logger.info(f"Material {material_name} has changed, replacing it")
+        existing.user_remap(mat)
+    if replacements:
+        bpy.data.batch_remove([existing for _, existing, _ in replacements])
+        # replaced materials take back their original name
+        for material_name, _, mat in replacements:
+            mat.name = material_name
+    return len(replacements)
+
+
+def link_materials(filepath, material_names, make_override=False):
+    """
+    Link the named materials from a look file and return {name: datablock} for those that were linked.
+
+    With make_override every linked material is replaced by an editable library override.
+    """
+    with bpy.data.libraries.load(filepath, link=True) as (data_from, data_to):
+        data_to.materials = [name for name in material_names if name in data_from.materials]
+
+    linked = {}
+    # after the with block data_to holds the linked datablocks, None for anything that failed
+    for mat in data_to.materials:
+        if mat is None:
+            continue
+        name = mat.name
+        if make_override:
+            override = mat.override_create(remove_original_swap=True)
+            if override is not None:
+                mat = override
+            else:
+                logger.warning(f"Library override could not be created for {name}, keeping it linked")
+        linked[name] = mat
+        logger.info(f"Linking material: {name}{' (override)' if mat.override_library else ''}")
+    return linked
+
+
+def load_materials(filepath, material_names, link=False, make_override=False, replace_changed=True, pipeline_attr=None):
+    """
+    Load the named materials from a look file, linked or appended, and return the datablocks in the given order.
+
+    pipeline_attr is the custom property holding the pipeline manifest, see append_materials().
+    """
+    with tracing.span("append", file=filepath, link=link) as stage:
+        loaded = _load_materials(filepath, material_names, link, make_override, replace_changed, pipeline_attr)
+        stage.count(requested=len(material_names), materials=len(loaded))
+    return loaded
+
+
+def _load_materials(filepath, material_names, link, make_override, replace_changed, pipeline_attr):
+    if link and bpy.data.filepath and _same_file(bpy.data.filepath, filepath):
+        logger.info(f"{filepath} is the open file, appending instead of linking")
+        link = False
+
+    if not link:
+        return append_materials(filepath, material_names, replace_changed, pipeline_attr)
+
+    try:
+        linked = link_materials(filepath, material_names, make_override)
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Linking from {filepath} failed, appending instead - {e}")
+        linked = {}
+
+    missing = [name for name in material_names if name not in linked]
+    appended = {mat.name: mat for mat in append_materials(filepath, missing, replace_changed, pipeline_attr)} if missing else {}
+    if appended:
+        logger.info(f"Appended {len(appended)} materials that could not be linked from {filepath}")
+
+    loaded = []
+    for name in material_names:
+        mat = linked.get(name) or appended.get(name)
+        if mat:
+            loaded.append(mat)
+    return loaded
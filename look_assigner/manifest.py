@@ -0,0 +1,115 @@
+"""
+Pipeline manifest stored on published materials.
+
+Publishing records, on every material, which objects it was applied to. Older
+publishes stored the object names as one ", " joined string, which breaks on names
+containing ", ". The manifest is a compact, versioned JSON document instead:
+
+    {"v": 1, "objects": [...], "slots": [[...], ...], "hash": "..."}
+
+objects is sorted and deduplicated, slots holds the material slot indices used on
+each object (same order as objects) and hash is a digest of both, used to validate
+the manifest when it is read back. parse_manifest() reads both forms.
+
+This module does not depend on bpy.
+"""
+
+import hashlib
+import json
+
+from functools import lru_cache
+
+MANIFEST_VERSION = 1
+LEGACY_SEPARATOR = ", "
+
+
+class ManifestError(ValueError):
+    """
+    Raised when a stored manifest is malformed, from a newer schema or fails its hash check.
+    """
+
+
+class LookManifest:
+    """
+    The parsed manifest of one material. slots is None for legacy publishes.
+    """
+
+    __slots__ = ("version", "objects", "slots", "content_hash")
+
+    def __init__(self, version, objects, slots=None, content_hash=""):
+        self.version = version
+        self.objects = objects
+        self.slots = slots
+        self.content_hash = content_hash
+
+    @property
+    def is_legacy(self):
+        return self.version == 0
+
+    def object_slots(self):
+        """
+        Return (object name, slot indices) pairs, legacy publishes always target slot 0.
+        """
+        if self.slots is None:
+            return [(name, (0,)) for name in self.objects]
+        return list(zip(self.objects, self.slots))
+
+
+def _content_hash(objects, slots):
+    canonical = json.dumps([objects, slots], separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def encode_manifest(object_slots):
+    """
+    Return the manifest string for a {object name: iterable of slot indices} mapping.
+    """
+    objects = sorted(object_slots)
+    slots = [sorted(set(object_slots[name])) for name in objects]
+    manifest = {"v": MANIFEST_VERSION, "objects": objects, "slots": slots, "hash": _content_hash(objects, slots)}
+    return json.dumps(manifest, separators=(",", ":"), ensure_ascii=False)
+
+
+@lru_cache(maxsize=4096)
+def parse_manifest(value):
+    """
+    Parse a stored manifest, or the legacy ", " joined object list of older publishes.
+
+    The result is cached per string, so re-reading the same material is free. Treat it as read only.
+    """
+    value = str(value)
+
+    if value.startswith("{"):
+        try:
+            data = json.loads(value)
+        except ValueError:
+            data = None
+        # a legacy object list can start with "{" too, only dicts are manifests
+        if isinstance(data, dict):
+            return _validate(data)
+
+    objects = [name for name in value.split(LEGACY_SEPARATOR) if name]
+    return LookManifest(0, objects)
+
+
+def _validate(data):
+    version = data.get("v")
+    if not isinstance(version, int) or version < 1:
+        raise ManifestError(f"Manifest has no valid schema version: {version!r}")
+    if version > MANIFEST_VERSION:
+        raise ManifestError(f"Manifest schema version {version} is newer than this add-on supports ({MANIFEST_VERSION})")
+
+    objects = data.get("objects")
+    slots = data.get("slots")
+    if not isinstance(objects, list) or not isinstance(slots, list) or len(objects) != len(slots):
+        raise ManifestError("Manifest objects and slots don't line up")
+    if not all(isinstance(name, str) for name in objects):
+        raise ManifestError("Manifest object names must be strings")
+    if not all(isinstance(indices, list) and all(isinstance(index, int) for index in indices) for indices in slots):
+        raise ManifestError("Manifest slot indices must be lists of integers")
+
+    content_hash = data.get("hash", "")
+    if content_hash != _content_hash(objects, slots):
+        raise ManifestError("Manifest hash does not match its contents")
+
+    return LookManifest(version, objects, [tuple(indices) for indices in slots], content_hash)
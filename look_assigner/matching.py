@@ -0,0 +1,79 @@
+"""
+Name matching for pipeline assignments.
+
+Published shaders store the names of the objects they were applied to. In a shot
+those objects can come back with a namespace prefix (``char_01:Body``) and/or
+Blender's ``.###`` duplicate suffix (``Body.001``). The index below decomposes
+every scene name once into the stored names it can stand for, so resolving a
+stored name is a single dictionary lookup instead of a regex scan of the scene.
+
+This module does not depend on bpy.
+"""
+
+import re
+
+# Same building blocks as the original per-name pattern:
+#   ([a-zA-Z0-9_]+:)? <stored name> (\.\d{3})?$
+NAMESPACE_PATTERN = re.compile(r'[a-zA-Z0-9_]+:')
+SUFFIX_PATTERN = re.compile(r'\.\d{3}$')
+
+
+def normalized_keys(scene_name):
+    """
+    Return the stored names that the given scene object name would match.
+
+    A scene name matches a stored name when it is the stored name with an optional
+    namespace prefix and an optional .### suffix, so there are at most four keys.
+    """
+    bases = [scene_name]
+    suffix = SUFFIX_PATTERN.search(scene_name)
+    if suffix:
+        bases.append(scene_name[:suffix.start()])
+
+    keys = []
+    for base in bases:
+        if base not in keys:
+            keys.append(base)
+        namespace = NAMESPACE_PATTERN.match(base)
+        if namespace:
+            stripped = base[namespace.end():]
+            if stripped not in keys:
+                keys.append(stripped)
+    return keys
+
+
+class ObjectNameIndex:
+    """
+    Hash index from normalized names to scene object names.
+
+    Build it once per assignment from the candidate objects, then call match() for
+    every stored name. Matches keep the order of the objects the index was built from.
+    """
+
+    def __init__(self, names):
+        self._index = {}
+        for name in names:
+            for key in normalized_keys(name):
+                self._index.setdefault(key, []).append(name)
+
+    @classmethod
+    def from_objects(cls, objects):
+        return cls(obj.name for obj in objects)
+
+    def __len__(self):
+        return len(self._index)
+
+    def match(self, stored_name):
+        """
+        Return the scene names matching a single stored name.
+        """
+        return self._index.get(stored_name, [])
+
+    def match_all(self, stored_names):
+        """
+        Return a flat list of the scene names matching each of the stored names, in order.
+        """
+        matched_names = []
+        for name in stored_names:
+            matched_names.extend(self._index.get(name, ()))
+        return matched_names
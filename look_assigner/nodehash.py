@@ -0,0 +1,132 @@
+"""
+Content hash of a material's shading.
+
+Hashes what a material renders with: the node types, their settings, the values of
+unlinked input sockets, the links, and recursively the node groups they use.
+Cosmetic state such as node locations, sizes, labels and selection is left out, so
+two copies of the same published shader hash the same even after a node was moved.
+
+File paths (images) are hashed resolved to absolute paths: a published image path
+is relative to the look file and is remapped relative to the shot when appended.
+The caller passes the resolve_path(filepath, library) function that does this.
+
+Works on bpy data passed in, but does not import bpy itself.
+"""
+
+import hashlib
+
+from .matching import SUFFIX_PATTERN
+
+FLOAT_PRECISION = 6
+
+# custom property holding the hash a material was published with
+CONTENT_HASH_ATTRIBUTE = "look_content_hash"
+
+# UI only node properties, they never change the shading
+COSMETIC_PROPERTIES = {
+    "rna_type", "name", "label", "location", "width", "width_hidden", "height", "dimensions",
+    "select", "show_options", "show_preview", "show_texture", "hide", "use_custom_color", "color",
+    "parent", "inputs", "outputs", "internal_links", "bl_idname", "bl_label", "bl_description",
+    "bl_icon", "bl_static_type", "bl_width_default", "bl_width_min", "bl_width_max",
+    "bl_height_default", "bl_height_min", "bl_height_max", "type", "warning_propagation",
+    # group trees are hashed by content, see _hash_node_tree()
+    "node_tree",
+}
+
+# material settings hashed for materials that don't use nodes
+MATERIAL_PROPERTIES = ("diffuse_color", "metallic", "roughness", "specular_intensity", "blend_method")
+
+
+def _value(value, resolve_path=None):
+    """
+    Turn a property or socket value into something stable to hash.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return round(value, FLOAT_PRECISION)
+    if isinstance(value, (bool, int, str)):
+        return value
+    if hasattr(value, "name") and hasattr(value, "bl_rna") and hasattr(value, "users"):
+        # an ID datablock (image, object...), identified by its file or by its name without
+        # the .### suffix a second append would give it
+        filepath = getattr(value, "filepath", "")
+        if filepath:
+            if resolve_path is not None:
+                filepath = resolve_path(filepath, getattr(value, "library", None))
+            return f"ID:{type(value).__name__}:{filepath}"
+        return f"ID:{type(value).__name__}:{SUFFIX_PATTERN.sub('', value.name)}"
+    try:
+        return tuple(_value(item, resolve_path) for item in value)
+    except TypeError:
+        return repr(value)
+
+
+def _node_properties(node, resolve_path):
+    values = []
+    for prop in node.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in COSMETIC_PROPERTIES or prop.type == 'COLLECTION':
+            continue
+        value = getattr(node, identifier, None)
+        if prop.type == 'POINTER' and not hasattr(value, "users"):
+            # nested structs (texture mapping etc.) are hashed through their own properties
+            if value is not None and hasattr(value, "bl_rna"):
+                value = tuple((sub.identifier, _value(getattr(value, sub.identifier, None)))
+                              for sub in value.bl_rna.properties
+                              if sub.identifier != "rna_type" and sub.type not in {'POINTER', 'COLLECTION'})
+            else:
+                value = None
+        values.append((identifier, _value(value, resolve_path)))
+    return values
+
+
+def _hash_node_tree(node_tree, digest, visited, resolve_path):
+    if node_tree is None:
+        digest.update(b"<no tree>")
+        return
+    key = node_tree.as_pointer()
+    if key in visited:
+        digest.update(b"<recursive group>")
+        return
+    visited.add(key)
+
+    for node in sorted(node_tree.nodes, key=lambda node: node.name):
+        entry = [node.bl_idname, node.name, _node_properties(node, resolve_path)]
+        for socket in node.inputs:
+            if not socket.is_linked and hasattr(socket, "default_value"):
+                entry.append((socket.identifier, _value(socket.default_value)))
+        digest.update(repr(entry).encode("utf-8"))
+
+        group_tree = getattr(node, "node_tree", None)
+        if group_tree is not None:
+            _hash_node_tree(group_tree, digest, visited, resolve_path)
+
+    links = sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier, link.is_muted)
+        for link in node_tree.links
+    )
+    digest.update(repr(links).encode("utf-8"))
+
+
+def material_content_hash(mat, resolve_path=None):
+    """
+    Return the hex digest of the material's shading content, see the module docstring for resolve_path.
+    """
+    digest = hashlib.sha1()
+    if mat.use_nodes and mat.node_tree:
+        _hash_node_tree(mat.node_tree, digest, set(), resolve_path)
+    else:
+        settings = [(name, _value(getattr(mat, name, None))) for name in MATERIAL_PROPERTIES]
+        digest.update(repr(settings).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def stored_content_hash(mat, resolve_path=None):
+    """
+    Return the hash recorded on the material at publish, computing it when there is none.
+    """
+    content_hash = mat.get(CONTENT_HASH_ATTRIBUTE)
+    if isinstance(content_hash, str) and content_hash:
+        return content_hash
+    return material_content_hash(mat, resolve_path)
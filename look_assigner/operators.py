@@ -1,42 +1,44 @@
 import bpy
+import bmesh
 import os
 from bpy.types import Operator
-from bpy.props import IntProperty
+from bpy.app.handlers import persistent
+from bpy.props import BoolProperty, StringProperty
 import math
-import re
+import time
 
 from . import utils
 from . import preferences
+from . import catalog
+from . import assignment
+from . import manifest
+from . import sidecar
+from . import loading
+from . import nodehash
+from . import tracing
+from . import indexer
+from .matching import ObjectNameIndex
 
 from .utils import LoggerFactory
 logger = LoggerFactory.get_logger()
 
+PUBLISH_SCENE_NAME = "PUBLISH_SHADERS"
+PREVIEW_MESH_NAME = "PUBLISH_SHADERS_sphere"
+
+# share of the progress bar for loading the look files and for matching, the rest is writing slots
+LOAD_PROGRESS = 0.3
+MATCH_PROGRESS = 0.1
+# the interactive assignment works this long per timer tick
+MODAL_TIME_SLICE = 0.05
+MODAL_TIMER_INTERVAL = 0.01
+
 def get_materials_from_blend( filepath ):
     """
     this is to retrieve the contents of the blend file's materials, without actually loading them into the scene
-    
+    the names come from the persistent material catalog when the file hasn't changed since it was last read
     """
-    material_names = []
-    # Load the blend file
-    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
-        # Check if materials are present in the blend file
-        if data_from.materials:
-            # Append each material name to the list
-            for mat_name in data_from.materials:
-                material_names.append(mat_name)
-    return material_names
-
-class OT_toggle_material_use(bpy.types.Operator):
-    bl_idname = "object.toggle_material_use"
-    bl_label = "Toggle Material Use"
-
-    material_index: IntProperty()
+    return catalog.get_material_names(filepath)
 
-    def execute(self, context):
-        material = context.scene.LookAssigner_Properties.materials[self.material_index]
-        material.use = not material.use
-        return {'FINISHED'}
-    
 class OT_open_addon_preferences(bpy.types.Operator):
     bl_idname = "object.open_addon_preferences"
     bl_label = "Open Addon Preferences"
@@ -60,32 +62,35 @@ class BuildPipelinedShaderFileOperator(Operator):
         # context.preferences.addons[__name__].preferences
         lookProps = context.scene.LookAssigner_Properties
 
+        # the spheres of a previous publish are not part of the look
+        remove_preview_grid()
+
         # Step 1: Collect materials and the objects they are applied to
         material_dict = {}
 
         for obj in bpy.data.objects:
             if obj.type in {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'}:  # Checking types that can have materials
-                for slot in obj.material_slots:
+                for slot_index, slot in enumerate(obj.material_slots):
                     if slot.material:
                         mat_name = slot.material.name
                         if mat_name not in material_dict:
-                            material_dict[mat_name] = []
-                        material_dict[mat_name].append(obj.name)
+                            material_dict[mat_name] = {}
+                        material_dict[mat_name].setdefault(obj.name, []).append(slot_index)
 
-        # Step 2: Add custom property to each material
-        for mat_name, objects in material_dict.items():
+        # Step 2: Add the versioned pipeline manifest and the shading content hash to each material
+        for mat_name, object_slots in material_dict.items():
             mat = bpy.data.materials[mat_name]
-            mat[prefs.pipeline_attribute_name] = ", ".join(objects)
+            mat[prefs.pipeline_attribute_name] = manifest.encode_manifest(object_slots)
+            mat[nodehash.CONTENT_HASH_ATTRIBUTE] = nodehash.material_content_hash(mat, loading.absolute_path)
 
         # Step 3: Create a new scene called PUBLISH_SHADERS
-        new_scene_name = "PUBLISH_SHADERS"
-        if new_scene_name in bpy.data.scenes:
-            bpy.data.scenes.remove(bpy.data.scenes[new_scene_name])
+        new_scene_name = PUBLISH_SCENE_NAME
         new_scene = bpy.data.scenes.new(new_scene_name)
-        bpy.context.window.scene = new_scene
+        if context.window:
+            context.window.scene = new_scene
 
         # Create a new collection in the new scene
-        new_collection_name = "PUBLISH_SHADERS"
+        new_collection_name = PUBLISH_SCENE_NAME
         new_collection = bpy.data.collections.new(new_collection_name)
         new_scene.collection.children.link(new_collection)
 
@@ -93,35 +98,102 @@ class BuildPipelinedShaderFileOperator(Operator):
         new_collection.color_tag = 'COLOR_04'  # This sets the color to green
 
         # Step 4: Create spheres for each material in the new scene and assign the materials
-        # Calculate the grid size
-        num_materials = len(material_dict)
-        grid_size = math.ceil(math.sqrt(num_materials))
-
-        # Offset for the spheres in the grid
-        offset = 2.5
-
-        # Iterate over materials and create spheres
-        x = 0
-        y = 0
-        for i, (mat_name, objects) in enumerate(material_dict.items()):
-            bpy.ops.mesh.primitive_uv_sphere_add(radius=1, location=(x * offset, y * offset, 0))
-            sphere = bpy.context.object
-            sphere.name = f"{mat_name}"
-            sphere.data.materials.append(bpy.data.materials[mat_name])
-            
-            # Link the sphere to the new collection
-            new_collection.objects.link(sphere)
-            new_scene.collection.objects.unlink(sphere)
-            
-            x += 1
-            if x >= grid_size:
-                x = 0
-                y += 1
+        num_materials = build_preview_grid(new_collection, [bpy.data.materials[mat_name] for mat_name in material_dict])
 
         logger.info (f"Created {num_materials} spheres in the scene '{new_scene_name}' with assigned materials and added to the collection '{new_collection_name}'.")
-        bpy.ops.view3d.view_all(center=False)
+        if bpy.ops.view3d.view_all.poll():
+            bpy.ops.view3d.view_all(center=False)
         return {'FINISHED'}
 
+def remove_preview_grid():
+    """
+    Remove the PUBLISH_SHADERS scene, collection and spheres of a previous publish.
+    """
+    collection = bpy.data.collections.get(PUBLISH_SCENE_NAME)
+    if collection is not None:
+        bpy.data.batch_remove([*collection.objects, collection])
+    scene = bpy.data.scenes.get(PUBLISH_SCENE_NAME)
+    if scene is not None:
+        bpy.data.scenes.remove(scene)
+    mesh = bpy.data.meshes.get(PREVIEW_MESH_NAME)
+    if mesh is not None and mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
+
+def build_preview_grid(collection, materials, offset=2.5):
+    """
+    Add a sphere per material to the collection, laid out in a square grid, and return how many were made.
+
+    Built through the data API: every sphere shares one mesh with a single material slot
+    linked at object level, so publishing stays fast and light with hundreds of shaders.
+    """
+    mesh = bpy.data.meshes.new(PREVIEW_MESH_NAME)
+    sphere = bmesh.new()
+    # image textured shaders need UVs to preview correctly
+    sphere.loops.layers.uv.new()
+    bmesh.ops.create_uvsphere(sphere, u_segments=32, v_segments=16, radius=1.0, calc_uvs=True)
+    sphere.to_mesh(mesh)
+    sphere.free()
+    mesh.materials.append(None)
+
+    # Calculate the grid size
+    grid_size = max(1, math.ceil(math.sqrt(len(materials))))
+
+    spheres = []
+    for i, mat in enumerate(materials):
+        y, x = divmod(i, grid_size)
+        obj = bpy.data.objects.new(mat.name, mesh)
+        obj.location = (x * offset, y * offset, 0)
+        slot = obj.material_slots[0]
+        slot.link = 'OBJECT'
+        slot.material = mat
+        spheres.append(obj)
+
+    # Link the spheres to the collection once they are all built
+    for obj in spheres:
+        collection.objects.link(obj)
+
+    return len(spheres)
+
+def published_look_materials(pipeline_attr):
+    """
+    Return the shaders of the look published in this file, i.e. the local preview grid
+    built by BuildPipelinedShaderFileOperator, or an empty list when there is none.
+
+    Only shaders carrying the pipeline manifest count, a grid without any is not a publish.
+    """
+    scene = bpy.data.scenes.get(PUBLISH_SCENE_NAME)
+    collection = bpy.data.collections.get(PUBLISH_SCENE_NAME)
+    if scene is None or collection is None or scene.library or collection.library:
+        return []
+    if collection.name not in scene.collection.children:
+        return []
+
+    materials = {slot.material for obj in collection.objects for slot in obj.material_slots if slot.material}
+    return sorted((mat for mat in materials if mat.library is None and pipeline_attr in mat), key=lambda mat: mat.name)
+
+
+@persistent
+def write_look_sidecar_on_save(*args):
+    """
+    save_post handler - writes the look manifest sidecar when a published look file is saved.
+
+    Blender passes the path that was written, which differs from bpy.data.filepath for Save Copy.
+    Files without a published look (see published_look_materials) are left alone, and
+    the sidecar only describes the published shaders.
+    """
+    filepath = args[0] if args and args[0] else bpy.data.filepath
+    prefs = preferences.get(bpy.context)
+    if not prefs.write_look_sidecar or not filepath:
+        return
+
+    materials = published_look_materials(prefs.pipeline_attribute_name)
+    if not materials:
+        return
+    try:
+        sidecar.write_sidecar(filepath, sidecar.describe_materials(materials, prefs.pipeline_attribute_name, loading.absolute_path))
+    except OSError as e:
+        logger.warning(f"Look manifest sidecar could not be written - {e}")
+
 class OBJECT_OT_custom_export_blend(bpy.types.Operator):
     """Custom Export Blend Operator"""
     bl_idname = "object.custom_export_blend"
@@ -145,6 +217,19 @@ class LoadMaterialsOperator(Operator):
     bl_description = "Assigns Shaders to Objects, pipeline data or not."
     bl_options = {'REGISTER', 'UNDO'}
 
+    dry_run: BoolProperty(
+        name="Dry Run",
+        description="Only compute and report the assignment plan, the scene is left untouched",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+    use_queue: BoolProperty(
+        name="Use Load Queue",
+        description="Load the shaders queued from several look files instead of the marked shaders of the highlighted file",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
     """
     bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)    
 
@@ -154,163 +239,276 @@ class LoadMaterialsOperator(Operator):
 
     """
 
-    def append_materials_from_file(self, filepath, material_names):
-        imported_materials = []  # List to store imported material data
-
+    def append_materials_from_file(self, filepath, material_names, link=False, make_override=False, replace_changed=True, pipeline_attr=None):
+        """
+        Load the materials of one look file, see loading.load_materials() for link mode.
+        """
         if bpy.ops.object.mode_set.poll():
             bpy.ops.object.mode_set(mode='OBJECT')
 
-        with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
-            for material_name in material_names:
-                if material_name in data_from.materials:
-                    data_to.materials.append(material_name)
-                    logger.info(f"Appending material: {material_name}")
-                else:
-                    logger.debug(f"Material {material_name} not found in {filepath}")
-        
-        # Collect the imported materials immediately after loading them
-        for material_name in material_names:
-            mat = bpy.data.materials.get(material_name)
-            if mat:
-                imported_materials.append(mat)
-
-        return imported_materials
+        return loading.load_materials(filepath, material_names, link, make_override, replace_changed, pipeline_attr)
     
 
-    def create_regex_pattern(self, object_name):
+    def fuzzy_search_objects(self, objects, object_names, name_index=None):
         """
-        Create a regex pattern for the given object name to match optional namespace and .### suffix.
+        Check if the object names (with optional namespace and .### suffix) are in the scene.
+        Returns a flat list of matched object names.
+
+        Pass a prebuilt ObjectNameIndex to reuse it across several lookups in one assignment.
         """
-        # Escape any special characters in the object name
-        escaped_name = re.escape(object_name)
-        
-        # Pattern to match optional namespace prefix and optional .### suffix
-        pattern = re.compile(r'([a-zA-Z0-9_]+:)?' + escaped_name + r'(\.\d{3})?$')
+        if name_index is None:
+            name_index = ObjectNameIndex.from_objects(objects)
 
-        return pattern
+        return name_index.match_all(object_names)
 
+    @classmethod
+    def poll(cls, context):
+        if "LookAssigner_Properties" not in context.scene:
+            return False
+        lookProps = context.scene.LookAssigner_Properties
+        return len(lookProps.materials) > 0 or len(lookProps.load_queue) > 0
 
-    def fuzzy_search_objects(self,objects, object_names):
+    def gather_load_queue(self, lookProps):
         """
-        Check if the object names (with optional .### suffix) are in the scene.
-        Returns a flat list of matched object names.
+        Return {look file: [material names]} for this run, each file listed once.
+
+        The queue holds shaders marked across several look files, otherwise only the
+        marked shaders of the highlighted file are loaded.
         """
-        # Get all object names in the current scene
-        scene_object_names = [obj.name for obj in objects]
-        
-        # List to store all matched scene object names
-        matched_object_names = []
-        
-        # Iterate through each object name and check for matches
-        for name in object_names:
-            pattern = self.create_regex_pattern(name)
-            matches = [scene_name for scene_name in scene_object_names if pattern.match(scene_name)]
-            
-            if matches:
-                matched_object_names.extend(matches)
-        
-        return matched_object_names
-
-    def assign_materials_from_pipeline_data(self, pipeline_attr, objects, shader_list):
-
-        for mat in shader_list:
-            if pipeline_attr in mat:
-                obj_names = mat[pipeline_attr].split(", ")
-
-                # handle namespaces and blender's .### naming issue
-                
-                validated_object_list = self.fuzzy_search_objects(objects, obj_names)
-                logger.info (f'Validated object list - {validated_object_list}')
-
-                for obj_name in validated_object_list:
-                    obj = bpy.data.objects.get(obj_name)
-
-                    if obj and obj in objects:
-                        # look at how this is done - if there are already materials, it should clear them
-                        if obj.data.materials:
-                            obj.data.materials[0] = mat
-                        else:
-                            # Create a new material slot and assign
-                            # CLEAR MATERIALS FIRST                         
-                            obj.data.materials.clear()
-                            obj.data.materials.append(mat)
-                        # Update the object to ensure the material assignment takes effect
-                            logger.info (f'Shader {mat.name} assigned to : {obj.name}')
-                        obj.update_tag(refresh={'DATA'})
-                    else:
-                        logger.info(f"Stored Geometry Object : {obj_name} not found in scene")
-
-        # Redraw all areas to ensure the viewport is updated
-        for area in bpy.context.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
+        file_materials = {}
+        if self.use_queue:
+            for item in lookProps.load_queue:
+                names = file_materials.setdefault(item.path, [])
+                if item.name not in names:
+                    names.append(item.name)
+        elif 0 <= lookProps.blend_file_index < len(lookProps.blend_files):
+            marked = [mat.name for mat in lookProps.materials if mat.use]
+            if marked:
+                file_materials[lookProps.blend_files[lookProps.blend_file_index].path] = marked
+        return file_materials
+
+    def plan_from_sidecars(self, objects, file_materials):
+        """
+        Plan a dry run without opening the look files, or return None if a look file would have to be read.
 
-    @classmethod
-    def poll(cls, context):
-        return "LookAssigner_Properties" in context.scene and "materials" in context.scene.LookAssigner_Properties and (len(context.scene.LookAssigner_Properties.materials) > 0)
+        Each look file's manifests come from its up to date sidecar, or else from the
+        pipeline data the material catalog learnt the last time its shaders were loaded.
+        """
+        material_catalog = catalog.get_catalog()
+        shader_manifests = []
+        for filepath, material_names in file_materials.items():
+            look_sidecar = sidecar.read_sidecar(filepath)
+            if look_sidecar is not None:
+                for name in material_names:
+                    look_manifest = look_sidecar.manifest(name)
+                    if look_manifest:
+                        shader_manifests.append((name, look_manifest))
+                continue
+
+            # an empty value means the shader was loaded and has no pipeline data
+            pipeline = material_catalog.get_pipeline_data(filepath)
+            if pipeline is None or any(name not in pipeline for name in material_names):
+                return None
+            for name in material_names:
+                if not pipeline[name]:
+                    continue
+                try:
+                    shader_manifests.append((name, manifest.parse_manifest(pipeline[name])))
+                except manifest.ManifestError as e:
+                    logger.warning(f"Shader {name} has an invalid pipeline manifest, skipping it - {e}")
+        return assignment.build_manifest_plan(objects, shader_manifests)
 
     def execute(self, context):
+        with tracing.session("Assign Shaders", dry_run=self.dry_run, use_queue=self.use_queue):
+            return self.assign_shaders(context)
+
+    def assign_shaders(self, context):
+        for _ in self.assignment_steps(context):
+            pass
+        # the plan writer tagged the changed datablocks once, the depsgraph evaluates them on the next redraw
+        return {'FINISHED'}
+
+    def assignment_steps(self, context, time_slice=None, backup=None):
+        """
+        Run the assignment as a generator yielding (progress, status) after every step.
+
+        execute() runs it to the end in one go. The interactive variant passes a time
+        slice for the slot writes and a SlotBackup, and calls it from a timer. Changed
+        materials are then only replaced once everything is written, so a cancelled run
+        can still be rolled back.
+        """
         prefs = context.preferences.addons["look_assigner"].preferences
         lookProps = context.scene.LookAssigner_Properties    
         selected_objects_only =  lookProps.selected_objects_only
+        interactive = backup is not None
 
-        materials = [mat.name for mat in lookProps.materials if mat.use]
-        current_shader_file = lookProps.blend_files[lookProps.blend_file_index].path
+        file_materials = self.gather_load_queue(lookProps)
+        materials = [name for names in file_materials.values() for name in names]
 
         if len(materials) == 0:
             self.report({"WARNING"}, "No Shaders Marked. Please enable the Shaders you want to assign")
 
         if len(materials) > 1 and lookProps.force_assign:
             self.report({"WARNING"}, "You can only force assign a single shader to the scene or selection")
-        else:
+            return
 
-            logger.debug (f'Shader File : {current_shader_file}')
-            logger.debug (f'Material Load Buffer :{materials}')
-            
-            if selected_objects_only:
-                objects = [obj for obj in context.selected_objects if obj.type == 'MESH']            
+        logger.debug (f'Shader Files : {list(file_materials)}')
+        logger.debug (f'Material Load Buffer :{materials}')
+        
+        if selected_objects_only:
+            objects = [obj for obj in context.selected_objects if obj.type == 'MESH']            
+        else:
+            # need to filter the scene objects to meshes or whatever
+            objects = [obj for obj in context.scene.objects if obj.type == 'MESH']  
+
+        logger.debug (f'Viable Object Buffer {objects}')
+
+        # a dry run can be planned from the look sidecars or the catalog, without opening the look files at all
+        if self.dry_run and not lookProps.force_assign and file_materials:
+            plan = self.plan_from_sidecars(objects, file_materials)
+            if plan is not None:
+                self.report({'INFO'}, f"Dry run (from look manifest) - {plan.summary()}")
+                return
+
+        # step1 - Import the shaders into the current blend file, opening every look file once
+        id_snapshot = assignment.snapshot_ids() if self.dry_run else None
+        replace_changed = not (self.dry_run or interactive)
+        imported_shaders = []
+        material_catalog = catalog.get_catalog()
+        pipeline_updated = False
+        for file_index, (shader_file, file_material_names) in enumerate(file_materials.items()):
+            yield LOAD_PROGRESS * file_index / len(file_materials), f"Loading {os.path.basename(shader_file)}"
+
+            file_shaders = self.append_materials_from_file(shader_file, file_material_names, lookProps.link_materials, lookProps.override_linked_materials, replace_changed, prefs.pipeline_attribute_name)
+            logger.debug (f'imported_shaders {shader_file} {file_shaders}')
+            imported_shaders.extend(file_shaders)
+
+            # remember the pipeline data of this look file for later dry runs, "" for shaders without any
+            file_pipeline = {shader.name: str(shader.get(prefs.pipeline_attribute_name, "")) for shader in file_shaders
+                             if shader.name in file_material_names}
+            if file_pipeline:
+                material_catalog.update_pipeline(shader_file, file_pipeline)
+                pipeline_updated = True
+        if pipeline_updated:
+            material_catalog.save()
+
+        yield LOAD_PROGRESS, f"Matching {len(objects)} objects"
+
+        #step 2 = need to check if it's a pipeline assignment scenario
+
+        pipelined_shaders = []
+        standard_shaders = []
+        
+        for shader in imported_shaders:
+            if prefs.pipeline_attribute_name in shader:
+                logger.debug (f'Pipeline Data {shader.name}  {shader[prefs.pipeline_attribute_name]}')
+                pipelined_shaders.append(shader)
             else:
-                # need to filter the scene objects to meshes or whatever
-                objects = [obj for obj in context.scene.objects if obj.type == 'MESH']  
-
-            logger.debug (f'Viable Object Buffer {objects}')
-
-            # step1 - Import the shaders into the current blend file        
-            imported_shaders = self.append_materials_from_file(current_shader_file, materials)
-            logger.debug (f'imported_shaders {imported_shaders}')
-
-
-            #step 2 = need to check if it's a pipeline assignment scenario
-
-            pipelined_shaders = []
-            standard_shaders = []
-            
-            for shader in imported_shaders:
-                if prefs.pipeline_attribute_name in shader:
-                    logger.debug (f'Pipeline Data {shader.name}  {shader[prefs.pipeline_attribute_name]}')
-                    pipelined_shaders.append(shader)
-                else:
-                    logger.debug (f'Pipeline Data {shader.name}  No pipeline data attribute found ({prefs.pipeline_attribute_name})')
-                    standard_shaders.append(shader)
-
-            # step 3 we've already filtered everything by this point, we just need to check if it needs to be forced onto the objects
-            for obj in objects:
-                for mat_name in materials:
-                    if mat_name not in obj.data.materials:
-                        if lookProps.force_assign:
-                            mat = bpy.data.materials.get(mat_name)
-                            logger.debug (f'Material : {mat}')
-                            if mat:
-                                obj.data.materials.clear()
-                                obj.data.materials.append(mat)
-                        # if we are not force assigning, we can grab the published data to see what needs to be assigned where
-                        else:                      
-                            if pipelined_shaders:
-                                self.assign_materials_from_pipeline_data( prefs.pipeline_attribute_name, objects, pipelined_shaders )
- 
-        bpy.context.view_layer.update()
-        return {'FINISHED'}
- 
+                logger.debug (f'Pipeline Data {shader.name}  No pipeline data attribute found ({prefs.pipeline_attribute_name})')
+                standard_shaders.append(shader)
+
+        # step 3 - build the complete object -> material plan in one pass, over the shaders of all files
+        if lookProps.force_assign:
+            # the loaded datablock, a linked shader can share its name with a local one
+            mat = imported_shaders[0] if imported_shaders else None
+            logger.debug (f'Material : {mat}')
+            plan = assignment.build_force_plan(objects, mat) if mat else None
+        elif pipelined_shaders:
+            # if we are not force assigning, we can grab the published data to see what needs to be assigned where
+            plan = assignment.build_pipeline_plan(objects, pipelined_shaders, prefs.pipeline_attribute_name)
+        else:
+            plan = None
+
+        # step 4 - apply it, or just report it for a dry run
+        if self.dry_run:
+            summary = plan.summary() if plan else "nothing to assign"
+            removed = assignment.remove_new_ids(id_snapshot)
+            logger.debug (f'Dry run - removed {removed} appended datablocks')
+            self.report({'INFO'}, f"Dry run - {summary}")
+        elif plan:
+            writer = assignment.PlanWriter(plan, backup)
+            while not writer.finished:
+                yield (LOAD_PROGRESS + MATCH_PROGRESS + (1.0 - LOAD_PROGRESS - MATCH_PROGRESS) * writer.done / writer.total,
+                       f"Assigning shaders - {writer.done}/{writer.total} meshes")
+                writer.write(time_slice)
+            changed = writer.finish()
+            if not replace_changed:
+                replaced = loading.replace_materials(materials, imported_shaders)
+                logger.debug (f'Replaced {replaced} changed materials')
+            self.report({'INFO'}, f"Assigned {changed} objects from {len(file_materials)} look files - {plan.summary()}, "
+                                  f"{plan.mesh_writes} meshes written, {plan.writes_saved} shared mesh writes saved")
+        else:
+            logger.debug ('Nothing to assign')
+
+        if self.use_queue and not self.dry_run:
+            lookProps.load_queue.clear()
+
+
+class OBJECT_OT_load_materials_modal(LoadMaterialsOperator):
+    """Assign shaders a few objects at a time, keeping Blender responsive. Press Esc to cancel and restore the scene"""
+    bl_idname = "object.load_materials_modal"
+    bl_label = "Assign Shaders (Interactive)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def invoke(self, context, event):
+        # a dry run leaves nothing to watch, and without a window there are no timer events
+        if self.dry_run or bpy.app.background:
+            return self.execute(context)
+
+        self._backup = assignment.SlotBackup()
+        self._id_snapshot = assignment.snapshot_ids()
+        self._steps = self.traced_steps(context)
+
+        window_manager = context.window_manager
+        window_manager.progress_begin(0, 100)
+        self._timer = window_manager.event_timer_add(MODAL_TIMER_INTERVAL, window=context.window)
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def traced_steps(self, context):
+        with tracing.session("Assign Shaders", interactive=True, use_queue=self.use_queue):
+            yield from self.assignment_steps(context, MODAL_TIME_SLICE, self._backup)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            return self.cancel_assignment(context)
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        start = time.perf_counter()
+        try:
+            while time.perf_counter() - start < MODAL_TIME_SLICE:
+                progress, status = next(self._steps)
+        except StopIteration:
+            self.end_modal(context)
+            return {'FINISHED'}
+        except Exception:
+            self.cancel_assignment(context)
+            raise
+
+        context.window_manager.progress_update(progress * 100)
+        context.workspace.status_text_set(f"{status} - {progress:.0%}, Esc to cancel")
+        return {'PASS_THROUGH'}
+
+    def cancel_assignment(self, context):
+        """
+        Stop the run and put back the slots and datablocks it changed.
+        """
+        self._steps.close()
+        restored = self._backup.restore()
+        removed = assignment.remove_new_ids(self._id_snapshot)
+        self.end_modal(context)
+        logger.info(f'Assignment cancelled - restored {restored} meshes and object slots, removed {removed} loaded datablocks')
+        self.report({'WARNING'}, "Assignment cancelled, the scene was restored")
+        return {'CANCELLED'}
+
+    def end_modal(self, context):
+        window_manager = context.window_manager
+        window_manager.event_timer_remove(self._timer)
+        window_manager.progress_end()
+        context.workspace.status_text_set(None)
+
+
 class OT_Look_Shader_to_Collection(bpy.types.Operator):
     bl_idname = "object.look_shader_to_collection"
     bl_description  = "Assigns the current shader to the complete collection"
@@ -365,25 +563,150 @@ class OBJECT_OT_purge_unused_materials(bpy.types.Operator):
         self.report({'INFO'}, f"Removed {len(materials_to_remove)} unused materials.")
         return {'FINISHED'}
     
+class OBJECT_OT_start_catalog_index(bpy.types.Operator):
+    """Read the shader lists of every look file under all search paths in the background"""
+    bl_idname = "object.start_catalog_index"
+    bl_label = "Index All Search Paths"
+
+    @classmethod
+    def poll(cls, context):
+        return not indexer.catalog_indexer.running and len(preferences.get(context).paths) > 0
+
+    def execute(self, context):
+        indexer.start_from_preferences(preferences.get(context))
+        return {'FINISHED'}
+
+class OBJECT_OT_cancel_catalog_index(bpy.types.Operator):
+    """Stop the background indexing of the search paths"""
+    bl_idname = "object.cancel_catalog_index"
+    bl_label = "Cancel Indexing"
+
+    @classmethod
+    def poll(cls, context):
+        return indexer.catalog_indexer.running and not indexer.catalog_indexer.cancelling
+
+    def execute(self, context):
+        indexer.catalog_indexer.cancel()
+        return {'FINISHED'}
+
+class OBJECT_OT_select_look_file(bpy.types.Operator):
+    """Show this look file and its shaders"""
+    bl_idname = "object.select_look_file"
+    bl_label = "Select Look File"
+
+    filepath: StringProperty(subtype='FILE_PATH')
+
+    def execute(self, context):
+        prefs = preferences.get(context)
+        lookProps = context.scene.LookAssigner_Properties
+        target = os.path.normcase(os.path.abspath(self.filepath))
+
+        # pick the most specific search path containing the file
+        root_index = None
+        root_length = -1
+        for index, item in enumerate(prefs.paths):
+            root = os.path.join(os.path.normcase(os.path.abspath(item.file_path)), "")
+            if item.file_path and target.startswith(root) and len(root) > root_length:
+                root_index, root_length = index, len(root)
+
+        if root_index is None:
+            self.report({'WARNING'}, f"{self.filepath} is not under any search path")
+            return {'CANCELLED'}
+
+        if lookProps.selected_path_enum != str(root_index):
+            lookProps.selected_path_enum = str(root_index)
+
+        for index, item in enumerate(lookProps.blend_files):
+            if os.path.normcase(os.path.abspath(item.path)) == target:
+                lookProps.blend_file_index = index
+                return {'FINISHED'}
+
+        self.report({'WARNING'}, f"{os.path.basename(self.filepath)} was not found by the last scan")
+        return {'CANCELLED'}
+
+class OBJECT_OT_queue_marked_materials(bpy.types.Operator):
+    """Add the marked shaders of the highlighted look file to the load queue"""
+    bl_idname = "object.queue_marked_materials"
+    bl_label = "Add Marked Shaders to Queue"
+
+    @classmethod
+    def poll(cls, context):
+        lookProps = context.scene.LookAssigner_Properties
+        return 0 <= lookProps.blend_file_index < len(lookProps.blend_files) and any(mat.use for mat in lookProps.materials)
+
+    def execute(self, context):
+        lookProps = context.scene.LookAssigner_Properties
+        filepath = lookProps.blend_files[lookProps.blend_file_index].path
+        queued = {(item.path, item.name) for item in lookProps.load_queue}
+
+        added = 0
+        for mat in lookProps.materials:
+            if mat.use and (filepath, mat.name) not in queued:
+                item = lookProps.load_queue.add()
+                item.name = mat.name
+                item.path = filepath
+                added += 1
+
+        self.report({'INFO'}, f"Queued {added} shaders from {os.path.basename(filepath)}")
+        return {'FINISHED'}
+
+class OBJECT_OT_remove_queued_file(bpy.types.Operator):
+    """Remove the shaders of this look file from the load queue"""
+    bl_idname = "object.remove_queued_file"
+    bl_label = "Remove From Queue"
+
+    filepath: StringProperty(subtype='FILE_PATH')
+
+    def execute(self, context):
+        load_queue = context.scene.LookAssigner_Properties.load_queue
+        # remove back to front so the indices stay valid
+        for index in reversed(range(len(load_queue))):
+            if load_queue[index].path == self.filepath:
+                load_queue.remove(index)
+        return {'FINISHED'}
+
+class OBJECT_OT_clear_load_queue(bpy.types.Operator):
+    """Empty the load queue"""
+    bl_idname = "object.clear_load_queue"
+    bl_label = "Clear Queue"
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.scene.LookAssigner_Properties.load_queue) > 0
+
+    def execute(self, context):
+        context.scene.LookAssigner_Properties.load_queue.clear()
+        return {'FINISHED'}
+
 def menu_func(self, context):
     self.layout.operator(OBJECT_OT_purge_unused_materials.bl_idname)
 
 class_list = [
-    OT_toggle_material_use, 
     LoadMaterialsOperator,
     BuildPipelinedShaderFileOperator,
     OT_Look_Shader_to_Collection,
     OBJECT_OT_custom_export_blend,
     OBJECT_OT_purge_unused_materials,
     OT_open_addon_preferences,
+    OBJECT_OT_start_catalog_index,
+    OBJECT_OT_cancel_catalog_index,
+    OBJECT_OT_select_look_file,
+    OBJECT_OT_queue_marked_materials,
+    OBJECT_OT_remove_queued_file,
+    OBJECT_OT_clear_load_queue,
+    OBJECT_OT_load_materials_modal,
 ]
 
 def register():    
     for cls in class_list:
         bpy.utils.register_class(cls)
     bpy.types.VIEW3D_MT_object.append(menu_func)
+    bpy.app.handlers.save_post.append(write_look_sidecar_on_save)
 
 def unregister():
+    indexer.catalog_indexer.shutdown()
     for cls in class_list:
         bpy.utils.unregister_class(cls)
     bpy.types.VIEW3D_MT_object.remove(menu_func)
+    if write_look_sidecar_on_save in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.remove(write_look_sidecar_on_save)
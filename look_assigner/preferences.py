@@ -7,9 +7,14 @@ import json
 import logging
 
 from .utils import LoggerFactory, get_project_path
+from . import catalog
+from . import tracing
 
 logger = LoggerFactory.get_logger()
 
+# Chrome trace written in debug mode, next to the material catalog
+TRACE_FILE_NAME = "look_assigner_trace.json"
+
 class BlendFilePathItem(PropertyGroup):
     name: StringProperty(
         name="Name",  
@@ -32,14 +37,19 @@ class BlendFilePathItem(PropertyGroup):
 class LookAssignerPreferences(AddonPreferences):
     bl_idname = "look_assigner"
 
-    material_filter: StringProperty(name="Material Filter", default="")
+    material_filter: StringProperty(
+        name="Material Filter",
+        default="",
+        update=lambda self, context: self.update_material_filters(context)
+    )
     task_filter: StringProperty(name="Task Filter", default="3d_look")
     # recursive_search : BoolProperty(name="Recursive Search", default=True)
 
     ignore_filter: StringProperty(
         name="Ignore Specific Names", 
         default="Dots Stroke", 
-        description="Enter the names of specific shaders you might want to omit from the search",)
+        description="Enter the names of specific shaders you might want to omit from the search",
+        update=lambda self, context: self.update_material_filters(context))
     # pipeline_attribute_name is kind of a read only property
     pipeline_attribute_name: StringProperty(
         name="Pipeline Attribute Name", 
@@ -47,6 +57,30 @@ class LookAssignerPreferences(AddonPreferences):
     )
     paths: CollectionProperty(type=BlendFilePathItem)
     path_index: IntProperty(name="Path Index", default=0)
+    scan_workers: IntProperty(
+        name="Scan Workers",
+        description="Number of folders listed in parallel when searching for shader files",
+        default=8,
+        min=1,
+        max=64
+    )
+    write_look_sidecar: BoolProperty(
+        name="Write Look Manifest",
+        description="When a published look file is saved, write a small .look.json manifest next to it for fast listing and planning",
+        default=True
+    )
+    index_on_startup: BoolProperty(
+        name="Index On Startup",
+        description="Index the shader files of all search paths in the background when Blender starts",
+        default=False
+    )
+    catalog_cache_size: IntProperty(
+        name="Catalog Cache Size",
+        description="Number of look files whose material lists are remembered between sessions",
+        default=1000,
+        min=0,
+        update=lambda self, context: self.update_catalog_cache_size()
+    )
     debug_mode: BoolProperty(
         name="Debugging Mode",
         default=False,
@@ -57,8 +91,21 @@ class LookAssignerPreferences(AddonPreferences):
         if self.debug_mode:
             LoggerFactory.set_level(logging.DEBUG)
             logger.debug(f"Debug Logger Enabled [{logging.DEBUG}]")
+            trace_dir = bpy.utils.user_resource('CONFIG', path="look_assigner", create=True)
+            tracing.tracer.configure(True, os.path.join(trace_dir, TRACE_FILE_NAME))
         else:
             LoggerFactory.set_level(logging.INFO)
+            tracing.tracer.configure(False)
+
+    def update_material_filters(self, context):
+        # properties imports this module, so look it up when the filters change
+        from . import properties
+        if context.scene is not None:
+            properties.refilter_materials(context)
+
+    def update_catalog_cache_size(self):
+        catalog.get_catalog().set_max_entries(self.catalog_cache_size)
+        catalog.get_catalog().save()
 
     def path_items(self, context):
         items = [(str(index), item.name, "") for index, item in enumerate(self.paths)]
@@ -100,7 +147,15 @@ class LookAssignerPreferences(AddonPreferences):
 
         # box.prop(self, "recursive_search", text="Recursive Search")
 
-        box.prop(self, "debug_mode", text="Enable Debugging Mode (Check system console for extra messages)")
+        box.prop(self, "scan_workers", text="Parallel Folder Scans")
+        box.prop(self, "index_on_startup", text="Index All Search Paths On Startup")
+        box.prop(self, "write_look_sidecar", text="Write Look Manifest (.look.json) When Saving Look Files")
+
+        row = box.row()
+        row.prop(self, "catalog_cache_size", text="Material Catalog Cache Size")
+        row.operator("wm.clear_material_catalog_operator", icon='TRASH', text="Clear Cache")
+
+        box.prop(self, "debug_mode", text="Enable Debugging Mode (Check system console for extra messages and timings)")
 
 def get(context: bpy.types.Context) -> LookAssignerPreferences:
     """Return the add-on preferences."""
@@ -172,11 +227,23 @@ class RemovePathOperator(Operator):
             prefs.path_index = min(max(0, prefs.path_index - 1), len(prefs.paths) - 1)
         return {'FINISHED'}
     
+class ClearMaterialCatalogOperator(Operator):
+    bl_idname = "wm.clear_material_catalog_operator"
+    bl_label = "Clear Material Catalog"
+    bl_description="Click to forget the cached material lists of all look files."
+    def execute(self, context):
+        material_catalog = catalog.get_catalog()
+        material_catalog.clear()
+        material_catalog.save()
+        self.report({'INFO'}, "Material catalog cache cleared.")
+        return {'FINISHED'}
+
 def register():
     bpy.utils.register_class(BlendFilePathItem)
     bpy.utils.register_class(LookAssignerPreferences)
     bpy.utils.register_class(AddPathOperator)
     bpy.utils.register_class(RemovePathOperator)
+    bpy.utils.register_class(ClearMaterialCatalogOperator)
 
     # Load paths from JSON on add-on registration
     # this only happens on startup
@@ -188,6 +255,7 @@ def unregister():
     bpy.utils.unregister_class(BlendFilePathItem)
     bpy.utils.unregister_class(AddPathOperator)
     bpy.utils.unregister_class(RemovePathOperator)
+    bpy.utils.unregister_class(ClearMaterialCatalogOperator)
 
 # if __name__ == "__main__":
 #     register()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Disk cache of the material previews saved in look files.
+
+Reading the previews means going through the whole look file, so they are extracted
+once per version of a file (see blendfile.read_material_previews) and kept in one
+cache file per look file, named after its path. The cache file records the size and
+mtime of the look file it was made from and is ignored once they no longer match,
+so every preview is effectively keyed on (file, mtime, material).
+
+Cache file layout: MAGIC, a little endian uint32 header length, a JSON header
+{"version", "path", "size", "mtime", "materials": {name: [width, height, offset]}},
+then the RGBA pixels of all previews back to back.
+
+This module does not depend on bpy, so it is safe to use from worker threads.
+"""
+
+import hashlib
+import json
+import os
+import struct
+
+from . import blendfile
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+CACHE_VERSION = 1
+CACHE_MAGIC = b"LAPV"
+CACHE_SUFFIX = ".previews"
+
+HEADER_LENGTH = struct.Struct("<I")
+
+
+class PreviewCache:
+    """
+    The preview cache files in one folder, see the module docstring.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def cache_path(self, blend_path):
+        key = os.path.normcase(os.path.abspath(blend_path))
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + CACHE_SUFFIX)
+
+    def get(self, blend_path):
+        """
+        Return the cached {material name: (width, height, pixels)} of a look file, or None if missing or out of date.
+        """
+        try:
+            stat = os.stat(blend_path)
+            with open(self.cache_path(blend_path), "rb") as file:
+                if file.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                    return None
+                header_length = HEADER_LENGTH.unpack(file.read(HEADER_LENGTH.size))[0]
+                header = json.loads(file.read(header_length))
+                if (header.get("version") != CACHE_VERSION or header.get("size") != stat.st_size
+                        or header.get("mtime") != stat.st_mtime_ns):
+                    return None
+                pixels = file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logger.debug(f"Preview cache of {blend_path} could not be read - {e}")
+            return None
+
+        previews = {}
+        for name, (width, height, offset) in header.get("materials", {}).items():
+            previews[name] = (width, height, pixels[offset:offset + width * height * 4])
+        return previews
+
+    def put(self, blend_path, previews, stat):
+        """
+        Store the previews read from a look file, with the os.stat() of the file taken before reading it.
+        """
+        materials = {}
+        offset = 0
+        for name, (width, height, pixels) in previews.items():
+            materials[name] = [width, height, offset]
+            offset += len(pixels)
+        header = json.dumps({
+            "version": CACHE_VERSION,
+            "path": blend_path,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "materials": materials,
+        }).encode("utf-8")
+
+        cache_path = self.cache_path(blend_path)
+        temp_path = f"{cache_path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                file.write(CACHE_MAGIC)
+                file.write(HEADER_LENGTH.pack(len(header)))
+                file.write(header)
+                for _, _, pixels in previews.values():
+                    file.write(pixels)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Preview cache of {blend_path} could not be written - {e}")
+
+    def load(self, blend_path):
+        """
+        Return the previews of a look file from the cache, extracting and caching them on a miss.
+
+        Raises blendfile.BlendFileError when the look file can't be read.
+        """
+        previews = self.get(blend_path)
+        if previews is not None:
+            return previews
+
+        try:
+            stat = os.stat(blend_path)
+        except OSError as e:
+            raise blendfile.BlendFileError(f"{blend_path} could not be opened - {e}") from e
+        previews = blendfile.read_material_previews(blend_path)
+        self.put(blend_path, previews, stat)
+        logger.debug(f"Extracted {len(previews)} material previews from {blend_path}")
+        return previews
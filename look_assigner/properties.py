@@ -1,12 +1,18 @@
 
 import bpy
-import os
+import functools
 from bpy.types import PropertyGroup, Operator
 from bpy.props import StringProperty, BoolProperty, CollectionProperty, IntProperty, EnumProperty, PointerProperty
 
 from .utils import LoggerFactory
 
 from . import preferences
+from . import catalog
+from . import discovery
+from . import listing
+from . import thumbnails
+from . import tracing
+from . import updates
 
 
 logger = LoggerFactory.get_logger()
@@ -17,26 +23,24 @@ class ScanForBlendFilesOperator(Operator):
     
     def scan_for_blend_files(self, context, directory, recursive ):
 
+        prefs = preferences.get(context)
         lookProps = context.scene.LookAssigner_Properties
         lookProps.blend_files.clear()
 
-        if recursive:
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    if file.endswith(".blend"):
-                        logger.debug(f'ScanForBlendFilesOperator - Recursive: On : File Found: {root} {file}')
-                        item = lookProps.blend_files.add()
-                        item.name = file
-                        item.path = os.path.join(root, file)
-        else:
-            root = directory
-            for file in os.listdir(directory):
-                if os.path.isfile(os.path.join(root, file)) and file.endswith(".blend"):
-                    logger.debug(f'ScanForBlendFilesOperator - Recursive: Off : File Found: {root} {file}')
-                    item = lookProps.blend_files.add()
-                    item.name = file
-                    item.path = os.path.join(root, file)
-            
+        # discover everything first, then fill the collection in one batch
+        snapshots = discovery.directory_snapshots
+        hits, misses = snapshots.hits, snapshots.misses
+        with tracing.span("scan", root=directory) as stage:
+            found_files = discovery.discover_blend_files(directory, recursive, prefs.scan_workers, snapshots=snapshots)
+            stage.count(files=len(found_files), folders_listed=snapshots.misses - misses)
+        logger.debug(f'ScanForBlendFilesOperator - Recursive: {recursive} : Found {len(found_files)} files in {directory} '
+                     f'({snapshots.misses - misses} folders listed, {snapshots.hits - hits} unchanged)')
+
+        for name, path in found_files:
+            item = lookProps.blend_files.add()
+            item.name = name
+            item.path = path
+
         lookProps.blend_file_index = -1
         lookProps.materials.clear()    
 
@@ -51,52 +55,189 @@ class ScanForBlendFilesOperator(Operator):
             if current_item:
                 selected_path = current_item.file_path
                 search_params = current_item.recursive
-                self.scan_for_blend_files(context, selected_path, search_params )
+                with tracing.session("Scan for Blend Files"):
+                    self.scan_for_blend_files(context, selected_path, search_params )
         return {'FINISHED'}
 
 
+class ForceRescanBlendFilesOperator(Operator):
+    bl_idname = "object.force_rescan_blend_files"
+    bl_label = "Force Full Rescan"
+    bl_description = "Forget the cached folder listings of the current root and scan it again from scratch"
+
+    def execute(self, context):
+        prefs = preferences.get(context)
+        lookProps = context.scene.LookAssigner_Properties
+        selected_path_index = int(lookProps.selected_path_enum)
+
+        if selected_path_index < len(prefs.paths):
+            discovery.directory_snapshots.invalidate(prefs.paths[selected_path_index].file_path)
+        return bpy.ops.object.scan_for_blend_files()
+
+
 def update_path_enum(self, context):
     bpy.ops.object.scan_for_blend_files()
 
+class MaterialListCache:
+    """
+    The unfiltered material names of the look file highlighted in the panel.
+
+    Filter changes are evaluated against this list, so they never read the look file
+    again. The check states of the materials are remembered here too, so materials
+    that are filtered out and back in keep their state.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.names = []
+        self.use_states = {}
+
+    def set(self, path, names):
+        self.path = path
+        self.names = list(names)
+        self.use_states = {}
+
+    def clear(self):
+        self.set(None, [])
+
+
+material_list_cache = MaterialListCache()
+
+
+@functools.lru_cache(maxsize=16)
+def compile_material_filters(material_filter, ignore_filter):
+    """
+    Return the lower case include text and the frozenset of ignored names for the filter preferences.
+    """
+    return material_filter.lower(), frozenset(item.strip() for item in ignore_filter.lower().split(","))
+
+
+def filter_material_names(names, material_filter, ignore_filter):
+    """
+    Return the names that pass the material filter and are not ignored, keeping their order.
+    """
+    include, ignored = compile_material_filters(material_filter, ignore_filter)
+    visible = []
+    for name in names:
+        lower_name = name.lower()
+        if include in lower_name and lower_name not in ignored:
+            visible.append(name)
+    return visible
+
+
+def sync_material_items(materials, names, use_states):
+    """
+    Make the materials collection hold names, in that order, only touching the items that change.
+
+    The check state of every item is stored in use_states before it can be removed, and
+    items that are added back get their stored state.
+    """
+    wanted = set(names)
+    for index in reversed(range(len(materials))):
+        item = materials[index]
+        use_states[item.name] = item.use
+        if item.name not in wanted:
+            materials.remove(index)
+
+    current = [item.name for item in materials]
+    present = set(current)
+    for name in names:
+        if name not in present:
+            item = materials.add()
+            item.name = name
+            item.use = use_states.get(name, False)
+            current.append(name)
+
+    # the filter only ever hides names, put the added ones back in their listed place
+    for target, name in enumerate(names):
+        if current[target] != name:
+            source = current.index(name, target)
+            materials.move(source, target)
+            current.insert(target, current.pop(source))
+
+
+def active_blend_file_path(lookProps):
+    blend_file_index = lookProps.blend_file_index
+    if blend_file_index >= 0 and blend_file_index < len(lookProps.blend_files):
+        return lookProps.blend_files[blend_file_index].path
+    return None
+
+
+def refilter_materials(context):
+    """
+    Apply the current filters to the cached material list of the highlighted look file.
+    """
+    apply_material_filters(preferences.get(context), context.scene)
+
+
+def apply_material_filters(prefs, scene):
+    lookProps = scene.LookAssigner_Properties
+
+    blend_file_path = active_blend_file_path(lookProps)
+    if blend_file_path is None:
+        lookProps.materials_filtered = 0
+        lookProps.materials.clear()
+        return
+    if blend_file_path == listing.material_lister.loading_path:
+        # the list is filtered when it arrives
+        return
+    if blend_file_path != material_list_cache.path:
+        # another scene, or the file list changed underneath us
+        list_materials(scene, blend_file_path)
+        return
+
+    names = material_list_cache.names
+    if not lookProps.list_all_materials:
+        logger.debug (f'Filtering to include materials containing {prefs.material_filter}, Ignoring materials named : {prefs.ignore_filter}')
+        names = filter_material_names(names, prefs.material_filter, prefs.ignore_filter)
+
+    sync_material_items(lookProps.materials, names, material_list_cache.use_states)
+    lookProps.materials_filtered = len(material_list_cache.names) - len(names)
+
+
+def update_material_filters(self, context):
+    refilter_materials(context)
+
+
+def list_materials(scene, blend_file_path):
+    """
+    List the materials of the look file in the background and show them in the panel of scene once read.
+    """
+    scene_name = scene.name
+
+    def show_materials(material_names):
+        scene = bpy.data.scenes.get(scene_name)
+        if scene is None or active_blend_file_path(scene.LookAssigner_Properties) != blend_file_path:
+            return
+        material_list_cache.set(blend_file_path, material_names)
+        apply_material_filters(preferences.get(bpy.context), scene)
+        thumbnails.material_thumbnails.request(blend_file_path)
+        updates.redraw_3d_views()
+
+    material_list_cache.clear()
+    listing.material_lister.request(blend_file_path, show_materials)
+
+
 def update_materials( self, context):
-    prefs = preferences.get(context)
     lookProps = context.scene.LookAssigner_Properties
 
     lookProps.materials_filtered = 0 
     lookProps.materials.clear()
 
-    blend_file_index = lookProps.blend_file_index
-    if blend_file_index >= 0 and blend_file_index < len(lookProps.blend_files):
-        blend_file_path = lookProps.blend_files[blend_file_index].path
-        material_filter = prefs.material_filter.lower()
+    blend_file_path = active_blend_file_path(lookProps)
+    if blend_file_path is None:
+        listing.material_lister.cancel()
+        material_list_cache.clear()
+        return
 
-        logger.debug (f'Filtering to include materials containing {prefs.material_filter}, Ignoring materials named : {prefs.ignore_filter}')
-        ignore_filter_list = [item.strip() for item in prefs.ignore_filter.lower().split(",")]
-        materials = get_materials_from_blend( blend_file_path)
-        for material_name in materials:
-            if lookProps.list_all_materials:
-                material_item = lookProps.materials.add()
-                material_item.name = material_name
-            elif (material_filter in material_name.lower()) and (material_name.lower() not in ignore_filter_list):
-                material_item = lookProps.materials.add()
-                material_item.name = material_name
-            else:
-                lookProps.materials_filtered+=1
+    list_materials(context.scene, blend_file_path)
 
 def get_materials_from_blend( filepath ):
     """
     this is to retrieve the contents of the blend file's materials, without actually loading them into the scene
-    
+    the names come from the persistent material catalog when the file hasn't changed since it was last read
     """
-    material_names = []
-    # Load the blend file
-    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
-        # Check if materials are present in the blend file
-        if data_from.materials:
-            # Append each material name to the list
-            for mat_name in data_from.materials:
-                material_names.append(mat_name)
-    return material_names
+    return catalog.get_material_names(filepath)
 
 # This blend file item is for the Custom UI panel in the main UI
 class BlendFileItem(PropertyGroup):
@@ -107,22 +248,53 @@ class MaterialItem(PropertyGroup):
     name: StringProperty(name="Material Name",default="")
     use: BoolProperty(name="Use Material", default=False)
 
+# A shader queued for loading, with the look file it comes from
+class LoadQueueItem(PropertyGroup):
+    name: StringProperty(name="Material Name",default="")
+    path: StringProperty(name="File Path",default="")
+
 
 class LookAssignerProperties(PropertyGroup):
     blend_files : CollectionProperty(type=BlendFileItem )
     blend_file_index : IntProperty(name="Index for blend_files", default=-1, update=update_materials)
     materials : CollectionProperty(type=MaterialItem)
+    material_index : IntProperty(name="Active Shader", default=0)
+    load_queue : CollectionProperty(type=LoadQueueItem)
     materials_filtered : IntProperty(name="Materials Filtered", default=0)
     selected_objects_only : BoolProperty(name="Selected Objects Only", default=False)
     force_assign : BoolProperty(name="Force Material Assignment", default=False)
+    link_materials : BoolProperty(
+        name="Link Shaders",
+        description="Link the shaders from the look file instead of appending copies of their node trees and images. Shaders that can't be linked are appended",
+        default=False
+    )
+    override_linked_materials : BoolProperty(
+        name="Editable Overrides",
+        description="Turn linked shaders into library overrides so they can be tweaked in this file",
+        default=False
+    )
     purge_material_datablocks : BoolProperty(name="Purge Unused Datablocks", default=False)
     expand_to_collection : IntProperty(name="Expand To Collection", default=False)
-    list_all_materials : BoolProperty(name="Ignore naming filters", default=False, update=update_materials)
+    list_all_materials : BoolProperty(name="Ignore naming filters", default=False, update=update_material_filters)
     selected_path_enum : EnumProperty(
         name="Scan Path",
         items=lambda self, context: context.preferences.addons["look_assigner"].preferences.path_items(context),
         update=update_path_enum,
     )
+    material_search : StringProperty(
+        name="Find Shader",
+        description="Search every indexed look file for shaders with this name",
+        default="",
+        options={'TEXTEDIT_UPDATE'},
+    )
+    material_search_mode : EnumProperty(
+        name="Search Mode",
+        items=[
+            ('SUBSTRING', "Contains", "Find shaders whose name contains the text"),
+            ('PREFIX', "Starts With", "Find shaders whose name starts with the text"),
+        ],
+        default='SUBSTRING',
+    )
     create_look_help_subpanel: bpy.props.BoolProperty(
         name="Help Subpanel",
         description="UI Toggle for the help subpanel",
@@ -131,16 +303,20 @@ class LookAssignerProperties(PropertyGroup):
 
 def register():
     bpy.utils.register_class(ScanForBlendFilesOperator)
+    bpy.utils.register_class(ForceRescanBlendFilesOperator)
     bpy.utils.register_class(BlendFileItem)
     bpy.utils.register_class(MaterialItem)
+    bpy.utils.register_class(LoadQueueItem)
     bpy.utils.register_class(LookAssignerProperties)
     bpy.types.Scene.LookAssigner_Properties = PointerProperty(type=LookAssignerProperties)
 
 def unregister():
-    
+    listing.material_lister.shutdown()
     bpy.utils.unregister_class(ScanForBlendFilesOperator)
+    bpy.utils.unregister_class(ForceRescanBlendFilesOperator)
     bpy.utils.unregister_class(BlendFileItem)
     bpy.utils.unregister_class(MaterialItem)
+    bpy.utils.unregister_class(LoadQueueItem)
     bpy.utils.unregister_class(LookAssignerProperties)
     del bpy.types.Scene.LookAssigner_Properties
 
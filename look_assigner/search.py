@@ -0,0 +1,119 @@
+"""
+Cross-file material search.
+
+An inverted index from material name to the look files containing it, built from the
+material catalog. Prefix queries bisect a sorted list of lower case names; substring
+queries run str.find over all names joined into one string, so both stay well under
+a millisecond for tens of thousands of materials.
+
+The index itself does not depend on bpy, only get_search_index() reads the catalog.
+"""
+
+import os
+
+from bisect import bisect_left, bisect_right
+
+
+SEARCH_PREFIX = 'PREFIX'
+SEARCH_SUBSTRING = 'SUBSTRING'
+
+# never occurs in an ID name, so a substring match can't span two names
+SEPARATOR = "\n"
+
+
+class MaterialSearchIndex:
+    """
+    Maps material names to the files that contain them, see the module docstring.
+    """
+
+    def __init__(self, files):
+        """
+        Build the index from (file path, material names) pairs.
+        """
+        self._paths_by_name = {}
+        for path, material_names in files:
+            for name in material_names:
+                self._paths_by_name.setdefault(name, []).append(path)
+
+        ordered = sorted(self._paths_by_name, key=lambda name: (name.lower(), name))
+        self._names = ordered
+        self._keys = [name.lower() for name in ordered]
+
+        self._starts = []
+        offset = 0
+        for key in self._keys:
+            self._starts.append(offset)
+            offset += len(key) + len(SEPARATOR)
+        self._blob = SEPARATOR.join(self._keys)
+
+    def __len__(self):
+        return len(self._names)
+
+    def paths(self, name):
+        return self._paths_by_name.get(name, [])
+
+    def prefix(self, query, limit=None):
+        """
+        Return the names starting with query (case insensitive), in alphabetical order.
+        """
+        query = query.lower()
+        start = bisect_left(self._keys, query)
+        end = bisect_right(self._keys, query + "\U0010ffff", lo=start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._names[start:end]
+
+    def substring(self, query, limit=None):
+        """
+        Return the names containing query (case insensitive), in alphabetical order.
+        """
+        query = query.lower()
+        if not query:
+            return list(self._names[:limit])
+        if SEPARATOR in query:
+            return []
+
+        found = []
+        position = self._blob.find(query)
+        while position != -1:
+            index = bisect_right(self._starts, position) - 1
+            found.append(self._names[index])
+            if limit is not None and len(found) >= limit:
+                break
+            # continue after the end of this name
+            position = self._blob.find(query, self._starts[index] + len(self._keys[index]) + len(SEPARATOR))
+        return found
+
+    def search(self, query, mode=SEARCH_SUBSTRING, limit=None):
+        """
+        Return (material name, [file paths]) pairs matching the query.
+        """
+        if mode == SEARCH_PREFIX:
+            names = self.prefix(query, limit)
+        else:
+            names = self.substring(query, limit)
+        return [(name, self._paths_by_name[name]) for name in names]
+
+
+_index = None
+_index_key = None
+
+
+def get_search_index(roots):
+    """
+    Return the search index over the catalog entries of the look files under the given roots.
+
+    The index is rebuilt only when the catalog or the roots change.
+    """
+    global _index, _index_key
+    from . import catalog
+
+    material_catalog = catalog.get_catalog()
+    roots = tuple(os.path.join(os.path.normcase(os.path.abspath(root)), "") for root in roots if root)
+    key = (material_catalog.revision, roots)
+
+    if _index is None or _index_key != key:
+        files = [(entry["path"], entry["materials"]) for entry in material_catalog.entries() if entry["path"].startswith(roots)]
+        _index = MaterialSearchIndex(files)
+        _index_key = key
+    return _index
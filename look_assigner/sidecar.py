@@ -0,0 +1,140 @@
+"""
+Look manifest sidecar files.
+
+When a look file is published, a small JSON file is written next to it
+(`<look file>.look.json`) mapping every material to the objects and slots it
+targets, with a node tree content hash, plus the size and mtime of the look file it
+describes. Listing materials, previewing coverage and planning an assignment can
+then be done from the sidecar, and only the selected materials are read from the
+heavy .blend. A sidecar whose recorded size/mtime no longer match its look file is
+ignored.
+
+Reading does not depend on bpy.
+"""
+
+import os
+import json
+
+from . import blendfile
+from .manifest import LookManifest, ManifestError, parse_manifest
+from .nodehash import material_content_hash
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+SIDECAR_VERSION = 1
+SIDECAR_SUFFIX = ".look.json"
+
+
+def sidecar_path(blend_path):
+    return f"{blend_path}{SIDECAR_SUFFIX}"
+
+
+class LookSidecar:
+    """
+    The parsed sidecar of one look file.
+    """
+
+    def __init__(self, blend_path, materials):
+        self.blend_path = blend_path
+        self.materials = materials
+
+    def material_names(self):
+        return list(self.materials)
+
+    def manifest(self, material_name):
+        """
+        Return the LookManifest of a material, or None if it has no pipeline data.
+        """
+        entry = self.materials.get(material_name)
+        if not entry or entry.get("objects") is None:
+            return None
+        return LookManifest(entry.get("v", 1), entry["objects"], [tuple(indices) for indices in entry["slots"]])
+
+    def node_hash(self, material_name):
+        entry = self.materials.get(material_name)
+        return entry.get("node_hash", "") if entry else ""
+
+
+def describe_materials(materials, pipeline_attr, resolve_path=None):
+    """
+    Build the sidecar "materials" mapping for the given material datablocks.
+
+    resolve_path is handed to nodehash.material_content_hash() for image paths.
+    """
+    described = {}
+    for mat in materials:
+        entry = {"node_hash": material_content_hash(mat, resolve_path)}
+        if pipeline_attr in mat:
+            try:
+                manifest = parse_manifest(mat[pipeline_attr])
+            except ManifestError as e:
+                logger.warning(f"Shader {mat.name} has an invalid pipeline manifest, left out of the sidecar - {e}")
+            else:
+                object_slots = manifest.object_slots()
+                entry["v"] = manifest.version
+                entry["objects"] = [name for name, _ in object_slots]
+                entry["slots"] = [list(slots) for _, slots in object_slots]
+        described[mat.name] = entry
+    return described
+
+
+def write_sidecar(blend_path, materials):
+    """
+    Write the sidecar of a look file that has just been saved.
+
+    materials maps material names to dicts with "objects", "slots" (see manifest.py) and "node_hash".
+    """
+    stat = os.stat(blend_path)
+    data = {
+        "version": SIDECAR_VERSION,
+        "blend": os.path.basename(blend_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "materials": materials,
+    }
+
+    path = sidecar_path(blend_path)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(data, file, separators=(",", ":"), ensure_ascii=False)
+    os.replace(temp_path, path)
+    logger.info(f"Look manifest sidecar written for {len(materials)} materials - {path}")
+    return path
+
+
+def read_sidecar(blend_path):
+    """
+    Return the LookSidecar of a look file, or None when there is none or it is out of date.
+    """
+    path = sidecar_path(blend_path)
+    try:
+        with open(path, 'r') as file:
+            data = json.load(file)
+        stat = os.stat(blend_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug(f"Look manifest sidecar could not be read - {path} - {e}")
+        return None
+
+    if data.get("version") != SIDECAR_VERSION:
+        logger.debug(f"Look manifest sidecar has an unsupported version - {path}")
+        return None
+    if data.get("size") != stat.st_size or data.get("mtime") != stat.st_mtime_ns:
+        logger.debug(f"Look manifest sidecar is out of date - {path}")
+        return None
+
+    return LookSidecar(blend_path, data.get("materials", {}))
+
+
+def list_materials(blend_path):
+    """
+    Return the material names of a look file from its sidecar, or by reading the .blend.
+
+    Raises blendfile.BlendFileError when neither works.
+    """
+    sidecar = read_sidecar(blend_path)
+    if sidecar is not None:
+        return sidecar.material_names()
+    return blendfile.read_material_names(blend_path)
@@ -0,0 +1,151 @@
+"""
+Material thumbnails for the shader list.
+
+The icons are the preview images saved with the materials in the look files, nothing
+is appended or rendered. A worker thread gets them from the disk cache in
+previewcache.py, extracting them on the first visit of a look file, and a
+bpy.app.timers callback turns them into icons of a bpy.utils.previews collection.
+Until then, or for materials saved without a preview, the list shows the plain
+material icon.
+"""
+
+import array
+import os
+import queue
+
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+import bpy.utils.previews
+
+from . import blendfile
+from . import previewcache
+from . import updates
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+POLL_INTERVAL = 0.1
+# the icons of this many look files are kept, beyond that the collection starts over
+MAX_LOADED_FILES = 20
+PREVIEW_CACHE_FOLDER = "previews"
+
+
+class MaterialThumbnails:
+    """
+    The icons of the look files shown so far, loaded in the background on request.
+    """
+
+    def __init__(self):
+        self._collection = None
+        self._cache = None
+        self._pool = None
+        self._results = queue.SimpleQueue()
+        self._pending = set()
+        # look file -> (mtime the icons were made from, {material name: icon id})
+        self._icons = {}
+        # keep one bound method so the timer can be found again
+        self._timer = self._drain
+
+    def icon(self, blend_path, material_name):
+        """
+        Return the icon id of a material's thumbnail, or 0 when there is none (yet).
+        """
+        loaded = self._icons.get(blend_path)
+        return loaded[1].get(material_name, 0) if loaded else 0
+
+    def request(self, blend_path):
+        """
+        Load the thumbnails of a look file in the background, unless they are on their way.
+
+        Icons that are already loaded are kept when the file hasn't changed since.
+        """
+        if blend_path in self._pending or bpy.app.background:
+            return
+
+        if self._cache is None:
+            cache_dir = bpy.utils.user_resource('CONFIG', path="look_assigner", create=True)
+            self._cache = previewcache.PreviewCache(os.path.join(cache_dir, PREVIEW_CACHE_FOLDER))
+        if self._pool is None:
+            # one file at a time, the icons of the file highlighted first come first
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="look_assigner_thumbnails")
+
+        self._pending.add(blend_path)
+        loaded = self._icons.get(blend_path)
+        self._pool.submit(self._read, self._cache, blend_path, loaded[0] if loaded else None, self._results)
+
+        if not bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.register(self._timer, first_interval=POLL_INTERVAL)
+
+    def clear(self):
+        if self._collection is not None:
+            self._collection.clear()
+        self._icons.clear()
+
+    def shutdown(self):
+        """
+        Stop loading and free the icons, used when the add-on is unregistered.
+        """
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._collection is not None:
+            bpy.utils.previews.remove(self._collection)
+            self._collection = None
+        self._icons.clear()
+        self._pending.clear()
+
+    def _read(self, cache, blend_path, loaded_mtime, results):
+        try:
+            mtime = os.stat(blend_path).st_mtime_ns
+            if mtime == loaded_mtime:
+                results.put((blend_path, mtime, None))
+                return
+            results.put((blend_path, mtime, cache.load(blend_path)))
+        except (OSError, blendfile.BlendFileError) as e:
+            logger.debug(f"No material previews for {blend_path} - {e}")
+            results.put((blend_path, None, {}))
+
+    def _drain(self):
+        """
+        Timer callback: turn the previews read so far into icons and redraw the panel.
+        """
+        loaded = False
+        while True:
+            try:
+                blend_path, mtime, previews = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(blend_path)
+            if previews is not None:
+                self._add_icons(blend_path, mtime, previews)
+                loaded = True
+
+        if loaded:
+            updates.redraw_3d_views()
+
+        return POLL_INTERVAL if self._pending else None
+
+    def _add_icons(self, blend_path, mtime, previews):
+        if self._collection is None:
+            self._collection = bpy.utils.previews.new()
+        if blend_path not in self._icons and len(self._icons) >= MAX_LOADED_FILES:
+            # previews can't be released one by one
+            self.clear()
+
+        icons = {}
+        for material_name, (width, height, pixels) in previews.items():
+            key = f"{blend_path}|{material_name}"
+            # a republished look file reuses the icons of its materials
+            preview = self._collection.get(key) or self._collection.new(key)
+            preview.image_size = (width, height)
+            # packed RGBA bytes, exactly the layout Blender keeps preview pixels in
+            preview.image_pixels.foreach_set(array.array('i', pixels))
+            icons[material_name] = preview.icon_id
+        self._icons[blend_path] = (mtime, icons)
+
+
+# the add-on wide thumbnails
+material_thumbnails = MaterialThumbnails()
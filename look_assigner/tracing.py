@@ -0,0 +1,211 @@
+"""
+Lightweight tracing of the add-on's hot paths: scan, list, append, match and assign.
+
+Stages are wrapped in spans, which record their duration and any counts added to them:
+
+    with tracing.span("list", file=path) as stage:
+        names = read_material_names(path)
+        stage.count(materials=len(names))
+
+Top level entry points (operators, the background indexer) open a session instead. When
+a session ends, the per-stage summary of everything recorded during it is logged and
+all events so far are written as a Chrome trace_event file, to open in chrome://tracing
+or Perfetto.
+
+Tracing is switched on with the add-on's debug_mode. When it is off span() returns a
+shared no-op object, so the instrumentation costs a function call and nothing else.
+Spans are thread safe and record the thread they ran on.
+"""
+
+import json
+import os
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+# oldest events are dropped beyond this, so a long session can't grow without bounds
+MAX_EVENTS = 200000
+
+
+class _NullSpan:
+    """
+    What span() returns while tracing is off.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, **counts):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    A timed stage, recorded on its tracer when the with block ends.
+    """
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+    def count(self, **counts):
+        """
+        Add counts (files, materials, objects...) to the span, numbers are summed in the summary.
+        """
+        self.args.update(counts)
+
+
+class Tracer:
+    """
+    Collects span events, see the module docstring.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = None
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._thread_names = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def configure(self, enabled, trace_path=None):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        if not enabled:
+            self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self._thread_names.clear()
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def record(self, name, start_ns, duration_ns, args):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": "look_assigner",
+            "ph": "X",
+            "ts": (start_ns - self._origin) / 1000.0,
+            "dur": duration_ns / 1000.0,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+            self._thread_names[thread.ident] = thread.name
+
+    def now_us(self):
+        return (time.perf_counter_ns() - self._origin) / 1000.0
+
+    def summary(self, since_us=0.0):
+        """
+        Return {stage: {"count", "total_ms", "max_ms", counts...}} for the events since since_us.
+        """
+        with self._lock:
+            events = [event for event in self.events if event["ts"] >= since_us]
+
+        stages = {}
+        for event in events:
+            stage = stages.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            duration = event["dur"] / 1000.0
+            stage["count"] += 1
+            stage["total_ms"] += duration
+            stage["max_ms"] = max(stage["max_ms"], duration)
+            for key, value in event["args"].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stage[key] = stage.get(key, 0) + value
+        return stages
+
+    def log_summary(self, title, since_us=0.0):
+        stages = self.summary(since_us)
+        if not stages:
+            return
+        lines = [f"Trace summary - {title}"]
+        width = max(len(name) for name in stages)
+        for name, stage in sorted(stages.items(), key=lambda item: -item[1]["total_ms"]):
+            counts = ", ".join(f"{key} {value}" for key, value in stage.items() if key not in {"count", "total_ms", "max_ms"})
+            lines.append(f"  {name.ljust(width)}  {stage['count']:6d}x  {stage['total_ms']:10.2f} ms total  "
+                         f"{stage['max_ms']:9.2f} ms max  {counts}")
+        logger.debug("\n".join(lines))
+
+    def export_chrome_trace(self, path):
+        """
+        Write every recorded event as a Chrome trace_event JSON file.
+        """
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                    for tid, name in thread_names.items()]
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, file)
+        os.replace(temp_path, path)
+        return path
+
+
+tracer = Tracer()
+
+
+def span(name, **args):
+    """
+    Time a stage of the current session, a no-op while tracing is off.
+    """
+    if not tracer.enabled:
+        return NULL_SPAN
+    return Span(tracer, name, args)
+
+
+@contextmanager
+def session(name, **args):
+    """
+    Trace a top level run: a span that logs the stage summary and exports the trace when it ends.
+    """
+    if not tracer.enabled:
+        yield NULL_SPAN
+        return
+
+    since = tracer.now_us()
+    try:
+        with tracer.span(name, **args) as root:
+            yield root
+    finally:
+        tracer.log_summary(name, since)
+        if tracer.trace_path:
+            try:
+                tracer.export_chrome_trace(tracer.trace_path)
+                logger.debug(f"Chrome trace written - {tracer.trace_path}")
+            except OSError as e:
+                logger.warning(f"Chrome trace could not be written - {e}")
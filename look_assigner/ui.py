@@ -1,12 +1,23 @@
 import bpy
+import os
 from . import bl_info
 from bpy.types import Panel, UIList, Operator
+from bpy.props import BoolProperty
 
 from . import preferences
+from . import indexer
+from . import listing
+from . import properties
+from . import search
+from . import thumbnails
 
 from .utils import LoggerFactory
 logger = LoggerFactory.get_logger()
 
+MATERIAL_SEARCH_LIMIT = 25
+# the shader list grows up to this many rows, longer lists scroll
+MATERIAL_LIST_MAX_ROWS = 15
+
 class UI_UL_CustomPath_List(UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
 
@@ -60,7 +71,9 @@ class BlendFilePanel(Panel):
         if prefs.paths and len(prefs.paths) > 0:
 
             if lookProps.selected_path_enum:
-                box.label(text=f'Full Path : {prefs.paths[int(lookProps.selected_path_enum)].file_path}', icon='FILE_FOLDER')        
+                row = box.row()
+                row.label(text=f'Full Path : {prefs.paths[int(lookProps.selected_path_enum)].file_path}', icon='FILE_FOLDER')        
+                row.operator("object.force_rescan_blend_files", text="", icon='FILE_REFRESH')
                 enum_count = len(prefs.path_items(context))
 
                 if enum_count > 4:
@@ -70,6 +83,14 @@ class BlendFilePanel(Panel):
 
                 col_flow = box.column_flow(columns=tab_count, align=True)        
                 col_flow.prop(lookProps, "selected_path_enum", text="Asset Folder Root",expand=True)
+
+                catalog_indexer = indexer.catalog_indexer
+                row = box.row()
+                if catalog_indexer.running:
+                    row.progress(factor=catalog_indexer.progress, type='BAR', text=f"Indexing {catalog_indexer.done}/{catalog_indexer.total} shader files")
+                    row.operator("object.cancel_catalog_index", text="", icon='CANCEL')
+                else:
+                    row.operator("object.start_catalog_index", icon='VIEWZOOM')
                 
                 # Calculate the number of blend files
                 blend_files_count = len(lookProps.blend_files)
@@ -108,6 +129,10 @@ class BlendFilePanel(Panel):
             grid.prop( lookProps, 'selected_objects_only', icon='FILE_3D', text="Assign to Selection Only")        
             grid.prop( lookProps, 'force_assign', text="Force Assignment", icon="PLUS")
             grid.operator("object.purge_unused_materials", text="Remove Unused Materials", icon="GHOST_ENABLED") 
+            grid.prop( lookProps, 'link_materials', text="Link Shaders", icon="LINKED")
+            row = grid.row()
+            row.enabled = lookProps.link_materials
+            row.prop( lookProps, 'override_linked_materials', text="Editable Overrides", icon="LIBRARY_DATA_OVERRIDE")
 
         # else:
         #     box.label(text="Add a folder root in the addon preferences.", icon='SETTINGS')
@@ -138,17 +163,78 @@ class MaterialPanel(bpy.types.Panel):
         split.label(text=text , icon=icon)
         split.label(text=label)
 
+    def draw_material_search(self, context, layout, lookProps, prefs):
+        box = layout.box()
+        row = box.row(align=True)
+        row.prop(lookProps, "material_search", text="", icon='VIEWZOOM')
+        row.prop(lookProps, "material_search_mode", text="")
+
+        if not lookProps.material_search:
+            return
+
+        index = search.get_search_index([item.file_path for item in prefs.paths])
+        results = index.search(lookProps.material_search, lookProps.material_search_mode, limit=MATERIAL_SEARCH_LIMIT)
+
+        if not results:
+            box.label(text=f"No indexed shader matches '{lookProps.material_search}'", icon='INFO')
+            return
+
+        col = box.column(align=True)
+        for material_name, paths in results:
+            for path in paths:
+                row = col.row()
+                split = row.split(factor=0.45)
+                split.label(text=material_name, icon='MATERIAL')
+                split.operator("object.select_look_file", text=os.path.basename(path), icon='BLENDER', emboss=False).filepath = path
+
+        if len(results) == MATERIAL_SEARCH_LIMIT:
+            box.label(text=f"Showing the first {MATERIAL_SEARCH_LIMIT} shaders, refine the search to see more.")
+
+    def draw_material_list(self, layout, lookProps):
+        """
+        The shaders of the highlighted look file, only the visible rows are drawn
+        """
+        rows = min(max(len(lookProps.materials), 3), MATERIAL_LIST_MAX_ROWS)
+        layout.template_list("LOOK_UL_material_list", "", lookProps, "materials", lookProps, "material_index", rows=rows)
+
+    def draw_load_queue(self, context, layout, lookProps):
+        """
+        The shaders queued from several look files, loaded together in one run
+        """
+        if len(lookProps.load_queue) == 0:
+            return
+
+        queued_files = {}
+        for item in lookProps.load_queue:
+            queued_files.setdefault(item.path, []).append(item.name)
+
+        box = layout.box()
+        row = box.row()
+        row.label(text=f"Load Queue - {len(lookProps.load_queue)} Shaders from {len(queued_files)} Files", icon='LINENUMBERS_ON')
+        row.operator("object.clear_load_queue", text="", icon='TRASH')
+
+        col = box.column(align=True)
+        for path, names in queued_files.items():
+            row = col.row(align=True)
+            row.label(text=f"{os.path.basename(path)} : {', '.join(names)}", icon='BLENDER')
+            row.operator("object.remove_queued_file", text="", icon='X', emboss=False).filepath = path
+
+        row = box.row()
+        row.scale_y = 1.5
+        row.operator("object.load_materials_operator", text="Load Queued Materials", icon='PLAY').use_queue = True
+
     def draw(self, context):
         layout = self.layout
         lookProps = context.scene.LookAssigner_Properties
         prefs = preferences.get(context)
 
+        self.draw_material_search(context, layout, lookProps, prefs)
+
         # the material layout area
         box = layout.box()
 
         fancy_grammar = "Shaders"
         display_icon='MATERIAL'
-        col_width = 2
 
         if prefs.paths and len(prefs.paths) > 0:
             # there are root folders! 
@@ -160,7 +246,6 @@ class MaterialPanel(bpy.types.Panel):
                     elif num_mats == 1:                        
                         box_label = 'Published Shaders - '
                         fancy_grammar = "Shader"
-                        col_width = 1
                     else:
                         box_label = 'Published Shaders - '
                 else:
@@ -179,7 +264,11 @@ class MaterialPanel(bpy.types.Panel):
         else:
             extra_text = ""
 
-        box.label(text=f'{box_label}{len(lookProps.materials)} {fancy_grammar} Found {extra_text}', icon=display_icon)
+        loading_path = listing.material_lister.loading_path
+        if loading_path is not None and loading_path == properties.active_blend_file_path(lookProps):
+            box.label(text=f'Loading shaders from {os.path.basename(loading_path)}...', icon='TIME')
+        else:
+            box.label(text=f'{box_label}{len(lookProps.materials)} {fancy_grammar} Found {extra_text}', icon=display_icon)
 
         col = box.column()
 
@@ -191,16 +280,19 @@ class MaterialPanel(bpy.types.Panel):
             col_flow.operator("object.uncheck_all_materials_operator", text="", icon="CHECKBOX_DEHLT")
             col_flow.operator("object.invert_check_state_operator", text="", icon="ARROW_LEFTRIGHT")
 
-            col_flow = box.column_flow(columns=col_width, align=True)
+            self.draw_material_list(box, lookProps)
+
+            row = box.row()
+            row.operator("object.queue_marked_materials", icon='ADD')
 
-            for index, material in enumerate(lookProps.materials):
-                row = col_flow.row()
-                row.prop(material, "use", text="")
-                row.operator("object.toggle_material_use", text=material.name, icon='MATERIAL').material_index = index
+        self.draw_load_queue(context, layout, lookProps)
 
         col = layout.column()
         col.scale_y = 1.5           
         col.operator("object.load_materials_operator", text="Load Selected Materials")
+        col = layout.column()
+        col.operator("object.load_materials_modal", text="Load With Progress (Esc Cancels)", icon='TIME')
+        col.operator("object.load_materials_operator", text="Preview Assignment (Dry Run)", icon="VIEWZOOM").dry_run = True
 
 
 """
@@ -246,6 +338,56 @@ class UncheckAllMaterialsOperator(Operator):
             material.use = False
         return {'FINISHED'}
 
+class LOOK_UL_material_list(UIList):
+    """Shader list with name filtering and sorting, only the visible rows are drawn"""
+
+    filter_marked: BoolProperty(
+        name="Marked Only",
+        description="Only show the shaders marked for loading",
+        default=False
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_property, index):
+        # the thumbnail saved in the look file, the plain material icon until it is loaded
+        icon_value = thumbnails.material_thumbnails.icon(properties.active_blend_file_path(data), item.name)
+        icon_args = {"icon_value": icon_value} if icon_value else {"icon": 'MATERIAL'}
+
+        if self.layout_type in {'DEFAULT', 'COMPACT'}:
+            row = layout.row(align=True)
+            row.prop(item, "use", text="")
+            row.label(text=item.name, **icon_args)
+        elif self.layout_type == 'GRID':
+            layout.alignment = 'CENTER'
+            layout.prop(item, "use", text="", **icon_args)
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+        row.prop(self, "filter_marked", text="", icon='CHECKBOX_HLT')
+        row.separator()
+        row.prop(self, "use_filter_sort_alpha", text="", icon='SORTALPHA')
+        row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC' if self.use_filter_sort_reverse else 'SORT_ASC')
+
+    def filter_items(self, context, data, propname):
+        materials = getattr(data, propname)
+        helper = bpy.types.UI_UL_list
+
+        # an empty flag list shows everything, an empty order list keeps the collection order
+        flags = []
+        if self.filter_name:
+            flags = helper.filter_items_by_name(self.filter_name, self.bitflag_filter_item, materials, "name")
+        if self.filter_marked:
+            if not flags:
+                flags = [self.bitflag_filter_item] * len(materials)
+            for index, material in enumerate(materials):
+                if not material.use:
+                    flags[index] &= ~self.bitflag_filter_item
+
+        order = helper.sort_items_by_name(materials, "name") if self.use_filter_sort_alpha else []
+        return flags, order
+
+
 class BLEND_UL_file_list(UIList):
     """Custom UI list to show blend files with icons"""
     
@@ -266,6 +408,7 @@ class_list = [
     CheckAllMaterialsOperator,
     UncheckAllMaterialsOperator,
     BLEND_UL_file_list,
+    LOOK_UL_material_list,
 ]
 
 def register():    
@@ -276,6 +419,7 @@ def register():
     
 
 def unregister():
+    thumbnails.material_thumbnails.shutdown()
 
     for cls in class_list:
         bpy.utils.unregister_class(cls)
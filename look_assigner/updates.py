@@ -0,0 +1,100 @@
+"""
+Deferred depsgraph tagging and viewport redraws.
+
+Code that changes many datablocks in a row (an assignment writes hundreds of slots)
+tags them through the active transaction instead of calling update_tag() and
+tag_redraw() itself:
+
+    with updates.deferred_updates() as transaction:
+        transaction.tag(mesh)
+        transaction.tag(obj, {'OBJECT'})
+
+Every datablock is tagged once when the outermost transaction ends, with the union of
+its refresh flags, and the 3D views are redrawn once. Outside a transaction tag()
+works immediately, so helpers can use it either way.
+"""
+
+from contextlib import contextmanager
+
+import bpy
+
+from .utils import LoggerFactory
+logger = LoggerFactory.get_logger()
+
+
+class UpdateTransaction:
+    """
+    The datablocks changed since the transaction started, see the module docstring.
+    """
+
+    def __init__(self):
+        self.refresh = {}
+
+    def tag(self, id_data, refresh=None):
+        self.refresh.setdefault(id_data, set()).update(refresh or ())
+
+    def __len__(self):
+        return len(self.refresh)
+
+    def flush(self):
+        """
+        Tag every collected datablock once, redraw the 3D views once, and return how many were tagged.
+        """
+        tagged = len(self.refresh)
+        for id_data, refresh in self.refresh.items():
+            if refresh:
+                id_data.update_tag(refresh=refresh)
+            else:
+                id_data.update_tag()
+        self.refresh.clear()
+
+        if tagged:
+            redraw_3d_views()
+        return tagged
+
+
+_active = None
+
+
+def tag(id_data, refresh=None):
+    """
+    Tag a changed datablock, deferred when a transaction is active.
+    """
+    if _active is not None:
+        _active.tag(id_data, refresh)
+    elif refresh:
+        id_data.update_tag(refresh=set(refresh))
+    else:
+        id_data.update_tag()
+
+
+@contextmanager
+def deferred_updates():
+    """
+    Collect the tags of the block and issue them together at the end. Nested blocks join the outer one.
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+
+    _active = UpdateTransaction()
+    try:
+        yield _active
+    finally:
+        transaction, _active = _active, None
+        tagged = transaction.flush()
+        logger.debug(f'Deferred updates - {tagged} datablocks tagged')
+
+
+def redraw_3d_views():
+    """
+    Redraw the 3D views of every window, there are none when running in the background.
+    """
+    window_manager = bpy.context.window_manager
+    if window_manager is None:
+        return
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
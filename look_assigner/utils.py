@@ -1,4 +1,3 @@
-import bpy
 import sys
 import logging
 import os
@@ -6,6 +5,8 @@ import os
 from pathlib import Path
 
 def ShowMessageBox(message = "", title = "Message Box", icon = 'INFO'):
+    # imported here so the logger can be used by the modules that don't depend on bpy
+    import bpy
 
     def draw(self, context):
         self.layout.label(text=message)
@@ -0,0 +1,111 @@
+"""
+Writes small synthetic .blend files for the blendfile reader tests.
+
+Only what the reader looks at is written: a file header, material ID blocks with a
+few node tree data blocks each, optional preview images and their pixels, and an
+SDNA describing ID, Material and PreviewImage.
+"""
+
+import struct
+
+NAME_LENGTH = 66
+
+TYPES = ["char", "short", "int", "void", "ID", "Library", "AssetMetaData", "Material", "PreviewImage", "float"]
+NAMES = ["*next", "*prev", "*newid", "*lib", "*asset_data", f"name[{NAME_LENGTH}]", "flag",
+         "w[2]", "h[2]", "flag[2]", "changed_timestamp[2]", "*rect[2]", "id", "r", "*preview"]
+
+# (struct type, [(field type, field name)]), indices into TYPES and NAMES
+STRUCTS = [
+    (4, [(3, 0), (3, 1), (4, 2), (5, 3), (6, 4), (0, 5), (1, 6)]),
+    (7, [(4, 12), (9, 13), (8, 14)]),
+    (8, [(2, 7), (2, 8), (1, 9), (1, 10), (2, 11)]),
+]
+SDNA_MATERIAL = 1
+SDNA_PREVIEW_IMAGE = 2
+
+
+def _align(data):
+    return data + b"\x00" * (-len(data) % 4)
+
+
+class BlendWriter:
+    """
+    Collects blocks and returns the file with bytes(), DNA1 and ENDB are added at the end.
+    """
+
+    def __init__(self, pointer_size=8, endian="<", large_bhead=False):
+        self.pointer_size = pointer_size
+        self.endian = endian
+        self.large_bhead = large_bhead
+        self.pointer_format = "Q" if pointer_size == 8 else "I"
+        self.blocks = []
+        self._next_address = 0x1000
+
+    def address(self):
+        self._next_address += 0x100
+        return self._next_address
+
+    def block(self, code, data, old=0, sdna_index=0, count=1):
+        endian = self.endian
+        if self.large_bhead:
+            bhead = struct.pack(f"{endian}4siQqq", code, sdna_index, old, len(data), count)
+        else:
+            bhead = struct.pack(f"{endian}4si{self.pointer_format}ii", code, len(data), old, sdna_index, count)
+        self.blocks.append(bhead + data)
+
+    def material(self, name, previews=(), node_blocks=10, preview_sdna_index=SDNA_PREVIEW_IMAGE):
+        """
+        Add a material, previews holds up to two (width, height, pixels) sizes: the icon and the large preview.
+        """
+        endian = self.endian
+        preview_address = self.address() if previews else 0
+        id_data = b"\x00" * (5 * self.pointer_size) + (b"MA" + name.encode()).ljust(NAME_LENGTH, b"\x00") + b"\x00\x00"
+        material = id_data + struct.pack(f"{endian}f{self.pointer_format}", 0.8, preview_address)
+        self.block(b"MA\x00\x00", material, old=self.address(), sdna_index=SDNA_MATERIAL)
+
+        # the node tree is written between the material and its preview
+        for _ in range(node_blocks):
+            self.block(b"DATA", b"n" * 48, old=self.address())
+
+        if not previews:
+            return
+        sizes = list(previews) + [(0, 0, None)] * (2 - len(previews))
+        rects = [self.address() if data is not None else 0 for _, _, data in sizes]
+        preview = struct.pack(f"{endian}2i2i2h2h2{self.pointer_format}",
+                              sizes[0][0], sizes[1][0], sizes[0][1], sizes[1][1], 0, 0, 0, 0, *rects)
+        self.block(b"DATA", preview, old=preview_address, sdna_index=preview_sdna_index)
+        for (_, _, data), rect in zip(sizes, rects):
+            if data is not None:
+                self.block(b"DATA", data, old=rect)
+
+    def header(self):
+        if self.large_bhead:
+            return b"BLENDER17-01" + (b"v" if self.endian == "<" else b"V") + b"0500"
+        return b"BLENDER" + (b"-" if self.pointer_size == 8 else b"_") + (b"v" if self.endian == "<" else b"V") + b"401"
+
+    def sdna(self):
+        endian = self.endian
+        id_size = 5 * self.pointer_size + NAME_LENGTH + 2
+        lengths = [1, 2, 4, 0, id_size, 0, 0, id_size + 4 + self.pointer_size, 24 + 2 * self.pointer_size, 4]
+
+        data = b"SDNA" + b"NAME" + struct.pack(f"{endian}i", len(NAMES)) + b"".join(name.encode() + b"\x00" for name in NAMES)
+        data = _align(data) + b"TYPE" + struct.pack(f"{endian}i", len(TYPES)) + b"".join(name.encode() + b"\x00" for name in TYPES)
+        data = _align(data) + b"TLEN" + struct.pack(f"{endian}{len(lengths)}h", *lengths)
+        data = _align(data) + b"STRC" + struct.pack(f"{endian}i", len(STRUCTS))
+        for type_index, fields in STRUCTS:
+            data += struct.pack(f"{endian}hh", type_index, len(fields))
+            for field in fields:
+                data += struct.pack(f"{endian}hh", *field)
+        return data
+
+    def __bytes__(self):
+        blocks = list(self.blocks)
+        self.block(b"DNA1", self.sdna())
+        self.block(b"ENDB", b"")
+        data = self.header() + b"".join(self.blocks)
+        self.blocks = blocks
+        return data
+
+
+def pixels(width, height, value):
+    return bytes([value]) * (width * height * 4)
@@ -0,0 +1,18 @@
+"""
+Test setup for the bpy-free modules of the add-on.
+
+The package __init__ registers the add-on and needs Blender, so the tests put a bare
+look_assigner package in its place. The modules that don't depend on bpy (see their
+docstrings) are then imported from the repository as usual.
+"""
+
+import os
+import sys
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "look_assigner" not in sys.modules:
+    package = types.ModuleType("look_assigner")
+    package.__path__ = [os.path.join(REPO_ROOT, "look_assigner")]
+    sys.modules["look_assigner"] = package
@@ -0,0 +1,122 @@
+import gzip
+
+import pytest
+
+from look_assigner import blendfile
+
+from blendfiles import SDNA_MATERIAL, BlendWriter, pixels
+
+MATERIAL_NAMES = ["Body", "Eyes", "Leaf_Küste"]
+
+
+def build_look(**writer_options):
+    writer = BlendWriter(**writer_options)
+    writer.block(b"REND", b"r" * 72)
+    for name in MATERIAL_NAMES:
+        writer.material(name)
+    writer.block(b"GR\x00\x00", b"g" * 40, old=writer.address())
+    return bytes(writer)
+
+
+def zstd_frames(data, frame_size):
+    """
+    Compress data as a series of independent zstd frames, the way Blender writes them.
+    """
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor()
+    return b"".join(compressor.compress(data[start:start + frame_size]) for start in range(0, len(data), frame_size))
+
+
+def write(tmp_path, data, name="look.blend"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("writer_options", [
+    {},
+    {"pointer_size": 4},
+    {"endian": ">"},
+    {"large_bhead": True},
+], ids=["64bit", "32bit", "big_endian", "large_bhead"])
+def test_material_names(tmp_path, writer_options):
+    path = write(tmp_path, build_look(**writer_options))
+    assert blendfile.read_material_names(path) == MATERIAL_NAMES
+
+
+def test_gzip(tmp_path):
+    path = write(tmp_path, gzip.compress(build_look()))
+    assert blendfile.read_material_names(path) == MATERIAL_NAMES
+
+
+def test_zstd_single_frame(tmp_path):
+    data = build_look()
+    path = write(tmp_path, zstd_frames(data, len(data)))
+    assert blendfile.read_material_names(path) == MATERIAL_NAMES
+
+
+@pytest.mark.parametrize("frame_size", [37, 256, 4096])
+def test_zstd_multiple_frames(tmp_path, frame_size):
+    # frame ends fall inside headers, BHeads and block data
+    path = write(tmp_path, zstd_frames(build_look(), frame_size))
+    assert blendfile.read_material_names(path) == MATERIAL_NAMES
+
+
+def test_not_a_blend_file(tmp_path):
+    path = write(tmp_path, b"not a blend file at all")
+    with pytest.raises(blendfile.BlendFileError):
+        blendfile.read_material_names(path)
+
+
+def test_truncated_block(tmp_path):
+    data = build_look()
+    path = write(tmp_path, data[:len(data) // 2])
+    with pytest.raises(blendfile.BlendFileError):
+        blendfile.read_material_names(path)
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(blendfile.BlendFileError):
+        blendfile.read_material_names(str(tmp_path / "missing.blend"))
+
+
+def build_previews(**material_options):
+    writer = BlendWriter()
+    writer.material("Both", previews=[(4, 4, pixels(4, 4, 1)), (8, 8, pixels(8, 8, 2))])
+    writer.material("NoPreview")
+    writer.material("IconOnly", previews=[(4, 4, pixels(4, 4, 3))])
+    writer.material("Odd", **material_options)
+    return bytes(writer)
+
+
+@pytest.mark.parametrize("compress", [None, "gzip", "zstd"])
+def test_material_previews(tmp_path, compress):
+    data = build_previews()
+    if compress == "gzip":
+        data = gzip.compress(data)
+    elif compress == "zstd":
+        data = zstd_frames(data, 100)
+    previews = blendfile.read_material_previews(write(tmp_path, data))
+
+    assert sorted(previews) == ["Both", "IconOnly"]
+    # the large preview wins over the icon
+    assert previews["Both"] == (8, 8, pixels(8, 8, 2))
+    assert previews["IconOnly"] == (4, 4, pixels(4, 4, 3))
+
+
+def test_preview_with_wrong_struct_is_skipped(tmp_path):
+    data = build_previews(previews=[(4, 4, pixels(4, 4, 9))], preview_sdna_index=SDNA_MATERIAL)
+    previews = blendfile.read_material_previews(write(tmp_path, data))
+    assert "Odd" not in previews
+
+
+def test_preview_with_short_pixels_falls_back(tmp_path):
+    data = build_previews(previews=[(4, 4, pixels(4, 4, 5)), (8, 8, pixels(8, 7, 6))])
+    previews = blendfile.read_material_previews(write(tmp_path, data))
+    assert previews["Odd"] == (4, 4, pixels(4, 4, 5))
+
+
+def test_preview_without_matching_pixels_is_skipped(tmp_path):
+    data = build_previews(previews=[(4, 4, pixels(3, 3, 5))])
+    previews = blendfile.read_material_previews(write(tmp_path, data))
+    assert "Odd" not in previews
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from look_assigner.manifest import MANIFEST_VERSION, ManifestError, encode_manifest, parse_manifest
+
+
+def test_round_trip():
+    value = encode_manifest({"Body": [2, 0, 0], "char_01:Eyes, Left": [1]})
+    manifest = parse_manifest(value)
+
+    assert manifest.version == MANIFEST_VERSION
+    assert not manifest.is_legacy
+    # objects are sorted, slots sorted and deduplicated
+    assert manifest.object_slots() == [("Body", (0, 2)), ("char_01:Eyes, Left", (1,))]
+
+
+def test_encoding_is_stable():
+    assert encode_manifest({"B": [1, 0], "A": (3,)}) == encode_manifest({"A": [3], "B": {0, 1}})
+
+
+def test_hash_mismatch():
+    data = json.loads(encode_manifest({"Body": [0]}))
+    data["objects"] = ["Head"]
+    with pytest.raises(ManifestError):
+        parse_manifest(json.dumps(data))
+
+
+def test_newer_version():
+    data = json.loads(encode_manifest({"Body": [0]}))
+    data["v"] = MANIFEST_VERSION + 1
+    with pytest.raises(ManifestError):
+        parse_manifest(json.dumps(data))
+
+
+@pytest.mark.parametrize("data", [
+    {"objects": ["Body"], "slots": [[0]]},
+    {"v": 1, "objects": ["Body"], "slots": []},
+    {"v": 1, "objects": [1], "slots": [[0]]},
+    {"v": 1, "objects": ["Body"], "slots": [["0"]]},
+])
+def test_malformed(data):
+    with pytest.raises(ManifestError):
+        parse_manifest(json.dumps(data))
+
+
+def test_legacy_object_list():
+    manifest = parse_manifest("Body, char_01:Eyes")
+    assert manifest.is_legacy
+    assert manifest.object_slots() == [("Body", (0,)), ("char_01:Eyes", (0,))]
+
+
+def test_legacy_list_starting_with_brace():
+    manifest = parse_manifest("{Body}, Eyes")
+    assert manifest.is_legacy
+    assert manifest.objects == ["{Body}", "Eyes"]
@@ -0,0 +1,50 @@
+import random
+import re
+
+import pytest
+
+from look_assigner.matching import ObjectNameIndex, normalized_keys
+
+SCENE_NAMES = [
+    "Body", "Body.001", "Body.0012", "Body.01", "char_01:Body", "char_01:Body.002", "char-01:Body",
+    "a:b:Body", "b:Body", "Body.001.002", "Body.001", "Eyes, Left", "ns:Eyes, Left.003",
+    "Leaf.Küste", "Leaf.Küste.010", ":Body", "Body:", "Body.abc", "x.001:Body",
+]
+STORED_NAMES = [
+    "Body", "Body.001", "b:Body", "Eyes, Left", "Leaf.Küste", "Body:", "Missing", "a+b", "Body.01",
+]
+
+
+def regex_match(scene_names, stored_name):
+    """
+    The per-name pattern the index replaces.
+    """
+    pattern = re.compile(r'([a-zA-Z0-9_]+:)?' + re.escape(stored_name) + r'(\.\d{3})?$')
+    return [scene_name for scene_name in scene_names if pattern.match(scene_name)]
+
+
+@pytest.mark.parametrize("stored_name", STORED_NAMES)
+def test_index_matches_regex(stored_name):
+    index = ObjectNameIndex(SCENE_NAMES)
+    assert index.match(stored_name) == regex_match(SCENE_NAMES, stored_name)
+
+
+def test_index_matches_regex_on_generated_names():
+    rng = random.Random(7)
+    parts = ["geo", "Body", "body", "a", "01", ".001", ".1234", ":", "ns_1:", "x-y:", ".", "_"]
+    scene_names = ["".join(rng.choice(parts) for _ in range(rng.randint(1, 5))) for _ in range(2000)]
+    stored_names = sorted(set(scene_names[:300] + [name.split(":")[-1] for name in scene_names[:300]]))
+
+    index = ObjectNameIndex(scene_names)
+    for stored_name in stored_names:
+        assert index.match(stored_name) == regex_match(scene_names, stored_name), stored_name
+
+
+def test_match_all_keeps_order():
+    index = ObjectNameIndex(["char_01:Body", "Eyes", "Body.001"])
+    assert index.match_all(["Eyes", "Body", "Missing"]) == ["Eyes", "char_01:Body", "Body.001"]
+
+
+def test_normalized_keys():
+    assert normalized_keys("char_01:Body.001") == ["char_01:Body.001", "Body.001", "char_01:Body", "Body"]
+    assert normalized_keys("Body") == ["Body"]
@@ -0,0 +1,47 @@
+import pytest
+
+from look_assigner.search import SEARCH_PREFIX, SEARCH_SUBSTRING, MaterialSearchIndex
+
+FILES = [
+    ("/looks/hero.blend", ["Body", "Eyes", "metal_rust"]),
+    ("/looks/props.blend", ["Metal_Clean", "metal_rust", "Wood"]),
+    ("/looks/set.blend", ["bodyPaint", "Stone"]),
+]
+
+
+@pytest.fixture
+def index():
+    return MaterialSearchIndex(FILES)
+
+
+def test_paths(index):
+    assert len(index) == 7
+    assert index.paths("metal_rust") == ["/looks/hero.blend", "/looks/props.blend"]
+    assert index.paths("Missing") == []
+
+
+def test_prefix_is_case_insensitive(index):
+    assert index.prefix("BOD") == ["Body", "bodyPaint"]
+    assert index.prefix("metal") == ["Metal_Clean", "metal_rust"]
+    assert index.prefix("metal", limit=1) == ["Metal_Clean"]
+    assert index.prefix("x") == []
+
+
+def test_substring(index):
+    assert index.substring("o") == ["Body", "bodyPaint", "Stone", "Wood"]
+    assert index.substring("RUST") == ["metal_rust"]
+    assert index.substring("o", limit=2) == ["Body", "bodyPaint"]
+    assert index.substring("") == index.substring("", limit=None)
+    assert len(index.substring("")) == len(index)
+
+
+def test_substring_never_spans_two_names(index):
+    # "eyes" is followed by "metal_clean" in the index
+    assert index.substring("esme") == []
+    assert index.substring("s\nm") == []
+
+
+def test_search_modes(index):
+    assert index.search("eyes", mode=SEARCH_PREFIX) == [("Eyes", ["/looks/hero.blend"])]
+    assert index.search("paint", mode=SEARCH_PREFIX) == []
+    assert index.search("paint", mode=SEARCH_SUBSTRING) == [("bodyPaint", ["/looks/set.blend"])]
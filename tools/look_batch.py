@@ -0,0 +1,228 @@
+"""
+Batch jobs over many .blend files with a pool of headless Blender workers.
+
+    python tools/look_batch.py publish "assets/**/*_3d_look*.blend" --workers 8 --report publish_report.json
+    python tools/look_batch.py apply "shots/**/*_lighting*.blend" --look chair_published.blend --look table_published.blend
+
+Every input file is processed in its own `blender -b` process (see look_batch_worker.py),
+--workers of them at a time, so one crashing or hanging file never takes the batch down.
+Inputs are paths or glob patterns, "@list.txt" reads one per line. The JSON report lists
+every file with its result and timings, the exit code is non-zero if any file failed.
+
+This script does not depend on bpy, run it with any Python 3.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "look_batch_worker.py")
+
+# lines of worker output kept in the report when a worker fails without a result
+OUTPUT_TAIL_LINES = 40
+
+
+def expand_inputs(patterns):
+    """
+    Return the unique .blend files matching the paths, globs and @list files, in the given order.
+    """
+    files = []
+    seen = set()
+
+    def add(path):
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen and os.path.isfile(path):
+            seen.add(key)
+            files.append(os.path.abspath(path))
+
+    for pattern in patterns:
+        if pattern.startswith("@"):
+            with open(pattern[1:]) as file:
+                lines = [line.strip() for line in file]
+            for path in expand_inputs([line for line in lines if line and not line.startswith("#")]):
+                add(path)
+        elif glob.has_magic(pattern):
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                add(path)
+        else:
+            add(pattern)
+    return files
+
+
+def publish_output_path(master_path, output_dir, suffix):
+    stem, extension = os.path.splitext(os.path.basename(master_path))
+    return os.path.join(output_dir or os.path.dirname(master_path), f"{stem}{suffix}{extension}")
+
+
+def run_worker(blender, filepath, job_args, worker_args, timeout):
+    """
+    Run one job in a headless Blender and return its result entry.
+    """
+    result_file, result_path = tempfile.mkstemp(prefix="look_batch_", suffix=".json")
+    os.close(result_file)
+
+    command = [blender, "--factory-startup", "-b", filepath, "--python-exit-code", "1",
+               "--python", WORKER_SCRIPT, "--", "--result", result_path, *worker_args, *job_args]
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                 errors="replace", timeout=timeout)
+        output, returncode = process.stdout, process.returncode
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+        returncode = None
+        timed_out = True
+    except OSError as e:
+        output, returncode = str(e), None
+    wall_time = time.perf_counter() - start
+
+    try:
+        with open(result_path) as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        entry = {"file": filepath, "status": "failed"}
+        if timed_out:
+            entry["error"] = f"Timed out after {timeout} seconds"
+        else:
+            entry["error"] = f"Worker exited with code {returncode} without a result"
+        entry["output"] = "\n".join(output.splitlines()[-OUTPUT_TAIL_LINES:])
+    finally:
+        if os.path.exists(result_path):
+            os.remove(result_path)
+
+    entry["file"] = filepath
+    entry["returncode"] = returncode
+    entry["wall_seconds"] = round(wall_time, 4)
+    return entry
+
+
+def run_batch(jobs, workers, blender, worker_args, timeout):
+    """
+    Run (file, job arguments) pairs on the worker pool and return the entries in input order.
+    """
+    entries = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_worker, blender, filepath, job_args, worker_args, timeout): filepath
+                   for filepath, job_args in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            entries[futures[future]] = entry
+            detail = entry.get("error", "")
+            print(f"[{done}/{len(futures)}] {entry['status']:6} {entry['wall_seconds']:8.1f}s  {entry['file']}  {detail}", flush=True)
+    return [entries[filepath] for filepath, _ in jobs]
+
+
+def write_report(path, job, entries, workers, wall_time):
+    report = {
+        "job": job,
+        "workers": workers,
+        "seconds": round(wall_time, 4),
+        "files": len(entries),
+        "succeeded": sum(1 for entry in entries if entry["status"] == "ok"),
+        "failed": sum(1 for entry in entries if entry["status"] != "ok"),
+        "results": entries,
+    }
+    if path:
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run Look Assigner jobs over many .blend files with headless Blender workers.")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable (default $BLENDER or blender)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Number of Blender processes run at once")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a single file is given up on")
+    parser.add_argument("--report", default="look_batch_report.json", help="Where the JSON report is written")
+    parser.add_argument("--pipeline-attribute", help="Pipeline attribute name, when it differs from the add-on default")
+    subparsers = parser.add_subparsers(dest="job", required=True)
+
+    publish = subparsers.add_parser("publish", help="Publish look files from 3d_look master files")
+    publish.add_argument("inputs", nargs="+", help="Master files, glob patterns or @list files")
+    publish.add_argument("--output-dir", help="Folder for the look files (default: next to each master)")
+    publish.add_argument("--suffix", default="_published", help="Added to the master file name for the look file")
+    publish.add_argument("--no-compress", action="store_true", help="Write uncompressed look files")
+
+    apply = subparsers.add_parser("apply", help="Apply published looks to shot files")
+    apply.add_argument("inputs", nargs="+", help="Shot files, glob patterns or @list files")
+    apply.add_argument("--look", action="append", required=True, help="Published look file, repeat for several looks")
+    apply.add_argument("--materials", nargs="+", help="Only load these shaders (default: all shaders of the looks)")
+    apply.add_argument("--link", action="store_true", help="Link the shaders instead of appending them")
+    apply.add_argument("--overrides", action="store_true", help="Make library overrides of linked shaders")
+    apply.add_argument("--dry-run", action="store_true", help="Only report what would be assigned, nothing is saved")
+    apply.add_argument("--output-dir", help="Save the shots here instead of in place")
+
+    return parser
+
+
+def apply_jobs(args, files):
+    look_args = []
+    for look in args.look:
+        look_args += ["--look", os.path.abspath(look)]
+    if args.materials:
+        look_args += ["--materials", *args.materials]
+    for flag in ("link", "overrides", "dry_run"):
+        if getattr(args, flag):
+            look_args.append(f"--{flag.replace('_', '-')}")
+
+    jobs = []
+    for filepath in files:
+        job_args = ["apply", *look_args]
+        if args.output_dir:
+            job_args += ["--output", os.path.join(args.output_dir, os.path.basename(filepath))]
+        jobs.append((filepath, job_args))
+    return jobs
+
+
+def publish_jobs(args, files):
+    jobs = []
+    for filepath in files:
+        job_args = ["publish", "--output", publish_output_path(filepath, args.output_dir, args.suffix)]
+        if args.no_compress:
+            job_args.append("--no-compress")
+        jobs.append((filepath, job_args))
+    return jobs
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No input files found", file=sys.stderr)
+        return 2
+
+    if args.job == "apply":
+        missing = [look for look in args.look if not os.path.isfile(look)]
+        if missing:
+            print(f"Look files not found: {', '.join(missing)}", file=sys.stderr)
+            return 2
+        jobs = apply_jobs(args, files)
+    else:
+        jobs = publish_jobs(args, files)
+
+    worker_args = []
+    if args.pipeline_attribute:
+        worker_args += ["--pipeline-attribute", args.pipeline_attribute]
+
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"{args.job}: {len(jobs)} files on {workers} Blender workers", flush=True)
+
+    start = time.perf_counter()
+    entries = run_batch(jobs, workers, args.blender, worker_args, args.timeout)
+    report = write_report(args.report, args.job, entries, workers, time.perf_counter() - start)
+
+    print(f"{report['succeeded']} succeeded, {report['failed']} failed in {report['seconds']:.1f}s - report: {args.report}")
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Worker side of tools/look_batch.py, runs a single job inside `blender -b`.
+
+    blender --factory-startup -b master.blend --python tools/look_batch_worker.py -- --result result.json publish --output look.blend
+    blender --factory-startup -b shot.blend --python tools/look_batch_worker.py -- --result result.json apply --look look.blend
+
+The add-on is enabled straight from this repository. The job result (or the error)
+is written as JSON to --result, the exit code is non-zero when the job failed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import addon_utils
+import bpy
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="look_batch_worker")
+    parser.add_argument("--result", required=True)
+    parser.add_argument("--pipeline-attribute")
+    subparsers = parser.add_subparsers(dest="job", required=True)
+
+    publish = subparsers.add_parser("publish")
+    publish.add_argument("--output", required=True)
+    publish.add_argument("--no-compress", action="store_true")
+
+    apply = subparsers.add_parser("apply")
+    apply.add_argument("--look", action="append", required=True)
+    apply.add_argument("--materials", nargs="+")
+    apply.add_argument("--link", action="store_true")
+    apply.add_argument("--overrides", action="store_true")
+    apply.add_argument("--dry-run", action="store_true")
+    apply.add_argument("--output")
+
+    return parser.parse_args(argv)
+
+
+def run_job(args):
+    addon_utils.enable("look_assigner", default_set=True)
+    from look_assigner import batch
+    from look_assigner import preferences
+
+    if args.pipeline_attribute:
+        preferences.get(bpy.context).pipeline_attribute_name = args.pipeline_attribute
+
+    if args.job == "publish":
+        return batch.publish_look(args.output, compress=not args.no_compress)
+    if args.job == "apply":
+        return batch.apply_looks(args.look, args.materials, link=args.link, make_override=args.overrides,
+                                 dry_run=args.dry_run, output_path=args.output)
+    raise ValueError(f"Unknown job {args.job}")
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    result = {"file": bpy.data.filepath, "job": args.job, "blender": bpy.app.version_string}
+
+    try:
+        result.update(run_job(args))
+        result["status"] = "ok"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    with open(args.result, "w") as file:
+        json.dump(result, file, indent=2)
+
+    sys.exit(0 if result["status"] == "ok" else 1)
+
+
+if __name__ == "__main__":
+    main()